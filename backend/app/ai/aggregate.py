@@ -0,0 +1,232 @@
+"""Deterministic pre-aggregation of simulation metadata for the summarizer.
+
+Most of what distinguishes a set of simulations is categorical (tag, campaign,
+compset, resolution, machine), which code can summarize exactly. This module
+reduces a selection to the fields shared by every run, the value counts of the
+fields that vary, groups of runs with identical configurations and
+de-duplicated notes, so the model only has to phrase a compact difference
+table instead of reading one description per run.
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+# Categorical columns compared across runs, with their display labels.
+FIELDS = {
+    "version_tag": "Tag",
+    "campaign_id": "Campaign",
+    "compset": "Compset",
+    "grid_resolution": "Resolution",
+    "machine_name": "Machine",
+}
+
+# Maximum number of run names listed per group before eliding the rest.
+MAX_NAMES = 5
+
+
+@dataclass(frozen=True)
+class ConfigGroup:
+    """Runs that share the same value for every varying field."""
+
+    values: dict[str, str]
+    names: list[str]
+
+
+@dataclass(frozen=True)
+class NoteGroup:
+    """A distinct note, compared ignoring whitespace and case, and its runs."""
+
+    text: str
+    names: list[str]
+
+
+@dataclass(frozen=True)
+class SimulationAggregate:
+    """The structured differences across a selection of simulations."""
+
+    count: int
+    shared: dict[str, str]
+    value_counts: dict[str, dict[str, int]]
+    configs: list[ConfigGroup]
+    notes: list[NoteGroup]
+
+    @property
+    def duplicate_configs(self) -> list[ConfigGroup]:
+        """Groups of two or more runs with identical configurations."""
+        return [group for group in self.configs if len(group.names) > 1]
+
+
+def aggregate_simulations(sims: Sequence[Any]) -> SimulationAggregate:
+    """Compute shared and varying fields, value counts and duplicate groups.
+
+    Each field is dictionary-encoded with ``np.unique`` and configurations are
+    grouped with a row-wise ``np.unique`` over the code matrix, so the cost is
+    a handful of vectorized passes regardless of the number of runs.
+
+    Parameters
+    ----------
+    sims : Sequence[Any]
+        Rows exposing ``name``, ``notes_markdown`` and the attributes listed
+        in ``FIELDS``.
+
+    Returns
+    -------
+    SimulationAggregate
+        The aggregate, with groups ordered by first appearance in ``sims``.
+    """
+    names = np.array([sim.name for sim in sims], dtype=object)
+    values = np.array(
+        [[_display(getattr(sim, field)) for field in FIELDS] for sim in sims],
+        dtype=str,
+    ).reshape(len(sims), len(FIELDS))
+
+    shared: dict[str, str] = {}
+    value_counts: dict[str, dict[str, int]] = {}
+    varying_codes = []
+    varying_uniques = []
+
+    for j, label in enumerate(FIELDS.values()):
+        uniques, codes, counts = np.unique(
+            values[:, j], return_inverse=True, return_counts=True
+        )
+
+        if len(uniques) == 1:
+            shared[label] = str(uniques[0])
+        else:
+            order = np.argsort(-counts, kind="stable")
+            value_counts[label] = {str(uniques[i]): int(counts[i]) for i in order}
+            varying_codes.append(codes.reshape(-1))
+            varying_uniques.append((label, uniques))
+
+    configs = _group_configs(names, varying_codes, varying_uniques)
+    notes = _group_notes(names, [sim.notes_markdown for sim in sims])
+
+    return SimulationAggregate(
+        count=len(sims),
+        shared=shared,
+        value_counts=value_counts,
+        configs=configs,
+        notes=notes,
+    )
+
+
+def aggregate_lines(aggregate: SimulationAggregate) -> list[str]:
+    """Render an aggregate as short lines for the summarizer prompt.
+
+    Parameters
+    ----------
+    aggregate : SimulationAggregate
+        The aggregate to render.
+
+    Returns
+    -------
+    list[str]
+        One line for the header and shared fields, one per varying field, one
+        per configuration group and one per distinct note.
+    """
+    header = f"{aggregate.count} simulations."
+    if aggregate.shared:
+        shared = "; ".join(f"{k}: {v}" for k, v in aggregate.shared.items())
+        header += f" Shared by all: {shared}."
+
+    lines = [header]
+
+    for label, counts in aggregate.value_counts.items():
+        values = ", ".join(f"{value} ({n})" for value, n in counts.items())
+        lines.append(f"{label} varies: {values}.")
+
+    if aggregate.value_counts:
+        for group in aggregate.configs:
+            config = ", ".join(f"{k}: {v}" for k, v in group.values.items())
+            lines.append(f"Runs with {config}: {format_names(group.names)}.")
+
+    for note in aggregate.notes:
+        lines.append(f"Notes for {format_names(note.names)}: {note.text}")
+
+    return lines
+
+
+def format_names(names: list[str]) -> str:
+    """Join run names for display, eliding all but the first ``MAX_NAMES``.
+
+    Parameters
+    ----------
+    names : list[str]
+        The run names, in display order.
+
+    Returns
+    -------
+    str
+        The comma-separated names, ending with "and N more" when some were
+        elided.
+    """
+    if len(names) <= MAX_NAMES:
+        return ", ".join(names)
+
+    return ", ".join(names[:MAX_NAMES]) + f" and {len(names) - MAX_NAMES} more"
+
+
+def _display(value: Any) -> str:
+    return "n/a" if value is None else str(value)
+
+
+def _split_groups(names: np.ndarray, inverse: np.ndarray) -> list[list[str]]:
+    """Split ``names`` by group code, ordered by each group's first member."""
+    n_groups = int(inverse.max()) + 1
+    first_seen = np.full(n_groups, len(inverse))
+    np.minimum.at(first_seen, inverse, np.arange(len(inverse)))
+
+    # Renumber groups by first appearance, then sort members stably by group.
+    rank = np.empty(n_groups, dtype=np.intp)
+    rank[np.argsort(first_seen, kind="stable")] = np.arange(n_groups)
+    ranked = rank[inverse]
+    order = np.argsort(ranked, kind="stable")
+    bounds = np.cumsum(np.bincount(ranked, minlength=n_groups))[:-1]
+
+    return [list(group) for group in np.split(names[order], bounds)]
+
+
+def _group_configs(
+    names: np.ndarray,
+    varying_codes: list[np.ndarray],
+    varying_uniques: list[tuple[str, np.ndarray]],
+) -> list[ConfigGroup]:
+    if not varying_codes:
+        return [ConfigGroup(values={}, names=list(names))]
+
+    code_matrix = np.stack(varying_codes, axis=1)
+    configs, first_index, inverse = np.unique(
+        code_matrix, axis=0, return_index=True, return_inverse=True
+    )
+    members = _split_groups(names, inverse.reshape(-1))
+
+    groups = []
+    for group_names, config in zip(
+        members, configs[np.argsort(first_index, kind="stable")], strict=True
+    ):
+        values = {
+            label: str(uniques[code])
+            for (label, uniques), code in zip(varying_uniques, config, strict=True)
+        }
+        groups.append(ConfigGroup(values=values, names=group_names))
+
+    return groups
+
+
+def _group_notes(names: np.ndarray, notes: list[str | None]) -> list[NoteGroup]:
+    has_note = np.array([bool(note and note.strip()) for note in notes], dtype=bool)
+    if not has_note.any():
+        return []
+
+    texts = [" ".join(note.split()) for note in notes if note and note.strip()]
+    keys = np.array([text.lower() for text in texts], dtype=str)
+    _, first_index, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    members = _split_groups(names[has_note], inverse.reshape(-1))
+
+    return [
+        NoteGroup(text=texts[i], names=group_names)
+        for i, group_names in zip(np.sort(first_index), members, strict=True)
+    ]
@@ -0,0 +1,474 @@
+"""Clustering of the catalog into families of similar simulations.
+
+Each simulation is featurized as its description embedding scaled by
+``sqrt(TEXT_WEIGHT)``, followed by one-hot blocks scaled by ``sqrt(weight)``
+for the categorical fields of ``FIELD_WEIGHTS``. The embedded text already
+contains the compset and grid (see ``EMBEDDING_FIELDS``), so only the machine
+and version tag get a block, and the embedding takes the weight of the fields
+it covers. The squared Euclidean distance between two simulations is then the
+weighted sum of their field mismatches plus the text distance, so clusters
+group runs that share a machine and describe themselves, their compset and
+their grid alike. The categorical values are hashed into a fixed number of
+buckets, so a new simulation is featurized without a vocabulary.
+
+``build_clusters`` runs mini-batch k-means (k-means++ seeding, then
+per-cluster learning rates over random batches) and replaces the stored
+clusters and assignments. ``assign_new_simulations`` places simulations
+without a cluster at their nearest centroid and moves that centroid to the
+new mean, without reclustering.
+
+Usage
+-----
+Assign new simulations, or cluster the whole catalog on first run::
+
+    poetry run python -m app.ai.clustering [--full] [--clusters K]
+"""
+
+import argparse
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app._logger import _setup_custom_logger
+from app.ai.embedding_store import EmbeddingIndex, EmbeddingStore
+from app.ai.embeddings import EMBEDDING_FIELDS
+from app.ai.similarity import CATEGORICAL_WEIGHTS
+from app.core.config import settings
+from app.db.cluster import Cluster, ClusterAssignment
+from app.db.simulation import Simulation
+
+logger = _setup_custom_logger(__name__)
+
+# Weights of the categorical fields that the description embedding lacks, and
+# of the embedding, which stands in for the fields it covers.
+FIELD_WEIGHTS = {
+    field: weight
+    for field, weight in CATEGORICAL_WEIGHTS.items()
+    if field not in EMBEDDING_FIELDS
+}
+TEXT_WEIGHT = 1.0 - sum(FIELD_WEIGHTS.values())
+
+# Buckets of the hashed one-hot encoding of each categorical field.
+HASH_BUCKETS = 64
+
+# Columns read for featurizing and labeling.
+_LABEL_FIELDS = ("compset", "grid_name", "campaign_id")
+_COLUMNS = tuple(dict.fromkeys((*FIELD_WEIGHTS, *_LABEL_FIELDS)))
+
+# Length of ``Cluster.label``.
+_LABEL_LENGTH = 300
+
+# Rows compared against the centroids at a time.
+_CHUNK = 8192
+# Points sampled for the k-means++ seeding.
+_SEED_SAMPLE = 10_000
+
+
+@dataclass(frozen=True)
+class KMeansResult:
+    """Centroids and the nearest centroid of every input row."""
+
+    centroids: np.ndarray
+    labels: np.ndarray
+    distances: np.ndarray
+
+
+@dataclass(frozen=True)
+class ClusterResult:
+    """What a clustering run changed."""
+
+    clusters: int
+    assigned: int
+    rebuilt: bool
+
+
+def featurize(rows: list[Any], index: EmbeddingIndex | None) -> np.ndarray:
+    """Build the clustering feature matrix of simulations.
+
+    Parameters
+    ----------
+    rows : list[Any]
+        Rows exposing ``id`` and the ``FIELD_WEIGHTS`` columns.
+    index : EmbeddingIndex | None
+        The active embedding snapshot; simulations missing from it get a zero
+        text block.
+
+    Returns
+    -------
+    np.ndarray
+        A ``(len(rows), dim + len(FIELD_WEIGHTS) * HASH_BUCKETS)``
+        float32 matrix.
+    """
+    ids = np.asarray([str(row.id) for row in rows], dtype="U36")
+    blocks = [np.sqrt(TEXT_WEIGHT) * align_vectors(ids, index)]
+
+    for field, weight in FIELD_WEIGHTS.items():
+        values = np.asarray([getattr(row, field) for row in rows], dtype=object)
+        present = np.flatnonzero(~np.equal(values, None))
+        # Hash each distinct value once and scatter its bucket to the rows.
+        uniques, inverse = np.unique(values[present].astype(str), return_inverse=True)
+        buckets = np.asarray(
+            [_bucket(field, value) for value in uniques.tolist()], dtype=np.intp
+        )
+
+        block = np.zeros((len(rows), HASH_BUCKETS), dtype=np.float32)
+        block[present, buckets[inverse]] = np.sqrt(weight)
+        blocks.append(block)
+
+    return np.hstack(blocks).astype(np.float32)
+
+
+def align_vectors(ids: np.ndarray, index: EmbeddingIndex | None) -> np.ndarray:
+    """Gather each simulation's live embedding, or zeros if it has none."""
+    if index is None:
+        return np.zeros((len(ids), 1), dtype=np.float32)
+
+    live = np.flatnonzero(index.live) if index.live is not None else None
+    index_ids = index.ids if live is None else index.ids[live]
+
+    order = np.argsort(index_ids)
+    pos = np.searchsorted(index_ids, ids, sorter=order)
+    pos = np.minimum(pos, max(len(order) - 1, 0))
+    found = (
+        index_ids[order[pos]] == ids if len(order) else np.zeros(len(ids), dtype=bool)
+    )
+
+    vectors = np.zeros((len(ids), index.vectors.shape[1]), dtype=np.float32)
+    source = order[pos[found]]
+    vectors[found] = index.vectors[source if live is None else live[source]]
+
+    return vectors
+
+
+def kmeans(
+    features: np.ndarray,
+    k: int,
+    batch_size: int = 1024,
+    iterations: int = 100,
+    seed: int = 0,
+) -> KMeansResult:
+    """Cluster rows with mini-batch k-means.
+
+    Parameters
+    ----------
+    features : np.ndarray
+        The ``(n, dim)`` rows to cluster.
+    k : int
+        The number of clusters, capped at ``n``.
+    batch_size : int, optional
+        Rows sampled per iteration, by default 1024.
+    iterations : int, optional
+        The maximum number of batches, by default 100. Iteration stops early
+        once no centroid moves.
+    seed : int, optional
+        The random seed, by default 0.
+
+    Returns
+    -------
+    KMeansResult
+        The ``(k, dim)`` centroids and, per row, its nearest centroid and the
+        distance to it.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(features)
+    k = min(k, n)
+    centroids = _seed_centroids(features, k, rng)
+    counts = np.zeros(k)
+
+    for _ in range(iterations):
+        batch = features[rng.choice(n, size=min(batch_size, n), replace=False)]
+        nearest, _ = nearest_centroids(batch, centroids)
+
+        batch_counts = np.bincount(nearest, minlength=k)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, nearest, batch)
+
+        # Each centroid moves towards its batch mean with a rate that decays
+        # with the number of rows it has absorbed so far.
+        hit = batch_counts > 0
+        counts[hit] += batch_counts[hit]
+        rate = (batch_counts[hit] / counts[hit])[:, None]
+        step = rate * (sums[hit] / batch_counts[hit, None] - centroids[hit])
+        centroids[hit] += step
+        if not np.abs(step).max(initial=0.0) > 1e-6:
+            break
+
+    labels, distances = nearest_centroids(features, centroids)
+
+    return KMeansResult(centroids=centroids, labels=labels, distances=distances)
+
+
+def nearest_centroids(
+    features: np.ndarray, centroids: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the nearest centroid of each row and the distance to it."""
+    labels = np.empty(len(features), dtype=np.int64)
+    distances = np.empty(len(features), dtype=np.float32)
+    norms = (centroids**2).sum(axis=1)
+
+    for start in range(0, len(features), _CHUNK):
+        chunk = features[start : start + _CHUNK]
+        d2 = (chunk**2).sum(axis=1)[:, None] - 2 * chunk @ centroids.T + norms
+        nearest = d2.argmin(axis=1)
+        labels[start : start + _CHUNK] = nearest
+        distances[start : start + _CHUNK] = np.sqrt(
+            np.maximum(d2[np.arange(len(chunk)), nearest], 0.0)
+        )
+
+    return labels, distances
+
+
+def build_clusters(
+    db: Session, index: EmbeddingIndex | None, k: int | None = None, seed: int = 0
+) -> int:
+    """Cluster every simulation and replace the stored clusters.
+
+    Parameters
+    ----------
+    db : Session
+        The database session; the new clusters are committed.
+    index : EmbeddingIndex | None
+        The active embedding snapshot.
+    k : int | None, optional
+        The number of clusters, by default ``settings.cluster_count``, or
+        ``sqrt(n / 2)`` if that is 0.
+    seed : int, optional
+        The random seed, by default 0.
+
+    Returns
+    -------
+    int
+        The number of non-empty clusters stored.
+    """
+    rows = db.execute(
+        select(Simulation.id, *(getattr(Simulation, c) for c in _COLUMNS)).order_by(
+            Simulation.id
+        )
+    ).all()
+
+    db.execute(delete(Cluster))
+    if not rows:
+        db.commit()
+        return 0
+
+    k = k or settings.cluster_count or max(1, round(np.sqrt(len(rows) / 2)))
+    result = kmeans(featurize(rows, index), k, seed=seed)
+
+    members: dict[int, list[int]] = {}
+    for i, label in enumerate(result.labels.tolist()):
+        members.setdefault(label, []).append(i)
+
+    ordered = sorted(members)
+    cluster_ids = db.scalars(
+        insert(Cluster).returning(Cluster.id, sort_by_parameter_order=True),
+        [
+            {
+                "label": _label([rows[i] for i in members[c]]),
+                "size": len(members[c]),
+                "centroid": result.centroids[c].tolist(),
+            }
+            for c in ordered
+        ],
+    ).all()
+    cluster_of = dict(zip(ordered, cluster_ids, strict=True))
+
+    db.execute(
+        insert(ClusterAssignment),
+        [
+            {
+                "simulation_id": row.id,
+                "cluster_id": cluster_of[int(label)],
+                "distance": float(distance),
+            }
+            for row, label, distance in zip(
+                rows, result.labels, result.distances, strict=True
+            )
+        ],
+    )
+    db.commit()
+
+    logger.info(f"Clustered {len(rows)} simulations into {len(ordered)} clusters.")
+
+    return len(ordered)
+
+
+def assign_new_simulations(db: Session, index: EmbeddingIndex | None) -> int:
+    """Assign simulations without a cluster to their nearest centroid.
+
+    Each receiving centroid becomes the mean of its old members and the new
+    ones, as if they had been clustered together; labels are kept.
+
+    Parameters
+    ----------
+    db : Session
+        The database session; the assignments are committed.
+    index : EmbeddingIndex | None
+        The active embedding snapshot.
+
+    Returns
+    -------
+    int
+        The number of simulations assigned.
+
+    Raises
+    ------
+    ValueError
+        If there are no clusters yet, or the stored centroids were built from
+        embeddings of a different dimension.
+    """
+    clusters = db.execute(select(Cluster.id, Cluster.size, Cluster.centroid)).all()
+    if not clusters:
+        raise ValueError("There are no clusters to assign to; build them first.")
+
+    rows = db.execute(
+        select(Simulation.id, *(getattr(Simulation, c) for c in _COLUMNS))
+        .outerjoin(ClusterAssignment)
+        .where(ClusterAssignment.simulation_id.is_(None))
+        .order_by(Simulation.id)
+    ).all()
+    if not rows:
+        return 0
+
+    centroids = np.asarray([c.centroid for c in clusters], dtype=np.float32)
+    features = featurize(rows, index)
+    if features.shape[1] != centroids.shape[1]:
+        raise ValueError(
+            f"Centroids have {centroids.shape[1]} features but simulations have "
+            f"{features.shape[1]}; rebuild the clusters."
+        )
+
+    labels, distances = nearest_centroids(features, centroids)
+    db.execute(
+        insert(ClusterAssignment),
+        [
+            {
+                "simulation_id": row.id,
+                "cluster_id": clusters[label].id,
+                "distance": float(distance),
+            }
+            for row, label, distance in zip(rows, labels, distances, strict=True)
+        ],
+    )
+
+    sizes = np.asarray([c.size for c in clusters], dtype=np.float64)
+    counts = np.bincount(labels, minlength=len(clusters))
+    sums = np.zeros_like(centroids, dtype=np.float64)
+    np.add.at(sums, labels, features)
+    changed = np.flatnonzero(counts)
+    merged = (centroids[changed] * sizes[changed, None] + sums[changed]) / (
+        sizes[changed] + counts[changed]
+    )[:, None]
+
+    db.execute(
+        update(Cluster),
+        [
+            {
+                "id": clusters[c].id,
+                "size": int(sizes[c] + counts[c]),
+                "centroid": centroid.tolist(),
+            }
+            for c, centroid in zip(changed, merged, strict=True)
+        ],
+    )
+    db.commit()
+
+    logger.info(f"Assigned {len(rows)} new simulations to existing clusters.")
+
+    return len(rows)
+
+
+def refresh_clusters(
+    db: Session, index: EmbeddingIndex | None, full: bool = False, k: int | None = None
+) -> ClusterResult:
+    """Assign new simulations, or recluster the whole catalog.
+
+    Parameters
+    ----------
+    db : Session
+        The database session.
+    index : EmbeddingIndex | None
+        The active embedding snapshot.
+    full : bool, optional
+        Whether to recluster even if clusters exist, by default False.
+    k : int | None, optional
+        The number of clusters of a full run, see ``build_clusters``.
+
+    Returns
+    -------
+    ClusterResult
+        The number of clusters, the simulations assigned, and whether the
+        clusters were rebuilt.
+    """
+    if not full and db.scalar(select(Cluster.id).limit(1)) is not None:
+        assigned = assign_new_simulations(db, index)
+        clusters = db.scalar(select(func.count()).select_from(Cluster))
+
+        return ClusterResult(clusters=clusters, assigned=assigned, rebuilt=False)
+
+    clusters = build_clusters(db, index, k)
+    assigned = db.scalar(select(func.count()).select_from(ClusterAssignment))
+
+    return ClusterResult(clusters=clusters, assigned=assigned, rebuilt=True)
+
+
+def _seed_centroids(
+    features: np.ndarray, k: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Pick ``k`` initial centroids from a sample with k-means++."""
+    sample = features[
+        rng.choice(len(features), size=min(len(features), _SEED_SAMPLE), replace=False)
+    ]
+    centroids = [sample[rng.integers(len(sample))]]
+    d2 = ((sample - centroids[0]) ** 2).sum(axis=1)
+
+    for _ in range(1, k):
+        total = d2.sum()
+        # Every remaining point coincides with a centroid; duplicate one.
+        i = rng.choice(len(sample), p=d2 / total) if total > 0 else 0
+        centroids.append(sample[i])
+        d2 = np.minimum(d2, ((sample - sample[i]) ** 2).sum(axis=1))
+
+    return np.asarray(centroids, dtype=np.float64)
+
+
+def _bucket(field: str, value: Any) -> int:
+    return zlib.crc32(f"{field}={value}".encode()) % HASH_BUCKETS
+
+
+def _label(members: list[Any]) -> str:
+    """Describe a cluster by its most common compset, grid and campaign."""
+    parts = []
+
+    for field in _LABEL_FIELDS:
+        values = Counter(getattr(m, field) for m in members if getattr(m, field))
+        if values:
+            parts.append(str(values.most_common(1)[0][0]))
+
+    return (" · ".join(parts) or "Unlabeled")[:_LABEL_LENGTH]
+
+
+def main() -> None:
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Cluster the simulation catalog.")
+    parser.add_argument(
+        "--full", action="store_true", help="Recluster every simulation."
+    )
+    parser.add_argument(
+        "--clusters", type=int, help="Number of clusters of a full run."
+    )
+    args = parser.parse_args()
+
+    index = EmbeddingStore(settings.embedding_dir).index()
+
+    with SessionLocal() as db:
+        refresh_clusters(db, index, full=args.full, k=args.clusters)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+"""On-disk storage of simulation embeddings with consistent snapshots.
+
+Layout
+------
+The store directory holds one or more generations and a ``CURRENT`` file::
+
+    CURRENT                  JSON manifest of the active snapshot
+    gen-<ns>/ids.npy         (capacity,) simulation IDs, "U36"
+    gen-<ns>/embeddings.npy  (capacity, dim) float32, L2-normalized rows
+    gen-<ns>/updated.npy     (capacity,) int64 ``updated_at`` in microseconds
+    gen-<ns>/live-<v>.npy    (rows,) bool mask of non-superseded rows
+
+Each generation's arrays are preallocated to a capacity and only ever
+appended to: a changed simulation gets a new row and its old row is cleared in
+the next live mask, and a deleted one is only cleared. A snapshot is the
+manifest naming a generation, its row count and its live mask, so readers that
+memory-mapped the first ``rows`` rows never see rows written after them.
+``CURRENT`` is replaced atomically, so a reader always sees a whole snapshot.
+
+Compaction copies the live rows into a new generation, which is also how a
+generation grows past its capacity. Older generations are removed afterwards;
+readers still mapping them keep a valid mapping until they switch.
+"""
+
+import fcntl
+import json
+import os
+import shutil
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+
+import numpy as np
+
+_CURRENT_FILE = "CURRENT"
+_LOCK_FILE = ".lock"
+_IDS_FILE = "ids.npy"
+_VECTORS_FILE = "embeddings.npy"
+_UPDATED_FILE = "updated.npy"
+
+# Minimum number of spare rows allocated in a new generation for appends.
+MIN_SPARE_ROWS = 1024
+
+# Rows copied at a time during compaction.
+_COPY_CHUNK = 65536
+
+
+@dataclass(frozen=True)
+class EmbeddingIndex:
+    """A snapshot of simulation IDs and their unit-length embeddings."""
+
+    ids: np.ndarray
+    vectors: np.ndarray
+    live: np.ndarray | None = None
+    updated: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return len(self.ids) if self.live is None else int(self.live.sum())
+
+    def search(self, query: np.ndarray, k: int) -> list[tuple[str, float]]:
+        """Return the ``k`` IDs most similar to a unit-length query vector.
+
+        Parameters
+        ----------
+        query : np.ndarray
+            A ``(dim,)`` float32 vector.
+        k : int
+            The number of results.
+
+        Returns
+        -------
+        list[tuple[str, float]]
+            ``(id, cosine similarity)`` pairs, most similar first.
+        """
+        k = min(k, len(self))
+        if k <= 0:
+            return []
+
+        scores = self.vectors @ query.astype(np.float32, copy=False)
+        if self.live is not None:
+            scores[~self.live] = -np.inf
+
+        # Select the top k in linear time, then sort only those.
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        return [(str(self.ids[i]), float(scores[i])) for i in top]
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """The manifest of one consistent view of the store."""
+
+    version: int
+    generation: str
+    rows: int
+    live_rows: int
+    capacity: int
+    dim: int
+    # ISO timestamp of the newest ``updated_at`` embedded, if any.
+    watermark: str | None = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.generation}/{self.version}"
+
+    @property
+    def live_file(self) -> str:
+        return f"live-{self.version}.npy"
+
+    @property
+    def dead_ratio(self) -> float:
+        """The fraction of rows that are superseded or deleted."""
+        return 1 - self.live_rows / self.rows if self.rows else 0.0
+
+
+class EmbeddingStore:
+    """Versioned on-disk snapshots of the embedding matrix and its ID map.
+
+    Parameters
+    ----------
+    directory : str | Path
+        The directory holding the generations and ``CURRENT``.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        self._loaded: tuple[int, EmbeddingIndex] | None = None
+
+    def snapshot(self) -> Snapshot | None:
+        """Return the manifest of the active snapshot, if any."""
+        try:
+            manifest = json.loads((self.directory / _CURRENT_FILE).read_text())
+        except FileNotFoundError:
+            return None
+
+        return Snapshot(**manifest)
+
+    def current(self) -> str | None:
+        """Return the name of the active snapshot, if any."""
+        snapshot = self.snapshot()
+
+        return snapshot.name if snapshot else None
+
+    def index(self) -> EmbeddingIndex | None:
+        """Return the active snapshot, mapping it again only when it changes.
+
+        Returns
+        -------
+        EmbeddingIndex | None
+            The active snapshot, or None if no snapshot has been saved.
+        """
+        snapshot = self.snapshot()
+        if snapshot is None:
+            return None
+
+        with self._lock:
+            if self._loaded is None or self._loaded[0] != snapshot.version:
+                self._loaded = self._load(snapshot)
+
+            return self._loaded[1]
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Hold the store's writer lock, shared by every process on the host."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        with open(self.directory / _LOCK_FILE, "w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def save(
+        self,
+        ids: Sequence[str],
+        vectors: np.ndarray,
+        updated: np.ndarray | None = None,
+        watermark: str | None = None,
+    ) -> Snapshot:
+        """Write a new generation holding exactly these rows and activate it.
+
+        Parameters
+        ----------
+        ids : Sequence[str]
+            Simulation IDs.
+        vectors : np.ndarray
+            A ``(len(ids), dim)`` array of unit-length embeddings.
+        updated : np.ndarray | None, optional
+            Each row's ``updated_at`` in microseconds, by default zeros.
+        watermark : str | None, optional
+            The newest ``updated_at`` covered, as an ISO timestamp.
+
+        Returns
+        -------
+        Snapshot
+            The new active snapshot.
+        """
+        if len(ids) != len(vectors):
+            raise ValueError("ids and vectors must have the same length.")
+
+        rows, dim = vectors.shape
+        if updated is None:
+            updated = np.zeros(rows, dtype=np.int64)
+
+        capacity = _capacity(rows)
+        generation = self._create_generation(capacity, dim)
+        self._write_rows(generation, 0, ids, vectors, updated)
+
+        snapshot = Snapshot(
+            version=time.time_ns(),
+            generation=generation,
+            rows=rows,
+            live_rows=rows,
+            capacity=capacity,
+            dim=dim,
+            watermark=watermark,
+        )
+        self._activate(snapshot, np.ones(rows, dtype=bool))
+
+        return snapshot
+
+    def apply(
+        self,
+        ids: Sequence[str],
+        vectors: np.ndarray,
+        updated: np.ndarray,
+        deleted: Sequence[str] = (),
+        watermark: str | None = None,
+    ) -> Snapshot:
+        """Upsert and delete rows, activating the result as a new snapshot.
+
+        Upserted rows are appended in place to the active generation, and the
+        rows they supersede, plus those of ``deleted``, are cleared in a new
+        live mask. A generation without room is compacted first. Callers must
+        hold ``lock()``.
+
+        Parameters
+        ----------
+        ids : Sequence[str]
+            IDs of new or changed simulations.
+        vectors : np.ndarray
+            Their ``(len(ids), dim)`` unit-length embeddings.
+        updated : np.ndarray
+            Their ``updated_at`` in microseconds.
+        deleted : Sequence[str], optional
+            IDs of simulations to remove, by default none.
+        watermark : str | None, optional
+            The new watermark, by default unchanged.
+
+        Returns
+        -------
+        Snapshot
+            The new active snapshot.
+        """
+        snapshot = self.snapshot()
+        if snapshot is None:
+            raise RuntimeError("The embedding store has no snapshot to update.")
+
+        if snapshot.rows + len(ids) > snapshot.capacity:
+            snapshot = self.compact(extra=len(ids))
+
+        index = self._load(snapshot)[1]
+        live = index.live.copy()
+
+        replaced = np.asarray([*ids, *deleted], dtype="U36")
+        if len(replaced):
+            live &= ~np.isin(index.ids, replaced)
+
+        self._write_rows(snapshot.generation, snapshot.rows, ids, vectors, updated)
+        live = np.concatenate([live, np.ones(len(ids), dtype=bool)])
+
+        new_snapshot = replace(
+            snapshot,
+            version=time.time_ns(),
+            rows=snapshot.rows + len(ids),
+            live_rows=int(live.sum()),
+            watermark=watermark or snapshot.watermark,
+        )
+        self._activate(new_snapshot, live)
+
+        return new_snapshot
+
+    def compact(self, extra: int = 0) -> Snapshot:
+        """Copy the live rows into a new generation with room to grow.
+
+        Callers must hold ``lock()``.
+
+        Parameters
+        ----------
+        extra : int, optional
+            Rows about to be appended, counted when sizing the generation.
+
+        Returns
+        -------
+        Snapshot
+            The new active snapshot.
+        """
+        snapshot = self.snapshot()
+        if snapshot is None:
+            raise RuntimeError("The embedding store has no snapshot to compact.")
+
+        index = self._load(snapshot)[1]
+        keep = np.flatnonzero(index.live)
+        capacity = _capacity(len(keep) + extra)
+        generation = self._create_generation(capacity, snapshot.dim)
+
+        for start in range(0, len(keep), _COPY_CHUNK):
+            rows = keep[start : start + _COPY_CHUNK]
+            self._write_rows(
+                generation,
+                start,
+                index.ids[rows],
+                index.vectors[rows],
+                index.updated[rows],
+            )
+
+        new_snapshot = replace(
+            snapshot,
+            version=time.time_ns(),
+            generation=generation,
+            rows=len(keep),
+            live_rows=len(keep),
+            capacity=capacity,
+        )
+        self._activate(new_snapshot, np.ones(len(keep), dtype=bool))
+
+        return new_snapshot
+
+    def _load(self, snapshot: Snapshot) -> tuple[int, EmbeddingIndex]:
+        try:
+            return snapshot.version, self._map(snapshot)
+        except FileNotFoundError:
+            # A concurrent compaction removed the generation; use the new one.
+            snapshot = self.snapshot() or snapshot
+
+            return snapshot.version, self._map(snapshot)
+
+    def _map(self, snapshot: Snapshot) -> EmbeddingIndex:
+        path = self.directory / snapshot.generation
+        rows = snapshot.rows
+
+        return EmbeddingIndex(
+            ids=np.load(path / _IDS_FILE, mmap_mode="r")[:rows],
+            vectors=np.load(path / _VECTORS_FILE, mmap_mode="r")[:rows],
+            live=np.load(path / snapshot.live_file),
+            updated=np.load(path / _UPDATED_FILE, mmap_mode="r")[:rows],
+        )
+
+    def _create_generation(self, capacity: int, dim: int) -> str:
+        generation = f"gen-{time.time_ns()}"
+        path = self.directory / generation
+        path.mkdir(parents=True)
+
+        open_memmap = np.lib.format.open_memmap
+        open_memmap(path / _IDS_FILE, mode="w+", dtype="U36", shape=(capacity,))
+        open_memmap(
+            path / _VECTORS_FILE, mode="w+", dtype=np.float32, shape=(capacity, dim)
+        )
+        open_memmap(path / _UPDATED_FILE, mode="w+", dtype=np.int64, shape=(capacity,))
+
+        return generation
+
+    def _write_rows(
+        self,
+        generation: str,
+        start: int,
+        ids: Sequence[str],
+        vectors: np.ndarray,
+        updated: np.ndarray,
+    ) -> None:
+        """Write rows at ``start`` in place, beyond any snapshot's row count."""
+        if len(ids) == 0:
+            return
+
+        path = self.directory / generation
+        end = start + len(ids)
+
+        for name, values in (
+            (_IDS_FILE, np.asarray(ids, dtype="U36")),
+            (_VECTORS_FILE, np.asarray(vectors, dtype=np.float32)),
+            (_UPDATED_FILE, np.asarray(updated, dtype=np.int64)),
+        ):
+            array = np.load(path / name, mmap_mode="r+")
+            array[start:end] = values
+            array.flush()
+
+    def _activate(self, snapshot: Snapshot, live: np.ndarray) -> None:
+        """Write the live mask, switch ``CURRENT`` and remove stale files."""
+        path = self.directory / snapshot.generation
+        np.save(path / snapshot.live_file, live)
+
+        tmp = self.directory / f"{_CURRENT_FILE}.tmp"
+        tmp.write_text(json.dumps(asdict(snapshot)))
+        os.replace(tmp, self.directory / _CURRENT_FILE)
+
+        # Readers load live masks fully and keep mappings of unlinked files,
+        # so everything but the active snapshot can be removed right away.
+        for mask in path.glob("live-*.npy"):
+            if mask.name != snapshot.live_file:
+                mask.unlink(missing_ok=True)
+
+        for other in self.directory.glob("gen-*"):
+            if other.name != snapshot.generation:
+                shutil.rmtree(other, ignore_errors=True)
+
+
+def _capacity(rows: int) -> int:
+    """Size a generation for ``rows`` plus a quarter more for appends."""
+    return rows + max(rows // 4, MIN_SPARE_ROWS)
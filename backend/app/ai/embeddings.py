@@ -0,0 +1,295 @@
+"""Dense embeddings of simulation descriptions for semantic catalog search.
+
+Each simulation's descriptive text is embedded with a sentence-transformers
+model into a unit-length float32 vector and kept in an ``EmbeddingStore``
+(see ``app/ai/embedding_store.py``), which the API memory-maps at query time.
+Because the vectors are normalized, cosine similarity against every run is a
+single matrix-vector product followed by an ``argpartition`` top-k, which
+takes milliseconds for 100k runs on CPU.
+
+The store is maintained incrementally: ``refresh_embeddings`` embeds only the
+simulations whose ``updated_at`` is past the store's watermark, patches them
+into the store in batches, drops deleted simulations and compacts the store
+once too many rows are dead. ``build_embeddings`` rebuilds it from scratch.
+
+Usage
+-----
+Refresh (or, on first run, build) the store from the database in ``.env``::
+
+    poetry run python -m app.ai.embeddings [--full] [--compact]
+"""
+
+import argparse
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app._logger import _setup_custom_logger
+from app.ai.embedding_store import EmbeddingStore
+from app.core.config import settings
+from app.db.simulation import Simulation
+
+logger = _setup_custom_logger(__name__)
+
+# Columns embedded for each simulation, with their labels in the text.
+EMBEDDING_FIELDS = {
+    "name": "Name",
+    "compset": "Compset",
+    "grid_name": "Grid",
+    "grid_resolution": "Resolution",
+    "notes_markdown": "Notes",
+    "known_issues": "Known issues",
+}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def simulation_text(sim: Any) -> str:
+    """Join a simulation's non-empty descriptive fields into one text.
+
+    Parameters
+    ----------
+    sim : Any
+        A ``Simulation`` or a row exposing the ``EMBEDDING_FIELDS`` columns.
+
+    Returns
+    -------
+    str
+        The text to embed, e.g. ``"Name: v3.LR.piControl; Compset: ..."``.
+    """
+    parts = []
+
+    for field, label in EMBEDDING_FIELDS.items():
+        value = getattr(sim, field)
+        if value and str(value).strip():
+            parts.append(f"{label}: {' '.join(str(value).split())}")
+
+    return "; ".join(parts)
+
+
+@lru_cache(maxsize=1)
+def get_encoder():
+    """Load the sentence-transformers model named by ``settings``, once."""
+    from sentence_transformers import SentenceTransformer
+
+    logger.info(f"Loading embedding model '{settings.embedding_model}'.")
+
+    return SentenceTransformer(settings.embedding_model, device="cpu")
+
+
+def encode(texts: Sequence[str], batch_size: int = 64) -> np.ndarray:
+    """Embed texts as unit-length float32 vectors.
+
+    Parameters
+    ----------
+    texts : Sequence[str]
+        The texts to embed.
+    batch_size : int, optional
+        The encoder batch size, by default 64.
+
+    Returns
+    -------
+    np.ndarray
+        A ``(len(texts), dim)`` float32 array with L2-normalized rows.
+    """
+    vectors = get_encoder().encode(
+        list(texts),
+        batch_size=batch_size,
+        normalize_embeddings=True,
+        convert_to_numpy=True,
+    )
+
+    return np.asarray(vectors, dtype=np.float32)
+
+
+@dataclass(frozen=True)
+class RefreshResult:
+    """What an incremental refresh changed."""
+
+    embedded: int
+    deleted: int
+    compacted: bool
+
+
+def build_embeddings(db: Session, store: EmbeddingStore, batch_size: int = 256) -> int:
+    """Embed every simulation and save the result as a new snapshot.
+
+    Parameters
+    ----------
+    db : Session
+        The database session.
+    store : EmbeddingStore
+        The store to write to.
+    batch_size : int, optional
+        The number of rows fetched and embedded at a time, by default 256.
+
+    Returns
+    -------
+    int
+        The number of simulations embedded.
+    """
+    ids: list[str] = []
+    updated: list[np.ndarray] = []
+    batches: list[np.ndarray] = []
+    watermark = None
+
+    with store.lock():
+        for rows in _iter_batches(db, None, batch_size):
+            ids.extend(str(row.id) for row in rows)
+            updated.append(_micros([row.updated_at for row in rows]))
+            batches.append(encode([simulation_text(row) for row in rows], batch_size))
+            watermark = rows[-1].updated_at
+
+        dim = get_encoder().get_sentence_embedding_dimension()
+        store.save(
+            ids,
+            np.concatenate(batches) if batches else np.empty((0, dim), np.float32),
+            np.concatenate(updated) if updated else None,
+            watermark=watermark.isoformat() if watermark else None,
+        )
+
+    logger.info(f"Embedded {len(ids)} simulations.")
+
+    return len(ids)
+
+
+def refresh_embeddings(
+    db: Session,
+    store: EmbeddingStore,
+    batch_size: int = 256,
+    compact: bool = False,
+) -> RefreshResult:
+    """Embed new and changed simulations and drop deleted ones, in place.
+
+    Rows with ``updated_at`` later than the store's watermark, minus
+    ``settings.embedding_refresh_lag`` seconds to catch transactions that
+    committed late, are fetched in ``updated_at`` order. Rows whose stored
+    ``updated_at`` is unchanged are skipped; the rest are embedded and applied
+    one batch at a time, each batch becoming a new snapshot with an advanced
+    watermark, so an interrupted refresh resumes where it stopped.
+
+    Parameters
+    ----------
+    db : Session
+        The database session.
+    store : EmbeddingStore
+        The store to update. If it is empty, it is built from scratch.
+    batch_size : int, optional
+        The number of rows fetched and embedded at a time, by default 256.
+    compact : bool, optional
+        Whether to compact even if the dead-row ratio is below
+        ``settings.embedding_compact_ratio``, by default False.
+
+    Returns
+    -------
+    RefreshResult
+        The number of rows embedded and deleted, and whether it compacted.
+    """
+    if store.snapshot() is None:
+        return RefreshResult(
+            embedded=build_embeddings(db, store, batch_size), deleted=0, compacted=False
+        )
+
+    with store.lock():
+        index = store.index()
+        snapshot = store.snapshot()
+        live_ids = index.ids[index.live]
+        stored = dict(zip(live_ids.tolist(), index.updated[index.live].tolist()))
+
+        watermark = since = None
+        if snapshot.watermark is not None:
+            watermark = datetime.fromisoformat(snapshot.watermark)
+            since = watermark - timedelta(seconds=settings.embedding_refresh_lag)
+
+        embedded = 0
+        for rows in _iter_batches(db, since, batch_size):
+            micros = _micros([row.updated_at for row in rows])
+            changed = [
+                (row, ts)
+                for row, ts in zip(rows, micros.tolist(), strict=True)
+                if stored.get(str(row.id)) != ts
+            ]
+            if not changed:
+                continue
+
+            # Batches arrive in updated_at order, so the last row is the newest.
+            watermark = max(watermark or rows[-1].updated_at, rows[-1].updated_at)
+            store.apply(
+                [str(row.id) for row, _ in changed],
+                encode([simulation_text(row) for row, _ in changed], batch_size),
+                np.asarray([ts for _, ts in changed], dtype=np.int64),
+                watermark=watermark.isoformat(),
+            )
+            embedded += len(changed)
+
+        existing = np.asarray(
+            [str(sim_id) for sim_id in db.scalars(select(Simulation.id))], dtype="U36"
+        )
+        deleted = live_ids[~np.isin(live_ids, existing)].tolist()
+        if deleted:
+            store.apply([], np.empty((0, snapshot.dim), np.float32), [], deleted)
+
+        snapshot = store.snapshot()
+        compacted = compact or snapshot.dead_ratio > settings.embedding_compact_ratio
+        if compacted:
+            store.compact()
+
+    logger.info(
+        f"Refreshed embeddings: {embedded} embedded, {len(deleted)} deleted"
+        f"{', compacted' if compacted else ''}."
+    )
+
+    return RefreshResult(embedded=embedded, deleted=len(deleted), compacted=compacted)
+
+
+def _iter_batches(db: Session, since: datetime | None, batch_size: int):
+    """Yield batches of rows to embed, oldest ``updated_at`` first."""
+    columns = [getattr(Simulation, field) for field in EMBEDDING_FIELDS]
+    stmt = select(Simulation.id, Simulation.updated_at, *columns).order_by(
+        Simulation.updated_at, Simulation.id
+    )
+    if since is not None:
+        stmt = stmt.where(Simulation.updated_at > since)
+
+    yield from db.execute(stmt.execution_options(yield_per=batch_size)).partitions()
+
+
+def _micros(timestamps: list[datetime]) -> np.ndarray:
+    """Convert timestamps to integer microseconds since the epoch."""
+    return np.asarray(
+        [(ts - _EPOCH) // timedelta(microseconds=1) for ts in timestamps],
+        dtype=np.int64,
+    )
+
+
+def main() -> None:
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(
+        description="Refresh the semantic search embeddings."
+    )
+    parser.add_argument(
+        "--full", action="store_true", help="Rebuild every embedding from scratch."
+    )
+    parser.add_argument(
+        "--compact", action="store_true", help="Compact the store after refreshing."
+    )
+    args = parser.parse_args()
+
+    store = EmbeddingStore(settings.embedding_dir)
+
+    with SessionLocal() as db:
+        if args.full:
+            build_embeddings(db, store)
+        else:
+            refresh_embeddings(db, store, compact=args.compact)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""Prompt templates for the simulation summarizer."""
+
+from typing import List
+
+
+def compare_prompt(descriptions: List[str]) -> str:
+    """
+    Build the prompt that asks the model to compare simulation descriptions.
+    """
+    return (
+        "Compare the following E3SM simulation metadata. "
+        "Summarize key similarities and differences in tag, campaign, compset, resolution, machine, and notes.\n\n"
+        + "\n".join(descriptions)
+        + "\n\nSummary:"
+    )
+
+
+def reduce_prompt(summaries: List[str]) -> str:
+    """
+    Build the prompt that merges intermediate chunk summaries into one.
+    """
+    return (
+        "Given these summaries of E3SM simulation metadata groups, synthesize overall trends, differences, and recurring patterns in tag, campaign, compset, resolution, machine, and notes.\n\n"
+        + "\n".join(summaries)
+        + "\n\nOverall Summary:"
+    )
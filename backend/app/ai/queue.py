@@ -0,0 +1,75 @@
+"""Admission control for model inference.
+
+Model calls are CPU-bound and slow, so the number that run at once is capped
+by a pool of worker slots, and the number of analyses admitted to wait for
+those slots is capped too. Callers that cannot be admitted get
+``InferenceQueueFull`` immediately instead of queueing behind the backlog,
+which lets them degrade to a cheaper path (e.g. extractive summarization).
+"""
+
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+
+class InferenceQueueFull(Exception):
+    """Raised when an analysis cannot be admitted to a saturated queue."""
+
+
+class InferenceQueue:
+    """A bounded queue of analyses sharing a fixed number of model workers.
+
+    Parameters
+    ----------
+    workers : int
+        The maximum number of model calls that run concurrently.
+    depth : int
+        The maximum number of analyses admitted at once, running or waiting.
+    """
+
+    def __init__(self, workers: int, depth: int):
+        if workers < 1 or depth < 1:
+            raise ValueError("workers and depth must be positive")
+
+        self.depth = depth
+        self._slots = threading.BoundedSemaphore(workers)
+        self._lock = threading.Lock()
+        self._admitted = 0
+
+    @property
+    def admitted(self) -> int:
+        """The number of analyses currently admitted."""
+        return self._admitted
+
+    @property
+    def saturated(self) -> bool:
+        """Whether a new analysis would be rejected."""
+        return self._admitted >= self.depth
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        """Admit an analysis for the duration of the block, without waiting.
+
+        Raises
+        ------
+        InferenceQueueFull
+            If ``depth`` analyses are already admitted.
+        """
+        with self._lock:
+            if self._admitted >= self.depth:
+                raise InferenceQueueFull(
+                    f"Inference queue is full ({self.depth} analyses admitted)."
+                )
+            self._admitted += 1
+
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._admitted -= 1
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold a model worker slot for one call, blocking until one is free."""
+        with self._slots:
+            yield
@@ -0,0 +1,276 @@
+"""Hybrid "more like this" scoring of simulations.
+
+Every simulation is reduced to a row of precomputed features: an integer code
+per categorical field (``compset``, ``grid_name``, ``machine_id`` and
+``version_tag``) and a unit-length TF-IDF vector of its notes. Scoring one
+simulation against the whole catalog is then a handful of vectorized
+comparisons and one sparse matrix-vector product:
+
+    score = sum(weight[f] * (code[f] == code[f][query])) + weight["notes"] * cos
+
+so a query costs a few milliseconds regardless of how many runs share the
+query's compset or grid. The text term deliberately covers the notes only:
+the description embeddings also encode the compset and grid, which would
+count those fields twice.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.simulation import Simulation
+
+# Structural fields compared for exact equality, with their score weights.
+CATEGORICAL_WEIGHTS = {
+    "compset": 0.3,
+    "grid_name": 0.2,
+    "machine_id": 0.1,
+    "version_tag": 0.1,
+}
+
+# Weight of the cosine similarity between the TF-IDF vectors of the notes.
+TEXT_WEIGHT = 0.3
+TEXT_FIELD = "notes"
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[._-][a-z0-9]+)*")
+
+# Code of a missing (NULL) categorical value; it never matches anything.
+_MISSING = -1
+
+
+@dataclass(frozen=True)
+class FieldScore:
+    """How one field contributed to a candidate's score."""
+
+    field: str
+    value: str | None
+    match: bool | None
+    similarity: float
+    weight: float
+    contribution: float
+
+
+@dataclass(frozen=True)
+class SimilarMatch:
+    """A candidate simulation with its score and per-field breakdown."""
+
+    id: str
+    score: float
+    fields: list[FieldScore]
+
+
+@dataclass(frozen=True)
+class NoteVectors:
+    """Sparse TF-IDF vectors, as one ``(row, term, weight)`` entry per nonzero.
+
+    Attributes
+    ----------
+    rows : np.ndarray
+        ``(nnz,)`` row of each entry.
+    terms : np.ndarray
+        ``(nnz,)`` vocabulary code of each entry.
+    weights : np.ndarray
+        ``(nnz,)`` weight of each entry; every row has unit length.
+    """
+
+    rows: np.ndarray
+    terms: np.ndarray
+    weights: np.ndarray
+
+    def cosine(self, i: int, n: int) -> np.ndarray:
+        """Return the ``(n,)`` cosine similarities of every row to row ``i``."""
+        mine = self.rows == i
+        query = np.zeros(int(self.terms.max(initial=-1)) + 1)
+        query[self.terms[mine]] = self.weights[mine]
+
+        return np.bincount(
+            self.rows, weights=self.weights * query[self.terms], minlength=n
+        )
+
+
+@dataclass(frozen=True)
+class SimilarityFeatures:
+    """Per-simulation feature arrays, aligned by row.
+
+    Attributes
+    ----------
+    ids : np.ndarray
+        ``(n,)`` simulation IDs.
+    codes : dict[str, np.ndarray]
+        ``(n,)`` int32 codes per categorical field, ``-1`` where NULL.
+    labels : dict[str, np.ndarray]
+        The distinct values of each field, indexed by code.
+    notes : NoteVectors
+        Unit-length TF-IDF vectors of the notes; simulations without notes
+        have no entries.
+    """
+
+    ids: np.ndarray
+    codes: dict[str, np.ndarray]
+    labels: dict[str, np.ndarray]
+    notes: NoteVectors
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def row(self, sim_id: str) -> int | None:
+        """Return the row of a simulation, or None if it is not featurized."""
+        rows = np.flatnonzero(self.ids == sim_id)
+
+        return int(rows[0]) if len(rows) else None
+
+    def similar(self, sim_id: str, k: int) -> list[SimilarMatch]:
+        """Return the ``k`` simulations most similar to ``sim_id``.
+
+        Parameters
+        ----------
+        sim_id : str
+            The simulation to compare against.
+        k : int
+            The number of results.
+
+        Returns
+        -------
+        list[SimilarMatch]
+            The best candidates, highest score first, excluding ``sim_id``.
+
+        Raises
+        ------
+        KeyError
+            If ``sim_id`` is not featurized.
+        """
+        i = self.row(sim_id)
+        if i is None:
+            raise KeyError(sim_id)
+
+        matches = {
+            field: (codes == codes[i]) & (codes[i] != _MISSING)
+            for field, codes in self.codes.items()
+        }
+        text = np.clip(self.notes.cosine(i, len(self)), 0.0, 1.0)
+
+        scores = TEXT_WEIGHT * text
+        for field, match in matches.items():
+            scores += CATEGORICAL_WEIGHTS[field] * match
+        scores[i] = -np.inf
+
+        k = min(k, len(self) - 1)
+        if k <= 0:
+            return []
+
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((top, -scores[top]))]
+
+        return [
+            SimilarMatch(
+                id=str(self.ids[j]),
+                score=float(scores[j]),
+                fields=self._explain(j, matches, text),
+            )
+            for j in top
+        ]
+
+    def _explain(
+        self, j: int, matches: dict[str, np.ndarray], text: np.ndarray
+    ) -> list[FieldScore]:
+        fields = []
+
+        for field, match in matches.items():
+            code = self.codes[field][j]
+            weight = CATEGORICAL_WEIGHTS[field]
+            fields.append(
+                FieldScore(
+                    field=field,
+                    value=None if code == _MISSING else str(self.labels[field][code]),
+                    match=bool(match[j]),
+                    similarity=float(match[j]),
+                    weight=weight,
+                    contribution=weight * float(match[j]),
+                )
+            )
+
+        fields.append(
+            FieldScore(
+                field=TEXT_FIELD,
+                value=None,
+                match=None,
+                similarity=float(text[j]),
+                weight=TEXT_WEIGHT,
+                contribution=TEXT_WEIGHT * float(text[j]),
+            )
+        )
+
+        return fields
+
+
+def build_features(db: Session) -> SimilarityFeatures:
+    """Load the categorical columns and notes of every simulation and encode them.
+
+    Parameters
+    ----------
+    db : Session
+        The database session.
+
+    Returns
+    -------
+    SimilarityFeatures
+        The feature arrays, in one row per simulation.
+    """
+    columns = [getattr(Simulation, field) for field in CATEGORICAL_WEIGHTS]
+    rows = db.execute(
+        select(Simulation.id, *columns, Simulation.notes_markdown).order_by(
+            Simulation.id
+        )
+    ).all()
+
+    ids = np.asarray([str(row.id) for row in rows], dtype="U36")
+    codes: dict[str, np.ndarray] = {}
+    labels: dict[str, np.ndarray] = {}
+    for field in CATEGORICAL_WEIGHTS:
+        codes[field], labels[field] = _factorize([getattr(r, field) for r in rows])
+
+    return SimilarityFeatures(
+        ids=ids,
+        codes=codes,
+        labels=labels,
+        notes=_tfidf([row.notes_markdown for row in rows]),
+    )
+
+
+def _tfidf(texts: list[str | None]) -> NoteVectors:
+    """Build unit-length TF-IDF vectors with one row per text."""
+    tokens = [_TOKEN_RE.findall(text.lower()) if text else [] for text in texts]
+    words = np.asarray([token for row in tokens for token in row], dtype=str)
+    if not len(words):
+        empty = np.zeros(0, dtype=np.intp)
+
+        return NoteVectors(rows=empty, terms=empty, weights=np.zeros(0))
+
+    rows = np.repeat(np.arange(len(texts)), [len(row) for row in tokens])
+    _, terms = np.unique(words, return_inverse=True)
+    (rows, terms), tf = np.unique(np.stack([rows, terms]), axis=1, return_counts=True)
+
+    df = np.bincount(terms)
+    weights = tf * (np.log((1 + len(texts)) / (1 + df[terms])) + 1.0)
+    norms = np.sqrt(np.bincount(rows, weights=weights**2))
+    weights /= norms[rows]
+
+    return NoteVectors(rows=rows, terms=terms, weights=weights)
+
+
+def _factorize(values: list[Any]) -> tuple[np.ndarray, np.ndarray]:
+    """Encode values as int32 codes into their sorted distinct values."""
+    present = np.asarray([v is not None for v in values], dtype=bool)
+    labels, inverse = np.unique(
+        np.asarray([str(v) for v in values if v is not None], dtype=str),
+        return_inverse=True,
+    )
+
+    codes = np.full(len(values), _MISSING, dtype=np.int32)
+    codes[present] = inverse
+
+    return codes, labels
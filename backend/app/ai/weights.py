@@ -0,0 +1,162 @@
+"""Zero-copy loading of seq2seq models from memory-mapped safetensors files.
+
+``from_pretrained`` copies every weight into memory owned by the process, so
+each uvicorn worker holds a private copy of the model. Here the model is built
+on the ``meta`` device and its parameters are assigned tensors that view a
+copy-on-write ``mmap`` of the checkpoint. Weights are never written during
+inference, so their pages stay in the shared page cache: every worker that
+maps the same file (whether forked after loading or spawned separately) reuses
+one physical copy, and loading only has to parse the file headers.
+
+Everything is read from the local model directory with ``local_files_only``,
+so no Hugging Face hub lookups are made.
+"""
+
+import json
+import mmap
+import struct
+from pathlib import Path
+
+import torch
+from transformers import (
+    AutoConfig,
+    AutoModelForSeq2SeqLM,
+    GenerationConfig,
+    PreTrainedModel,
+)
+
+from app._logger import _setup_custom_logger
+
+logger = _setup_custom_logger(__name__)
+
+# safetensors dtype codes and their torch equivalents.
+_DTYPES = {
+    "F64": torch.float64,
+    "F32": torch.float32,
+    "F16": torch.float16,
+    "BF16": torch.bfloat16,
+    "I64": torch.int64,
+    "I32": torch.int32,
+    "I16": torch.int16,
+    "I8": torch.int8,
+    "U8": torch.uint8,
+    "BOOL": torch.bool,
+}
+
+
+def mmap_safetensors(path: str | Path) -> dict[str, torch.Tensor]:
+    """Map a safetensors file and return tensors that view the mapping.
+
+    The file is mapped copy-on-write, so its pages are shared through the page
+    cache until a tensor is written to, which inference never does.
+
+    Parameters
+    ----------
+    path : str | Path
+        The ``.safetensors`` file.
+
+    Returns
+    -------
+    dict[str, torch.Tensor]
+        Tensors by name, each keeping the mapping alive.
+    """
+    with open(path, "rb") as f:
+        (header_size,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_size))
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    if hasattr(mmap, "MADV_WILLNEED"):
+        # Start reading the file into the page cache ahead of the first use.
+        buffer.madvise(mmap.MADV_WILLNEED)
+
+    header.pop("__metadata__", None)
+    data_start = 8 + header_size
+    tensors = {}
+
+    for name, info in header.items():
+        begin, end = info["data_offsets"]
+        dtype = _DTYPES[info["dtype"]]
+        count = (end - begin) // dtype.itemsize
+
+        tensor = torch.frombuffer(
+            buffer, dtype=dtype, count=count, offset=data_start + begin
+        )
+        tensors[name] = tensor.view(info["shape"])
+
+    return tensors
+
+
+def load_mmap_model(model_dir: str | Path) -> PreTrainedModel:
+    """Load a seq2seq model whose weights view memory-mapped safetensors.
+
+    Parameters
+    ----------
+    model_dir : str | Path
+        A local model directory containing ``config.json`` and one or more
+        ``*.safetensors`` files, as written by ``save_pretrained``.
+
+    Returns
+    -------
+    PreTrainedModel
+        The model in eval mode.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the directory has no safetensors weights.
+    RuntimeError
+        If the weights do not cover every parameter and buffer of the model.
+    """
+    model_dir = Path(model_dir)
+    files = sorted(model_dir.glob("*.safetensors"))
+    if not files:
+        raise FileNotFoundError(f"No .safetensors weights found in '{model_dir}'.")
+
+    config = AutoConfig.from_pretrained(model_dir, local_files_only=True)
+    with torch.device("meta"):
+        model = AutoModelForSeq2SeqLM.from_config(config)
+
+    state_dict: dict[str, torch.Tensor] = {}
+    for path in files:
+        state_dict.update(mmap_safetensors(path))
+
+    state_dict = _add_base_model_prefix(model, state_dict)
+    model.load_state_dict(state_dict, strict=False, assign=True)
+
+    # Tied weights (shared embeddings and LM head) are stored only once.
+    model.tie_weights()
+
+    missing = [
+        name
+        for name, tensor in [*model.named_parameters(), *model.named_buffers()]
+        if tensor.is_meta
+    ]
+    if missing:
+        raise RuntimeError(
+            f"Weights in '{model_dir}' are missing tensors: {', '.join(missing)}"
+        )
+
+    if (model_dir / "generation_config.json").exists():
+        model.generation_config = GenerationConfig.from_pretrained(
+            model_dir, local_files_only=True
+        )
+
+    logger.info(f"Memory-mapped {len(state_dict)} tensors from {len(files)} files.")
+
+    return model.eval()
+
+
+def _add_base_model_prefix(
+    model: PreTrainedModel, state_dict: dict[str, torch.Tensor]
+) -> dict[str, torch.Tensor]:
+    """Prefix keys saved from a bare base model (e.g. ``BartModel``)."""
+    prefix = model.base_model_prefix
+    expected = model.state_dict().keys()
+
+    if any(key.startswith(f"{prefix}.") for key in state_dict) or not prefix:
+        return state_dict
+
+    return {
+        f"{prefix}.{key}" if f"{prefix}.{key}" in expected else key: tensor
+        for key, tensor in state_dict.items()
+    }
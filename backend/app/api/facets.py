@@ -0,0 +1,455 @@
+"""In-process bitset index over the categorical columns of the catalog.
+
+Every simulation gets a row number, and every distinct value of a facet column
+gets a bitset over the rows, packed into ``uint64`` words. A filter is then the
+OR of the selected values' bitsets per column, ANDed across columns, and the
+count of each facet value is the popcount of its bitset ANDed with the filter.
+A query over the whole catalog is a few vectorized NumPy operations on
+``rows / 64`` words per value, so the Browse page can refilter on every
+keystroke without a database round trip.
+
+Facet counts are disjunctive: a column's counts ignore that column's own
+selection, so selecting ``compset=A`` still shows how many runs ``compset=B``
+would add.
+
+The process-wide ``catalog_facets`` is built at startup, updated from
+SQLAlchemy session events whenever this process commits simulation changes,
+and rebuilt after ``settings.facet_index_ttl`` seconds to pick up writes made
+by other processes. Without an index, ``query_facets`` answers the same query
+with one ``GROUP BY`` per facet column.
+"""
+
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from sqlalchemy import event, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app._logger import _setup_custom_logger
+from app.api.filters import apply_simulation_filter
+from app.core.config import settings
+from app.db.simulation import Simulation
+
+logger = _setup_custom_logger(__name__)
+
+# Dictionary-encoded columns of ``Simulation``.
+FACET_FIELDS = (
+    "status",
+    "compset",
+    "grid_resolution",
+    "machine_id",
+    "campaign_id",
+    "simulation_type",
+    "version_tag",
+)
+
+_WORD_BITS = 64
+_MIN_ROWS = 1024
+_MIN_VALUES = 8
+
+# Key of the pending facet changes in ``Session.info``.
+_PENDING_KEY = "facet_changes"
+
+
+@dataclass(frozen=True)
+class FacetResult:
+    """The simulations matching a facet query and the counts per facet value."""
+
+    ids: list[str]
+    total: int
+    counts: dict[str, dict[str, int]]
+
+
+class _Column:
+    """The bitsets of one facet column, one row of words per distinct value."""
+
+    def __init__(self, words: int):
+        self.values: list[str] = []
+        self.code_of: dict[str, int] = {}
+        self.bits = np.zeros((_MIN_VALUES, words), dtype=np.uint64)
+        # The value code of each row, -1 for NULL or free rows.
+        self.codes = np.full(words * _WORD_BITS, -1, dtype=np.int32)
+
+    def code(self, value: str) -> int:
+        """Return the code of ``value``, adding a bitset for it if new."""
+        code = self.code_of.get(value)
+        if code is None:
+            code = len(self.values)
+            if code == len(self.bits):
+                self.bits = _grow(self.bits, axis=0)
+            self.values.append(value)
+            self.code_of[value] = code
+
+        return code
+
+    def resize(self, words: int) -> None:
+        self.bits = _grow(self.bits, axis=1, size=words)
+        codes = np.full(words * _WORD_BITS, -1, dtype=np.int32)
+        codes[: len(self.codes)] = self.codes
+        self.codes = codes
+
+
+class FacetIndex:
+    """Bitsets over the facet columns of a set of simulations.
+
+    Parameters
+    ----------
+    fields : tuple[str, ...], optional
+        The facet columns, by default ``FACET_FIELDS``.
+    capacity : int, optional
+        The number of rows to allocate up front, by default 1024.
+    """
+
+    def __init__(
+        self, fields: tuple[str, ...] = FACET_FIELDS, capacity: int = _MIN_ROWS
+    ):
+        self.fields = fields
+        self.built_at = time.monotonic()
+
+        words = max(-(-capacity // _WORD_BITS), _MIN_ROWS // _WORD_BITS)
+        self._ids: list[str | None] = []
+        self._row_of: dict[str, int] = {}
+        self._free: list[int] = []
+        self._live = np.zeros(words, dtype=np.uint64)
+        self._columns = {field: _Column(words) for field in fields}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_rows(
+        cls, rows: Iterable[Any], fields: tuple[str, ...] = FACET_FIELDS
+    ) -> "FacetIndex":
+        """Build an index from rows exposing ``id`` and the facet columns.
+
+        Parameters
+        ----------
+        rows : Iterable[Any]
+            ``Simulation`` objects or result rows.
+        fields : tuple[str, ...], optional
+            The facet columns, by default ``FACET_FIELDS``.
+
+        Returns
+        -------
+        FacetIndex
+            The index, with one row per input row in order.
+        """
+        rows = list(rows)
+        index = cls(fields, capacity=len(rows))
+        n = len(rows)
+
+        index._ids = [str(row.id) for row in rows]
+        index._row_of = {sim_id: i for i, sim_id in enumerate(index._ids)}
+        positions = np.arange(n)
+        _set_bits(index._live, positions)
+
+        for field, column in index._columns.items():
+            values = [_key(getattr(row, field)) for row in rows]
+            present = np.asarray([v is not None for v in values], dtype=bool)
+            labels, inverse = np.unique(
+                np.asarray([v for v in values if v is not None], dtype=object),
+                return_inverse=True,
+            )
+            for label in labels:
+                column.code(label)
+
+            column.codes[:n][present] = inverse
+            np.bitwise_or.at(
+                column.bits,
+                (inverse, positions[present] // _WORD_BITS),
+                np.left_shift(
+                    np.uint64(1), (positions[present] % _WORD_BITS).astype(np.uint64)
+                ),
+            )
+
+        return index
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def upsert(self, sim_id: str, values: Mapping[str, Any]) -> None:
+        """Add a simulation, or move an existing one to its new values.
+
+        Parameters
+        ----------
+        sim_id : str
+            The simulation ID.
+        values : Mapping[str, Any]
+            The simulation's value of each facet column.
+        """
+        with self._lock:
+            row = self._row_of.get(sim_id)
+            if row is None:
+                row = self._allocate(sim_id)
+
+            for field, column in self._columns.items():
+                self._clear(column, row)
+
+                value = _key(values.get(field))
+                if value is not None:
+                    code = column.code(value)
+                    column.codes[row] = code
+                    _set_bits(column.bits[code], row)
+
+    def remove(self, sim_id: str) -> None:
+        """Drop a simulation; unknown IDs are ignored."""
+        with self._lock:
+            row = self._row_of.pop(sim_id, None)
+            if row is None:
+                return
+
+            for column in self._columns.values():
+                self._clear(column, row)
+
+            _clear_bits(self._live, row)
+            self._ids[row] = None
+            self._free.append(row)
+
+    def query(self, filters: Mapping[str, Iterable[str]]) -> FacetResult:
+        """Match simulations against facet selections and count facet values.
+
+        Parameters
+        ----------
+        filters : Mapping[str, Iterable[str]]
+            Selected values per facet column. Values of one column are ORed
+            and columns are ANDed; columns that are missing or empty match
+            everything.
+
+        Returns
+        -------
+        FacetResult
+            The matching IDs in row order, their number, and for each column
+            the count of each value under the other columns' selections.
+
+        Raises
+        ------
+        KeyError
+            If a filter names an unknown column.
+        """
+        with self._lock:
+            masks = {}
+            for field, values in filters.items():
+                values = list(values)
+                if values:
+                    masks[field] = self._select(self._columns[field], values)
+
+            matched = self._and(masks.values())
+            counts = {}
+            for field, column in self._columns.items():
+                others = self._and(m for f, m in masks.items() if f != field)
+                n = len(column.values)
+                popcounts = np.bitwise_count(column.bits[:n] & others).sum(axis=1)
+                counts[field] = {
+                    value: int(count)
+                    for value, count in zip(column.values, popcounts, strict=True)
+                    if count
+                }
+
+            rows = np.flatnonzero(
+                np.unpackbits(matched.view(np.uint8), bitorder="little")
+            )
+            ids = [self._ids[row] for row in rows]
+
+        return FacetResult(ids=ids, total=len(ids), counts=counts)
+
+    def _allocate(self, sim_id: str) -> int:
+        if self._free:
+            row = self._free.pop()
+            self._ids[row] = sim_id
+        else:
+            row = len(self._ids)
+            self._ids.append(sim_id)
+            if row >= len(self._live) * _WORD_BITS:
+                self._live = _grow(self._live, axis=0)
+                for column in self._columns.values():
+                    column.resize(len(self._live))
+
+        self._row_of[sim_id] = row
+        _set_bits(self._live, row)
+
+        return row
+
+    def _clear(self, column: _Column, row: int) -> None:
+        code = column.codes[row]
+        if code >= 0:
+            _clear_bits(column.bits[code], row)
+            column.codes[row] = -1
+
+    def _select(self, column: _Column, values: list[str]) -> np.ndarray:
+        codes = [column.code_of[v] for v in values if v in column.code_of]
+
+        return np.bitwise_or.reduce(
+            column.bits[codes], axis=0, initial=np.uint64(0)
+        ).astype(np.uint64)
+
+    def _and(self, masks: Iterable[np.ndarray]) -> np.ndarray:
+        result = self._live.copy()
+        for mask in masks:
+            result &= mask
+
+        return result
+
+
+class CatalogFacets:
+    """The process-wide ``FacetIndex`` over the ``simulations`` table."""
+
+    def __init__(self):
+        self._index: FacetIndex | None = None
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> FacetIndex:
+        """Return the index, building it if missing or older than the TTL."""
+        index = self._index
+        if (
+            index is None
+            or time.monotonic() - index.built_at > settings.facet_index_ttl
+        ):
+            with self._lock:
+                if self._index is index:
+                    self._index = load_facet_index(db)
+                index = self._index
+
+        return index
+
+    @property
+    def ready(self) -> bool:
+        """Whether the index has been built, e.g. by ``warm_facet_index``."""
+        return self._index is not None
+
+    def apply(self, changes: Mapping[str, Mapping[str, Any] | None]) -> None:
+        """Apply committed changes: facet values per ID, or None if deleted."""
+        index = self._index
+        if index is None:
+            return
+
+        for sim_id, values in changes.items():
+            if values is None:
+                index.remove(sim_id)
+            else:
+                index.upsert(sim_id, values)
+
+    def reset(self) -> None:
+        """Forget the index, so the next ``get`` rebuilds it."""
+        self._index = None
+
+
+def warm_facet_index() -> None:
+    """Build ``catalog_facets`` at startup, logging instead of failing."""
+    from app.db.session import SessionLocal
+
+    try:
+        with SessionLocal() as db:
+            catalog_facets.get(db)
+    except SQLAlchemyError as e:
+        logger.warning(f"Could not build the facet index at startup: {e}")
+
+
+def load_facet_index(db: Session) -> FacetIndex:
+    """Build a ``FacetIndex`` over every simulation in one query."""
+    started = time.perf_counter()
+    rows = db.execute(
+        select(Simulation.id, *(getattr(Simulation, f) for f in FACET_FIELDS))
+    ).all()
+    index = FacetIndex.from_rows(rows)
+
+    logger.info(
+        f"Built facet index over {len(index)} simulations in "
+        f"{(time.perf_counter() - started) * 1000:.1f} ms."
+    )
+
+    return index
+
+
+def query_facets(db: Session, filters: Mapping[str, Iterable[Any]]) -> FacetResult:
+    """Answer a ``FacetIndex.query`` from the database.
+
+    Parameters
+    ----------
+    db : Session
+        The database session.
+    filters : Mapping[str, Iterable[Any]]
+        Selected values per facet column, with the semantics of
+        ``FacetIndex.query``.
+
+    Returns
+    -------
+    FacetResult
+        The matching IDs, their number, and for each column the count of each
+        value under the other columns' selections.
+    """
+    selections = {field: list(values) for field, values in filters.items()}
+
+    ids = [
+        str(sim_id)
+        for sim_id in db.scalars(
+            apply_simulation_filter(select(Simulation.id), selections)
+        )
+    ]
+    counts = {}
+    for field in FACET_FIELDS:
+        column = getattr(Simulation, field)
+        stmt = select(column, func.count()).where(column.is_not(None)).group_by(column)
+        others = {f: values for f, values in selections.items() if f != field}
+        counts[field] = {
+            str(value): count
+            for value, count in db.execute(apply_simulation_filter(stmt, others))
+        }
+
+    return FacetResult(ids=ids, total=len(ids), counts=counts)
+
+
+catalog_facets = CatalogFacets()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_facet_changes(session: Session, flush_context: Any) -> None:
+    changes = session.info.setdefault(_PENDING_KEY, {})
+
+    for obj in session.new | session.dirty:
+        if isinstance(obj, Simulation):
+            changes[str(obj.id)] = {f: getattr(obj, f) for f in FACET_FIELDS}
+    for obj in session.deleted:
+        if isinstance(obj, Simulation):
+            changes[str(obj.id)] = None
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_facet_changes(session: Session) -> None:
+    changes = session.info.pop(_PENDING_KEY, None)
+    if changes:
+        catalog_facets.apply(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_facet_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _key(value: Any) -> str | None:
+    return None if value is None else str(value)
+
+
+def _set_bits(words: np.ndarray, rows: int | np.ndarray) -> None:
+    rows = np.asarray(rows)
+    np.bitwise_or.at(
+        words,
+        rows // _WORD_BITS,
+        np.left_shift(np.uint64(1), (rows % _WORD_BITS).astype(np.uint64)),
+    )
+
+
+def _clear_bits(words: np.ndarray, row: int) -> None:
+    words[row // _WORD_BITS] &= ~np.uint64(1 << (row % _WORD_BITS))
+
+
+def _grow(array: np.ndarray, axis: int, size: int | None = None) -> np.ndarray:
+    """Return a zero-padded copy of ``array`` with ``axis`` doubled (or ``size``)."""
+    shape = list(array.shape)
+    shape[axis] = size if size is not None else max(shape[axis] * 2, 1)
+    grown = np.zeros(shape, dtype=array.dtype)
+    grown[tuple(slice(0, n) for n in array.shape)] = array
+
+    return grown
@@ -0,0 +1,216 @@
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy import Select, cast, func, or_, select
+from sqlalchemy.dialects.postgresql import JSONPATH
+
+from app.db.simulation import Simulation
+from app.db.variable import SimulationVariable
+from app.schemas.simulation import SimulationFilter
+
+# Query parameters addressing keys of ``Simulation.extra``, e.g. ``extra.a.b=1``.
+EXTRA_PREFIX = "extra."
+# Suffix turning an ``extra`` parameter into a key-presence test.
+EXISTS_SUFFIX = ".exists"
+
+
+@dataclass(frozen=True)
+class ExtraFilter:
+    """A predicate on one (possibly nested) key of ``Simulation.extra``.
+
+    Attributes
+    ----------
+    path : tuple[str, ...]
+        The keys from the top level down, e.g. ``("tuning", "clubb")``.
+    values : tuple[Any, ...]
+        JSON values the key may equal; empty for a presence test.
+    exists : bool
+        For a presence test, whether the key must be present or absent.
+    """
+
+    path: tuple[str, ...]
+    values: tuple[Any, ...] = ()
+    exists: bool = True
+
+
+def apply_simulation_filter(
+    stmt: Select, filters: SimulationFilter | Mapping[str, Any]
+) -> Select:
+    """Narrow a ``Simulation`` select statement with exact-match filters.
+
+    Parameters
+    ----------
+    stmt : Select
+        A select statement that has ``Simulation`` in its FROM clause.
+    filters : SimulationFilter | Mapping[str, Any]
+        The filters to apply, or values per ``Simulation`` column. Fields that
+        are not set, None or an empty list are ignored; a list matches any of
+        its values.
+
+    Returns
+    -------
+    Select
+        The statement with one ``WHERE`` clause per set filter field.
+    """
+    if isinstance(filters, SimulationFilter):
+        filters = filters.model_dump(exclude_none=True)
+
+    for field, value in filters.items():
+        column = getattr(Simulation, field)
+        if isinstance(value, list):
+            if value:
+                stmt = stmt.where(column.in_(value))
+        elif value is not None:
+            stmt = stmt.where(column == value)
+
+    return stmt
+
+
+def apply_variable_filter(stmt: Select, variables: list[str]) -> Select:
+    """Keep only simulations that provide every one of ``variables``.
+
+    The IDs come from one grouped pass over ``simulation_variables``: rows for
+    the requested names are read from the ``(variable_name, simulation_id)``
+    index and a simulation qualifies when it has one row per distinct name.
+
+    Parameters
+    ----------
+    stmt : Select
+        A select statement that has ``Simulation`` in its FROM clause.
+    variables : list[str]
+        The required variable names, e.g. ``["TS", "PRECT", "FSNT"]``.
+
+    Returns
+    -------
+    Select
+        The statement restricted to the simulations providing all of them.
+    """
+    names = set(variables)
+    providers = (
+        select(SimulationVariable.simulation_id)
+        .where(SimulationVariable.variable_name.in_(names))
+        .group_by(SimulationVariable.simulation_id)
+        .having(func.count() == len(names))
+    )
+
+    return stmt.where(Simulation.id.in_(providers))
+
+
+def parse_extra_filter(param: str, value: str) -> ExtraFilter:
+    """Parse one ``extra.<path>=<value>`` or ``extra.<path>.exists`` parameter.
+
+    The value is read as JSON when possible. A bare scalar such as ``3`` or
+    ``true`` also matches its string form, because query strings cannot tell
+    ``3`` from ``"3"``. A quoted value matches only the string.
+
+    Parameters
+    ----------
+    param : str
+        The parameter name, starting with ``EXTRA_PREFIX``.
+    value : str
+        The parameter value. For ``.exists`` it is ``""``, ``"true"`` or
+        ``"false"``.
+
+    Returns
+    -------
+    ExtraFilter
+        The parsed filter.
+
+    Raises
+    ------
+    ValueError
+        If the path has an empty key or an ``.exists`` value is not a boolean.
+    """
+    name = param.removeprefix(EXTRA_PREFIX)
+    is_exists = name.endswith(EXISTS_SUFFIX)
+    if is_exists:
+        name = name.removesuffix(EXISTS_SUFFIX)
+
+    path = tuple(name.split("."))
+    if not all(path):
+        raise ValueError(f"'{param}' has an empty key.")
+
+    if is_exists:
+        if value.lower() not in ("", "true", "false"):
+            raise ValueError(f"'{param}' must be empty, 'true' or 'false'.")
+
+        return ExtraFilter(path=path, exists=value.lower() != "false")
+
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        return ExtraFilter(path=path, values=(value,))
+
+    if isinstance(parsed, (str, dict, list)):
+        return ExtraFilter(path=path, values=(parsed,))
+
+    return ExtraFilter(path=path, values=(parsed, value))
+
+
+def extra_filters(request: Request) -> list[ExtraFilter]:
+    """Collect the ``extra.*`` query parameters of a request as filters.
+
+    Raises
+    ------
+    HTTPException
+        400 if a parameter is malformed.
+    """
+    try:
+        return [
+            parse_extra_filter(param, value)
+            for param, value in request.query_params.multi_items()
+            if param.startswith(EXTRA_PREFIX)
+        ]
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid extra filter: {e}",
+        ) from e
+
+
+def apply_extra_filters(stmt: Select, filters: list[ExtraFilter]) -> Select:
+    """Narrow a ``Simulation`` select statement with ``extra`` predicates.
+
+    Equality compiles to ``extra @> '{"a": {"b": value}}'`` and presence to
+    ``extra @? '$."a"."b"'``; both are answered by the ``jsonb_path_ops`` GIN
+    index on ``extra``.
+
+    Parameters
+    ----------
+    stmt : Select
+        A select statement that has ``Simulation`` in its FROM clause.
+    filters : list[ExtraFilter]
+        The filters to apply, all of which must hold.
+
+    Returns
+    -------
+    Select
+        The statement with one ``WHERE`` clause per filter.
+    """
+    for extra_filter in filters:
+        if extra_filter.values:
+            stmt = stmt.where(
+                or_(
+                    *(
+                        Simulation.extra.contains(_nest(extra_filter.path, value))
+                        for value in extra_filter.values
+                    )
+                )
+            )
+        else:
+            jsonpath = "$" + "".join(f".{json.dumps(key)}" for key in extra_filter.path)
+            exists = Simulation.extra.path_exists(cast(jsonpath, JSONPATH))
+            stmt = stmt.where(exists if extra_filter.exists else ~exists)
+
+    return stmt
+
+
+def _nest(path: tuple[str, ...], value: Any) -> dict[str, Any]:
+    """Build ``{"a": {"b": value}}`` from ``("a", "b")``."""
+    for key in reversed(path):
+        value = {key: value}
+
+    return value
@@ -0,0 +1,102 @@
+"""Ancestry and descendant queries over ``Simulation.parent_simulation_id``.
+
+Branch and hybrid runs point at the run they started from, so E3SM run chains
+form a forest. Two equivalent query plans are provided:
+
+- the ``simulation_lineage`` closure table, kept current by a database
+  trigger, which answers either direction with one indexed range scan;
+- a recursive CTE walking ``parent_simulation_id`` one generation at a time,
+  which needs no maintained state.
+
+Both return ``(Simulation, depth)`` rows, where ``depth`` counts the parent
+links between the returned run and the starting one.
+"""
+
+from typing import Literal
+from uuid import UUID
+
+from sqlalchemy import Select, literal, select
+
+from app.db.lineage import SimulationLineage
+from app.db.simulation import Simulation
+
+Direction = Literal["ancestors", "descendants"]
+
+# Generations walked by the recursive CTE when no depth is given. The closure
+# table needs no bound, but the CTE must terminate even on a corrupt cycle.
+MAX_DEPTH = 1000
+
+
+def lineage_query(
+    sim_id: UUID, direction: Direction, max_depth: int | None, closure: bool = True
+) -> Select:
+    """Build a select of the ancestors or descendants of a simulation.
+
+    Parameters
+    ----------
+    sim_id : UUID
+        The simulation whose lineage is queried; it is not part of the result.
+    direction : {"ancestors", "descendants"}
+        Whether to walk up to the parents or down to the children.
+    max_depth : int | None
+        The most parent links between a returned run and ``sim_id``, or None
+        for no limit.
+    closure : bool, optional
+        Whether to read the closure table rather than recurse, by default True.
+
+    Returns
+    -------
+    Select
+        A select of ``(Simulation, depth)`` rows, unordered, to which the
+        catalog filters can be applied.
+    """
+    if closure:
+        return _closure_query(sim_id, direction, max_depth)
+
+    return _recursive_query(sim_id, direction, max_depth or MAX_DEPTH)
+
+
+def _closure_query(sim_id: UUID, direction: Direction, max_depth: int | None) -> Select:
+    if direction == "ancestors":
+        start, node = SimulationLineage.descendant_id, SimulationLineage.ancestor_id
+    else:
+        start, node = SimulationLineage.ancestor_id, SimulationLineage.descendant_id
+
+    stmt = (
+        select(Simulation, SimulationLineage.depth)
+        .join(SimulationLineage, node == Simulation.id)
+        .where(start == sim_id)
+    )
+    if max_depth is not None:
+        stmt = stmt.where(SimulationLineage.depth <= max_depth)
+
+    return stmt
+
+
+def _recursive_query(sim_id: UUID, direction: Direction, max_depth: int) -> Select:
+    if direction == "ancestors":
+        # Follow each run to its parent.
+        anchor = select(
+            Simulation.parent_simulation_id.label("id"), literal(1).label("depth")
+        ).where(Simulation.id == sim_id, Simulation.parent_simulation_id.is_not(None))
+        lineage = anchor.cte("lineage", recursive=True)
+        step = (
+            select(Simulation.parent_simulation_id, lineage.c.depth + 1)
+            .join(lineage, Simulation.id == lineage.c.id)
+            .where(Simulation.parent_simulation_id.is_not(None))
+        )
+    else:
+        # Follow each run to its children.
+        anchor = select(Simulation.id, literal(1).label("depth")).where(
+            Simulation.parent_simulation_id == sim_id
+        )
+        lineage = anchor.cte("lineage", recursive=True)
+        step = select(Simulation.id, lineage.c.depth + 1).join(
+            lineage, Simulation.parent_simulation_id == lineage.c.id
+        )
+
+    lineage = lineage.union_all(step.where(lineage.c.depth < max_depth))
+
+    return select(Simulation, lineage.c.depth).join(
+        lineage, lineage.c.id == Simulation.id
+    )
@@ -0,0 +1,156 @@
+"""Per-machine usage statistics, computed in one query and cached.
+
+The statistics of every machine (or of one) come from a single statement:
+``machines`` left-joined to ``simulations`` and grouped by machine, with the
+status breakdown aggregated in one joined subquery and the latest run picked
+with ``DISTINCT ON (machine_id)`` in another. Results are cached per
+machine ID, plus the full listing under ``None``, and evicted when this
+process commits a change to the machine or to one of its simulations. The
+TTL bounds how long writes from other processes go unseen.
+"""
+
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Select, String, event, func, inspect, select
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.machine import Machine
+from app.db.simulation import Simulation
+from app.schemas.machine import MachineStatsOut
+
+# Session.info key of the machine IDs whose statistics a transaction changed.
+_PENDING_KEY = "machine_stats_changes"
+
+# Statistics per machine ID, and of every machine under None.
+machine_stats_cache: TTLCache[UUID | None, list[MachineStatsOut]] = TTLCache(
+    maxsize=1024, ttl=settings.machine_stats_cache_ttl
+)
+
+
+def machine_stats(db: Session, machine_id: UUID | None = None) -> list[MachineStatsOut]:
+    """Return the statistics of every machine, or of one, by name.
+
+    Parameters
+    ----------
+    db : Session
+        The database session.
+    machine_id : UUID | None, optional
+        The machine to describe, by default all of them.
+
+    Returns
+    -------
+    list[MachineStatsOut]
+        One entry per machine, empty if ``machine_id`` does not exist.
+    """
+    stats = machine_stats_cache.get(machine_id)
+    if stats is None:
+        stmt = _stats_query()
+        if machine_id is not None:
+            stmt = stmt.where(Machine.id == machine_id)
+
+        stats = [
+            MachineStatsOut.model_validate(row._mapping) for row in db.execute(stmt)
+        ]
+        machine_stats_cache.set(machine_id, stats)
+
+    return stats
+
+
+def _stats_query() -> Select:
+    status_counts = (
+        select(Simulation.machine_id, Simulation.status, func.count().label("runs"))
+        .group_by(Simulation.machine_id, Simulation.status)
+        .subquery()
+    )
+    statuses = (
+        select(
+            status_counts.c.machine_id,
+            func.jsonb_object_agg(status_counts.c.status, status_counts.c.runs).label(
+                "status_counts"
+            ),
+        )
+        .group_by(status_counts.c.machine_id)
+        .subquery()
+    )
+
+    # A run's date is when it started, or when it was cataloged if unknown.
+    run_date = func.coalesce(Simulation.run_start_date, Simulation.created_at)
+    latest_runs = (
+        select(
+            Simulation.machine_id,
+            Simulation.id,
+            Simulation.name,
+            run_date.label("run_date"),
+        )
+        .distinct(Simulation.machine_id)
+        .order_by(Simulation.machine_id, run_date.desc().nulls_last())
+        .subquery()
+    )
+
+    return (
+        select(
+            Machine.id.label("machine_id"),
+            Machine.name,
+            func.count(Simulation.id).label("simulations"),
+            func.coalesce(statuses.c.status_counts, func.jsonb_build_object()).label(
+                "status_counts"
+            ),
+            func.coalesce(func.sum(Simulation.total_years), 0.0).label("total_years"),
+            latest_runs.c.id.label("latest_simulation_id"),
+            latest_runs.c.name.label("latest_simulation_name"),
+            latest_runs.c.run_date.label("latest_run_date"),
+            func.coalesce(
+                func.array_agg(func.distinct(Simulation.compiler)).filter(
+                    Simulation.compiler.is_not(None)
+                ),
+                array([], type_=String),
+            ).label("compilers"),
+        )
+        .select_from(Machine)
+        .outerjoin(Simulation, Simulation.machine_id == Machine.id)
+        .outerjoin(statuses, statuses.c.machine_id == Machine.id)
+        .outerjoin(latest_runs, latest_runs.c.machine_id == Machine.id)
+        .group_by(
+            Machine.id,
+            statuses.c.status_counts,
+            latest_runs.c.id,
+            latest_runs.c.name,
+            latest_runs.c.run_date,
+        )
+        .order_by(Machine.name)
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_machine_changes(session: Session, flush_context: Any) -> None:
+    changed: set[UUID] = session.info.setdefault(_PENDING_KEY, set())
+
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Machine):
+            changed.add(obj.id)
+        elif isinstance(obj, Simulation):
+            # A simulation moved to another machine changes both.
+            history = inspect(obj).attrs.machine_id.history
+            changed.update(
+                machine_id
+                for machine_id in (obj.machine_id, *history.deleted)
+                if machine_id is not None
+            )
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_machine_stats(session: Session) -> None:
+    changed = session.info.pop(_PENDING_KEY, None)
+    if changed:
+        machine_stats_cache.pop(None)
+        for machine_id in changed:
+            machine_stats_cache.pop(machine_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_machine_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
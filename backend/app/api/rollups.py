@@ -0,0 +1,147 @@
+"""Refreshing of the ``simulation_rollups`` materialized view after writes.
+
+Reads of campaign and group rollups only ever hit the view. To keep it
+current, commits that change simulations, artifacts or machines request a
+refresh from the process-wide ``rollup_refresher``, which:
+
+- delays the refresh by ``settings.rollup_refresh_delay`` seconds, so a burst
+  of writes (an ingest, a bulk edit) is coalesced into one refresh;
+- never starts two refreshes at once, and schedules another one when a write
+  commits while a refresh is running, since that refresh may have missed it;
+- runs ``REFRESH MATERIALIZED VIEW CONCURRENTLY``, which diffs the view
+  against a fresh aggregate and leaves it readable throughout.
+
+The refresher is started by the app's lifespan. Batch jobs that do not run
+the app refresh the view with ``python -m app.api.rollups``.
+"""
+
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import Connection, event, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app._logger import _setup_custom_logger
+from app.core.config import settings
+from app.db.artifact import Artifact
+from app.db.machine import Machine
+from app.db.simulation import Simulation
+
+logger = _setup_custom_logger(__name__)
+
+# Session.info key marking a transaction that changed rolled-up rows.
+_PENDING_KEY = "rollups_stale"
+_ROLLED_UP = (Simulation, Artifact, Machine)
+
+
+def refresh_rollups(connection: Connection, concurrently: bool = True) -> None:
+    """Refresh ``simulation_rollups`` on a connection; the caller commits."""
+    mode = "CONCURRENTLY " if concurrently else ""
+    connection.execute(text(f"REFRESH MATERIALIZED VIEW {mode}simulation_rollups"))
+
+
+class RollupRefresher:
+    """Coalesces refresh requests into delayed, serialized refreshes.
+
+    Parameters
+    ----------
+    refresh : Callable[[], None]
+        Refreshes the view.
+    delay : float
+        Seconds between the first request and the refresh it triggers.
+    """
+
+    def __init__(self, refresh: Callable[[], None], delay: float):
+        self.delay = delay
+
+        self._refresh = refresh
+        self._lock = threading.Lock()
+        self._running = threading.Lock()
+        self._timer: threading.Timer | None = None
+        self._started = False
+
+    def start(self) -> None:
+        """Accept requests."""
+        with self._lock:
+            self._started = True
+
+    def stop(self) -> None:
+        """Ignore requests and cancel the scheduled refresh, if any."""
+        with self._lock:
+            self._started = False
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def request(self) -> None:
+        """Schedule a refresh, unless one is already scheduled."""
+        with self._lock:
+            if not self._started or self._timer is not None:
+                return
+
+            self._timer = threading.Timer(self.delay, self._run)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _run(self) -> None:
+        with self._running:
+            # Requests from here on schedule the next refresh.
+            with self._lock:
+                self._timer = None
+
+            self._refresh()
+
+
+def _refresh_now() -> None:
+    """Refresh the view in its own transaction, logging instead of failing."""
+    from app.db.session import engine
+
+    started = time.perf_counter()
+    try:
+        with engine.begin() as connection:
+            refresh_rollups(connection)
+    except SQLAlchemyError as e:
+        logger.warning(f"Could not refresh simulation_rollups: {e}")
+        return
+
+    logger.info(
+        f"Refreshed simulation_rollups in "
+        f"{(time.perf_counter() - started) * 1000:.1f} ms."
+    )
+
+
+rollup_refresher = RollupRefresher(_refresh_now, settings.rollup_refresh_delay)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_rollup_changes(session: Session, flush_context: Any) -> None:
+    if any(
+        isinstance(obj, _ROLLED_UP)
+        for obj in (*session.new, *session.dirty, *session.deleted)
+    ):
+        session.info[_PENDING_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _request_rollup_refresh(session: Session) -> None:
+    if session.info.pop(_PENDING_KEY, False):
+        rollup_refresher.request()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rollup_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def main() -> None:
+    from app.db.session import engine
+
+    with engine.begin() as connection:
+        refresh_rollups(connection)
+
+
+if __name__ == "__main__":
+    main()
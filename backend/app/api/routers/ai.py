@@ -1,84 +1,809 @@
-from typing import List
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Generator, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, List, NamedTuple
+from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
-from pydantic import ValidationError
-from transformers import pipeline
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Row, func, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from transformers import StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer
+from transformers.tokenization_utils_base import VERY_LARGE_INTEGER
 
-from app.schemas.simulation import SimulationOut
+from app._logger import _setup_custom_logger
+from app.ai.aggregate import aggregate_lines, aggregate_simulations
+from app.ai.extractive import extractive_summary
+from app.ai.prompts import compare_prompt, reduce_prompt
+from app.ai.queue import InferenceQueue, InferenceQueueFull
+from app.ai.summarizer import build_summarizer
+from app.api.deps import get_db, transaction
+from app.api.filters import apply_simulation_filter
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.ai_job import AIJob
+from app.db.machine import Machine
+from app.db.session import SessionLocal
+from app.db.simulation import Simulation
+from app.schemas.ai import AIJobOut, AnalysisMode, AnalyzeSimulationsRequest
+
+logger = _setup_custom_logger(__name__)
 
 router = APIRouter(prefix="/ai", tags=["AI"])
 
-summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
+summarizer = build_summarizer(
+    settings.summarizer_backend,
+    settings.summarizer_model,
+    mmap=settings.summarizer_mmap,
+)
 
+# Abstractive analyses that cannot be admitted fall back to extractive ones.
+inference_queue = InferenceQueue(
+    workers=settings.ai_inference_workers, depth=settings.ai_inference_queue_depth
+)
 
-@router.post("/analyze-simulations")
-def analyze_simulations(payload: List[SimulationOut]):
+# Runs background analysis jobs; their model calls share the queue's slots.
+_job_executor = ThreadPoolExecutor(
+    max_workers=settings.ai_job_workers, thread_name_prefix="ai-job"
+)
+
+_INFLIGHT_STATUSES = ("queued", "running")
+
+
+class _JobSuperseded(Exception):
+    """Raised when a running job was failed elsewhere, e.g. as abandoned."""
+
+
+class _JobHeartbeat:
     """
-    Analyze a list of simulations and return a summary of their metadata.
+    Keep ``updated_at`` fresh on the in-flight jobs owned by this process.
+
+    A job is considered abandoned once ``updated_at`` is older than
+    ``settings.ai_job_timeout``. Jobs waiting on ``_job_executor``, for an
+    inference slot, or on a long model call commit nothing for a while, so
+    every ``settings.ai_job_heartbeat`` seconds a daemon thread touches all of
+    them in one statement. Only jobs whose process died go stale.
     """
-    try:
-        sim_descriptions = [_describe_sim(sim) for sim in payload]
-
-        if len(sim_descriptions) <= 5:
-            input_text = (
-                "Compare the following E3SM simulation metadata. "
-                "Summarize key similarities and differences in tag, campaign, compset, resolution, machine, and notes.\n\n"
-                + "\n".join(sim_descriptions)
-                + "\n\nSummary:"
-            )
-            result = summarizer(
-                input_text, max_length=300, min_length=100, do_sample=False
-            )
 
-            return {"summary": result[0]["summary_text"]}
-        else:
-            final_summary = _summarize_chunks(sim_descriptions)
+    def __init__(self):
+        self._jobs: set[UUID] = set()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
 
-            return {"summary": final_summary}
-    except ValidationError as ve:
-        raise HTTPException(
-            status_code=422, detail=f"Validation error: {ve.errors()}"
-        ) from ve
+    def add(self, job_id: UUID) -> None:
+        """Start keeping a job alive, starting the thread on first use."""
+        with self._lock:
+            self._jobs.add(job_id)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="ai-job-heartbeat", daemon=True
+                )
+                self._thread.start()
+
+    def discard(self, job_id: UUID) -> None:
+        """Stop keeping a job alive; unknown IDs are ignored."""
+        with self._lock:
+            self._jobs.discard(job_id)
+
+    def beat(self) -> None:
+        """Touch ``updated_at`` of every owned job that is still in flight."""
+        with self._lock:
+            job_ids = list(self._jobs)
+        if not job_ids:
+            return
+
+        try:
+            with SessionLocal() as db:
+                db.execute(
+                    update(AIJob)
+                    .where(AIJob.id.in_(job_ids), AIJob.status.in_(_INFLIGHT_STATUSES))
+                    .values(updated_at=func.now())
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not refresh in-flight AI jobs: {e}")
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(settings.ai_job_heartbeat)
+            self.beat()
+
+
+_job_heartbeat = _JobHeartbeat()
+
+# Summaries are keyed on the mode and the ``(id, updated_at)`` pairs of the
+# simulations they cover, so editing any of those simulations makes the cached
+# entry unreachable.
+_summary_cache: TTLCache[tuple, str] = TTLCache(maxsize=settings.ai_summary_cache_size)
+
+# The only columns `_describe_selection` needs, plus the cache key columns.
+_DIGEST_COLUMNS = (
+    Simulation.id,
+    Simulation.updated_at,
+    Simulation.name,
+    Simulation.version_tag,
+    Simulation.campaign_id,
+    Simulation.compset,
+    Simulation.grid_resolution,
+    Simulation.notes_markdown,
+    Machine.name.label("machine_name"),
+)
+
+
+@router.post("/analyze-simulations")
+def analyze_simulations(
+    payload: AnalyzeSimulationsRequest, db: Session = Depends(get_db)
+):
+    """
+    Analyze a selection of simulations and return a summary of their metadata.
+
+    The simulations are selected by ID or by catalog filter and loaded
+    server-side, so clients only send the selection rather than full records.
+
+    ``mode`` chooses between an "abstractive" summary generated by the model
+    and a fast "extractive" one. Abstractive requests fall back to extractive
+    when the inference queue is full; the response's ``mode`` reports which
+    one was used.
+    """
+    sims = _load_sim_digests(db, payload)
+
+    try:
+        summary, mode = _analyze(sims, payload.mode)
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Summarization failed: {str(e)}"
         ) from e
 
+    return {"summary": summary, "mode": mode}
+
 
-def _describe_sim(sim: SimulationOut) -> str:
+@router.post("/analyze-simulations/stream")
+def stream_analyze_simulations(
+    payload: AnalyzeSimulationsRequest, db: Session = Depends(get_db)
+):
     """
-    Generate a string description of a simulation using its metadata.
+    Analyze a selection of simulations, streaming progress as Server-Sent Events.
+
+    The stream emits the following events, each with a JSON ``data`` field:
+
+    - ``progress``: ``{"level", "chunk", "total", "summary"}`` after each
+      intermediate summary; ``level`` counts reduction rounds from 1.
+    - ``token``: ``{"text"}`` for each piece of the final summary as generated.
+    - ``summary``: ``{"summary", "mode"}`` with the complete final summary and
+      the mode that produced it.
+    - ``error``: ``{"detail"}`` if summarization fails mid-stream.
+
+    Extractive analyses, and abstractive ones that fall back to extractive
+    because the inference queue is full, emit only the ``summary`` event.
+
+    Selection errors (unknown IDs, oversized selections) are raised before the
+    stream starts, so they are returned as regular HTTP errors. If the client
+    disconnects, in-flight generation is stopped and remaining chunks are
+    skipped.
     """
-    return (
-        f"Name: {sim.name}, Case Name: {sim.case_name}: "
-        f"Tag: {sim.version_tag}, Campaign: {sim.campaign_id}, Compset: {sim.compset}, "
-        f"Resolution: {sim.grid_resolution}, Machine: {sim.machine_id}, Notes: {sim.notes_markdown or 'n/a'}"
+    sims = _load_sim_digests(db, payload)
+
+    return StreamingResponse(
+        _stream_analysis(sims, payload.mode),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
-def _summarize_chunks(simulations: List[str], chunk_size: int = 4) -> str:
+@router.post("/jobs", response_model=AIJobOut, status_code=status.HTTP_202_ACCEPTED)
+def create_analysis_job(
+    payload: AnalyzeSimulationsRequest, db: Session = Depends(get_db)
+):
+    """
+    Queue an analysis as a background job and return it immediately.
+
+    The selection is validated up front, so unknown IDs and oversized
+    selections fail with the same errors as ``/ai/analyze-simulations``. If an
+    identical request is already queued or running, that job is returned
+    instead of starting another one. Poll ``GET /ai/jobs/{job_id}`` for
+    progress and the result.
+    """
+    _load_sim_digests(db, payload)
+
+    request = _canonical_request(payload)
+    request_hash = hashlib.sha256(
+        json.dumps(request, sort_keys=True).encode()
+    ).hexdigest()
+
+    with transaction(db):
+        # Serialize submissions of the same request across worker processes,
+        # so two identical requests cannot both miss the in-flight lookup.
+        db.execute(select(func.pg_advisory_xact_lock(func.hashtext(request_hash))))
+
+        job = _find_inflight_job(db, request_hash)
+        created = job is None
+
+        if created:
+            job = AIJob(request_hash=request_hash, request=request, status="queued")
+            db.add(job)
+            db.flush()
+
+    job_out = AIJobOut.model_validate(job)
+
+    if created:
+        _job_heartbeat.add(job.id)
+        _job_executor.submit(_run_job, job.id)
+
+    return job_out
+
+
+@router.get("/jobs/{job_id}", response_model=AIJobOut)
+def get_analysis_job(job_id: UUID, db: Session = Depends(get_db)):
+    """
+    Retrieve an analysis job's status, progress and, once finished, result.
+
+    Raises
+    ------
+    HTTPException
+        If the job with the given ID is not found, raises a 404 HTTP exception.
     """
-    Summarize a list of simulation descriptions in chunks.
+    job = db.get(AIJob, job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="AI job not found")
+
+    return job
+
+
+def _load_sim_digests(
+    db: Session, payload: AnalyzeSimulationsRequest
+) -> List[Row[Any]]:
     """
-    chunks = [
-        simulations[i : i + chunk_size] for i in range(0, len(simulations), chunk_size)
-    ]
-    intermediate = []
+    Load the columns needed to describe the selected simulations in one query.
 
-    for chunk in chunks:
-        input_text = (
-            "Compare the following E3SM simulation metadata. "
-            "Summarize key similarities and differences in tag, campaign, compset, resolution, machine, and notes.\n\n"
-            + "\n".join(chunk)
-            + "\n\nSummary:"
+    Raises
+    ------
+    HTTPException
+        404 if a requested ID does not exist or the filters match nothing, and
+        400 if the selection exceeds ``settings.ai_max_simulations``.
+    """
+    stmt = select(*_DIGEST_COLUMNS).join(Machine, Simulation.machine_id == Machine.id)
+
+    if payload.simulation_ids is not None:
+        stmt = stmt.where(Simulation.id.in_(payload.simulation_ids))
+    elif payload.filters is not None:
+        stmt = apply_simulation_filter(stmt, payload.filters)
+
+    # Fetch one extra row so an oversized selection can be detected cheaply.
+    stmt = stmt.order_by(Simulation.name).limit(settings.ai_max_simulations + 1)
+    sims = list(db.execute(stmt).all())
+
+    if payload.simulation_ids is not None:
+        missing = set(payload.simulation_ids) - {sim.id for sim in sims}
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Simulations not found: {sorted(str(i) for i in missing)}",
+            )
+    elif not sims:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No simulations match the given filters.",
+        )
+
+    if len(sims) > settings.ai_max_simulations:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                "Selection is too large to analyze; narrow it to at most "
+                f"{settings.ai_max_simulations} simulations."
+            ),
+        )
+
+    return sims
+
+
+def _cache_key(sims: List[Row[Any]], mode: AnalysisMode) -> tuple:
+    """
+    Build the summary cache key for a selection and analysis mode.
+    """
+    return (mode, *((sim.id, sim.updated_at) for sim in sims))
+
+
+def _analyze(sims: List[Row[Any]], mode: AnalysisMode) -> tuple[str, AnalysisMode]:
+    """
+    Summarize a selection, falling back to extractive if the queue is full.
+
+    Returns
+    -------
+    tuple[str, AnalysisMode]
+        The summary and the mode that produced it.
+    """
+    cache_key = _cache_key(sims, mode)
+    cached = _summary_cache.get(cache_key)
+    if cached is not None:
+        return cached, mode
+
+    if mode == "extractive":
+        summary = _extract(sims)
+    else:
+        try:
+            with inference_queue.admit():
+                final_input = _final_prompt(_describe_selection(sims))
+                summary = _summarize(final_input, max_length=300, min_length=100)
+        except InferenceQueueFull:
+            logger.warning("Inference queue is full; using an extractive summary.")
+
+            return _analyze(sims, "extractive")
+
+    _summary_cache.set(cache_key, summary)
+
+    return summary, mode
+
+
+def _extract(sims: List[Row[Any]]) -> str:
+    """
+    Summarize a selection by extracting its most central sentences.
+    """
+    return extractive_summary(aggregate_simulations(sims))
+
+
+def _describe_selection(sims: List[Row[Any]]) -> List[str]:
+    """
+    Describe the selection as a compact difference table plus distinct notes.
+
+    Shared fields, value counts and identical configurations are computed
+    deterministically, so the model input grows with the number of distinct
+    configurations and notes rather than with the number of simulations.
+    """
+    lines = aggregate_lines(aggregate_simulations(sims))
+    logger.info(f"Described {len(sims)} simulations in {len(lines)} prompt lines.")
+
+    return lines
+
+
+def _summarize(input_text: str, max_length: int, min_length: int, **kwargs) -> str:
+    """
+    Run the summarizer on a single prompt and return the generated text.
+
+    Each call holds one of the inference queue's worker slots.
+    """
+    with inference_queue.slot():
+        result = summarizer(
+            input_text,
+            max_length=max_length,
+            min_length=min_length,
+            do_sample=False,
+            **kwargs,
         )
-        res = summarizer(input_text, max_length=250, min_length=80, do_sample=False)
-        intermediate.append(res[0]["summary_text"])
 
-    final_input = (
-        "Given these summaries of E3SM simulation metadata groups, synthesize overall trends, differences, and recurring patterns in tag, campaign, compset, resolution, machine, and notes.\n\n"
-        + "\n".join(intermediate)
-        + "\n\nOverall Summary:"
-    )
-    result = summarizer(final_input, max_length=300, min_length=100, do_sample=False)
     return result[0]["summary_text"]
+
+
+def _max_input_tokens() -> int:
+    """
+    Return the model's maximum input length in tokens (1024 for BART).
+    """
+    limit = summarizer.tokenizer.model_max_length
+
+    if limit >= VERY_LARGE_INTEGER:
+        # The tokenizer does not declare a limit; fall back to the model's.
+        limit = summarizer.model.config.max_position_embeddings
+
+    return limit
+
+
+def _pack(texts: List[str], prompt: Callable[[List[str]], str]) -> List[List[str]]:
+    """
+    Greedily pack texts into the fewest prompts that fit the model's input.
+
+    Texts are measured with the summarizer's own tokenizer in one batched
+    call. A text that cannot fit in a prompt on its own is split into token
+    windows rather than truncated, so no content is lost.
+
+    Parameters
+    ----------
+    texts : List[str]
+        The texts to pack, in order.
+    prompt : Callable[[List[str]], str]
+        The prompt builder the groups will be passed to; its fixed overhead
+        is subtracted from the token budget.
+
+    Returns
+    -------
+    List[List[str]]
+        Groups of texts, each of which fits in a single ``prompt(group)``.
+    """
+    tokenizer = summarizer.tokenizer
+    budget = _max_input_tokens() - len(tokenizer(prompt([]))["input_ids"])
+    token_ids = tokenizer(texts, add_special_tokens=False)["input_ids"]
+
+    groups: List[List[str]] = []
+    current: List[str] = []
+    used = 0
+
+    for text, ids in zip(texts, token_ids, strict=True):
+        for piece, n_tokens in _split_oversized(text, ids, budget):
+            # Each text is followed by a newline separator in the prompt.
+            if current and used + n_tokens + 1 > budget:
+                groups.append(current)
+                current, used = [], 0
+
+            current.append(piece)
+            used += n_tokens + 1
+
+    if current:
+        groups.append(current)
+
+    return groups
+
+
+def _split_oversized(
+    text: str, ids: List[int], budget: int
+) -> Iterator[tuple[str, int]]:
+    """
+    Yield ``text`` with its token count, split into windows if over budget.
+    """
+    if len(ids) + 1 <= budget:
+        yield text, len(ids)
+
+        return
+
+    window = budget - 1
+    for start in range(0, len(ids), window):
+        piece = ids[start : start + window]
+
+        yield summarizer.tokenizer.decode(piece, skip_special_tokens=True), len(piece)
+
+
+class _ReductionStep(NamedTuple):
+    """
+    An intermediate summary produced while reducing descriptions.
+    """
+
+    level: int
+    chunk: int
+    total: int
+    summary: str
+
+
+def _iter_reduction(
+    descriptions: List[str], **kwargs
+) -> Generator[_ReductionStep, None, str]:
+    """
+    Summarize descriptions level by level until one prompt remains.
+
+    Descriptions are packed into as few prompts as fit the model's input. If
+    that takes more than one prompt, each is summarized and the summaries are
+    packed again, repeating until they fit a single reduce prompt. Each model
+    call is yielded as a step so callers can report progress.
+
+    Returns
+    -------
+    str
+        The final prompt, which the caller summarizes (or streams) itself.
+    """
+    texts, prompt, level = descriptions, compare_prompt, 1
+    groups = _pack(texts, prompt)
+
+    # Keep intermediate summaries short enough that at least three fit in one
+    # reduce prompt, so every level shrinks the input.
+    reduce_overhead = len(summarizer.tokenizer(reduce_prompt([]))["input_ids"])
+    max_length = min(250, (_max_input_tokens() - reduce_overhead) // 3 - 1)
+    min_length = min(80, max_length // 2)
+
+    while len(groups) > 1:
+        texts = []
+
+        for i, group in enumerate(groups, start=1):
+            summary = _summarize(prompt(group), max_length, min_length, **kwargs)
+            texts.append(summary)
+
+            yield _ReductionStep(level, i, len(groups), summary)
+
+        prompt, level = reduce_prompt, level + 1
+        groups = _pack(texts, prompt)
+
+        if len(groups) >= len(texts) > 1:
+            raise RuntimeError(
+                "Intermediate summaries are too long to reduce within the "
+                "model's input length."
+            )
+
+    return prompt(groups[0])
+
+
+def _next_step(steps: Generator[_ReductionStep, None, str]) -> _ReductionStep | str:
+    """
+    Advance a reduction, returning the next step or the final prompt.
+    """
+    try:
+        return next(steps)
+    except StopIteration as stop:
+        return stop.value
+
+
+def _final_prompt(descriptions: List[str]) -> str:
+    """
+    Run every intermediate reduction step and return the final prompt.
+    """
+    steps = _iter_reduction(descriptions)
+
+    while isinstance(item := _next_step(steps), _ReductionStep):
+        pass
+
+    return item
+
+
+class _CancelCriteria(StoppingCriteria):
+    """
+    Stops generation as soon as the given event is set.
+    """
+
+    def __init__(self, cancel: threading.Event):
+        self.cancel = cancel
+
+    def __call__(self, input_ids, scores, **kwargs):
+        return input_ids.new_full(
+            (input_ids.shape[0],), self.cancel.is_set(), dtype=bool
+        )
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """
+    Format a single Server-Sent Event with a JSON payload.
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _stream_analysis(
+    sims: List[Row[Any]], mode: AnalysisMode
+) -> AsyncIterator[str]:
+    """
+    Summarize simulations, yielding Server-Sent Events as work progresses.
+
+    Abstractive analyses hold a place in the inference queue for the whole
+    stream, and fall back to extractive if none is available.
+    """
+    cached = _summary_cache.get(_cache_key(sims, mode))
+    if cached is not None:
+        yield _sse_event("summary", {"summary": cached, "mode": mode})
+
+        return
+
+    if mode == "abstractive":
+        try:
+            with inference_queue.admit():
+                async for event in _stream_abstractive(sims):
+                    yield event
+
+            return
+        except InferenceQueueFull:
+            logger.warning("Inference queue is full; using an extractive summary.")
+
+    try:
+        summary, mode = await run_in_threadpool(_analyze, sims, "extractive")
+    except Exception as e:
+        yield _sse_event("error", {"detail": f"Summarization failed: {str(e)}"})
+
+        return
+
+    yield _sse_event("summary", {"summary": summary, "mode": mode})
+
+
+async def _stream_abstractive(sims: List[Row[Any]]) -> AsyncIterator[str]:
+    """
+    Generate an abstractive summary, yielding progress and token events.
+
+    Model calls run in the threadpool. When the client disconnects, Starlette
+    cancels this generator at its current ``await``; the ``finally`` block then
+    sets the cancel event, which stops any generation still running in a
+    worker thread at its next token.
+    """
+    cancel = threading.Event()
+    stopping_criteria = StoppingCriteriaList([_CancelCriteria(cancel)])
+
+    try:
+        steps = _iter_reduction(
+            _describe_selection(sims),
+            stopping_criteria=stopping_criteria,
+        )
+
+        while isinstance(
+            item := await run_in_threadpool(_next_step, steps), _ReductionStep
+        ):
+            yield _sse_event("progress", item._asdict())
+
+        final_input = item
+
+        streamer = TextIteratorStreamer(
+            summarizer.tokenizer, skip_prompt=True, skip_special_tokens=True
+        )
+        generation = asyncio.ensure_future(
+            run_in_threadpool(
+                _summarize_with_streamer, final_input, streamer, stopping_criteria
+            )
+        )
+
+        while (text := await run_in_threadpool(next, streamer, None)) is not None:
+            if text:
+                yield _sse_event("token", {"text": text})
+
+        final_summary = await generation
+    except Exception as e:
+        yield _sse_event("error", {"detail": f"Summarization failed: {str(e)}"})
+
+        return
+    finally:
+        cancel.set()
+
+    _summary_cache.set(_cache_key(sims, "abstractive"), final_summary)
+
+    yield _sse_event("summary", {"summary": final_summary, "mode": "abstractive"})
+
+
+def _summarize_with_streamer(
+    input_text: str,
+    streamer: TextIteratorStreamer,
+    stopping_criteria: StoppingCriteriaList,
+) -> str:
+    """
+    Generate the final summary, pushing decoded text into ``streamer``.
+
+    The streamer is always ended, even if generation fails, so the consumer
+    iterating over it never blocks forever.
+    """
+    try:
+        return _summarize(
+            input_text,
+            max_length=300,
+            min_length=100,
+            streamer=streamer,
+            stopping_criteria=stopping_criteria,
+        )
+    finally:
+        streamer.end()
+
+
+def _canonical_request(payload: AnalyzeSimulationsRequest) -> dict:
+    """
+    Dump a request in a canonical form, so identical selections hash alike.
+    """
+    request = payload.model_dump(mode="json", by_alias=True, exclude_none=True)
+
+    if "simulationIds" in request:
+        request["simulationIds"] = sorted(set(request["simulationIds"]))
+
+    return request
+
+
+def _find_inflight_job(db: Session, request_hash: str) -> AIJob | None:
+    """
+    Return the in-flight job for a request, failing any abandoned ones.
+
+    Live worker processes refresh ``updated_at`` of their jobs (see
+    ``_JobHeartbeat``), so a job untouched for ``settings.ai_job_timeout``
+    seconds is assumed to belong to a worker process that died. It is marked
+    as failed rather than blocking new submissions forever.
+    """
+    inflight = (AIJob.request_hash == request_hash) & AIJob.status.in_(
+        _INFLIGHT_STATUSES
+    )
+    stale = AIJob.updated_at < func.now() - timedelta(seconds=settings.ai_job_timeout)
+
+    db.execute(
+        update(AIJob)
+        .where(inflight & stale)
+        .values(
+            status="failed",
+            error="Job was abandoned before it finished.",
+            finished_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    return db.scalars(
+        select(AIJob).where(inflight).order_by(AIJob.created_at.desc()).limit(1)
+    ).first()
+
+
+def _run_job(job_id: UUID) -> None:
+    """
+    Execute a queued job in its own session, recording progress and outcome.
+
+    Runs on ``_job_executor``. The job is claimed by moving it from queued to
+    running in one conditional ``UPDATE``, and every later write requires it
+    to still be running, so a job failed in the meantime (e.g. as abandoned)
+    is neither run nor brought back to life.
+    """
+    try:
+        with SessionLocal() as db:
+            claimed = {"status": "running", "started_at": func.now()}
+            if not _update_job(db, job_id, claimed, current="queued"):
+                return
+
+            outcome: dict[str, Any]
+            try:
+                request = db.scalar(select(AIJob.request).where(AIJob.id == job_id))
+                payload = AnalyzeSimulationsRequest.model_validate(request)
+                sims = _load_sim_digests(db, payload)
+                outcome = {
+                    "summary": _summarize_job(db, job_id, sims, payload.mode),
+                    "mode": payload.mode,
+                    "status": "succeeded",
+                }
+            except _JobSuperseded:
+                logger.warning(f"AI job {job_id} was failed while running.")
+
+                return
+            except HTTPException as e:
+                outcome = {"status": "failed", "error": str(e.detail)}
+            except Exception as e:
+                logger.exception(f"AI job {job_id} failed.")
+                db.rollback()
+                outcome = {
+                    "status": "failed",
+                    "error": f"Summarization failed: {str(e)}",
+                }
+
+            _update_job(db, job_id, {**outcome, "finished_at": func.now()})
+    finally:
+        _job_heartbeat.discard(job_id)
+
+
+def _update_job(
+    db: Session, job_id: UUID, values: dict[str, Any], current: str = "running"
+) -> bool:
+    """
+    Write ``values`` to a job only if its status is ``current``, and commit.
+
+    Returns whether the job was updated.
+    """
+    result = db.execute(
+        update(AIJob)
+        .where(AIJob.id == job_id, AIJob.status == current)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    return result.rowcount > 0
+
+
+def _summarize_job(
+    db: Session, job_id: UUID, sims: List[Row[Any]], mode: AnalysisMode
+) -> str:
+    """
+    Summarize a job's selection, committing each reduction step as progress.
+
+    Unlike interactive requests, jobs never fall back to extractive mode:
+    they wait for a model worker slot instead.
+
+    Raises
+    ------
+    _JobSuperseded
+        If the job stopped running before a progress update.
+    """
+    cache_key = _cache_key(sims, mode)
+    cached = _summary_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    if mode == "extractive":
+        summary = _extract(sims)
+    else:
+        steps = _iter_reduction(_describe_selection(sims))
+
+        while isinstance(item := _next_step(steps), _ReductionStep):
+            progress = {"level": item.level, "chunk": item.chunk, "total": item.total}
+            if not _update_job(db, job_id, {"progress": progress}):
+                raise _JobSuperseded(job_id)
+
+        summary = _summarize(item, max_length=300, min_length=100)
+
+    _summary_cache.set(cache_key, summary)
+
+    return summary
@@ -0,0 +1,346 @@
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.api.filters import (
+    ExtraFilter,
+    apply_extra_filters,
+    apply_simulation_filter,
+    extra_filters,
+)
+from app.api.throughput import (
+    GroupBy,
+    rank_runs,
+    select_runs,
+    throughput_distribution,
+)
+from app.api.timing import CostGroupBy, component_costs
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.rollup import simulation_rollups
+from app.db.simulation import Simulation
+from app.schemas import (
+    ComponentCostGroupOut,
+    ComponentCostOut,
+    RollupOut,
+    SimulationFilter,
+    ThroughputGroupOut,
+    ThroughputOut,
+    ThroughputRunOut,
+)
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+# Distributions per grouping and query string. Aggregating the whole catalog is
+# the costly part, and a few minutes of staleness does not matter for planning.
+_throughput_cache: TTLCache[
+    tuple[tuple[str, ...], tuple[tuple[str, str], ...]], ThroughputOut
+] = TTLCache(maxsize=256, ttl=settings.throughput_cache_ttl)
+
+
+@router.get("/throughput", response_model=ThroughputOut)
+def throughput(
+    request: Request,
+    db: Session = Depends(get_db),
+    group_by: Annotated[list[GroupBy] | None, Query(alias="groupBy")] = None,
+    bins: Annotated[int, Query(ge=1, le=100)] = 10,
+    filters: Annotated[SimulationFilter | None, Depends(SimulationFilter)] = None,
+    extra: Annotated[list[ExtraFilter] | None, Depends(extra_filters)] = None,
+):
+    """Summarize simulated years per day (SYPD) per group of runs.
+
+    Each group gets its run count, mean, standard deviation, range,
+    percentiles and a histogram over bin edges shared by all groups, e.g.
+    ``?groupBy=machine&groupBy=versionTag`` to compare model versions on each
+    machine. Runs without a throughput are left out (see
+    ``app/api/throughput.py``). Results are cached for
+    ``settings.throughput_cache_ttl`` seconds.
+
+    Parameters
+    ----------
+    request : Request
+        The request, whose query string keys the cache along with the groups.
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+    group_by : list[GroupBy] | None, optional
+        The columns to group by, by default the machine.
+    bins : int, optional
+        The number of histogram bins, by default 10.
+    filters : SimulationFilter | None, optional
+        Exact-match filters over the catalog columns.
+    extra : list[ExtraFilter] | None, optional
+        Filters over ``extra``, parsed from the ``extra.*`` query parameters.
+
+    Returns
+    -------
+    ThroughputOut
+        The shared bin edges and the groups by descending run count.
+    """
+    # The group order shapes the result; the order of the other parameters does not.
+    group_by = list(dict.fromkeys(group_by or ["machine"]))
+    params = [(k, v) for k, v in request.query_params.multi_items() if k != "groupBy"]
+    key = (tuple(group_by), tuple(sorted(params)))
+    cached = _throughput_cache.get(key)
+    if cached is not None:
+        return cached
+
+    runs = _filter(select_runs(group_by), filters, extra)
+    edges, groups = throughput_distribution(db, runs, group_by, bins)
+
+    result = ThroughputOut(
+        group_by=group_by,
+        bin_edges=edges,
+        groups=[
+            ThroughputGroupOut(
+                group=group.key,
+                runs=group.runs,
+                mean=group.mean,
+                stddev=group.stddev,
+                min=group.min,
+                max=group.max,
+                percentiles=group.percentiles,
+                histogram=group.histogram,
+            )
+            for group in groups
+        ],
+    )
+    _throughput_cache.set(key, result)
+
+    return result
+
+
+@router.get("/throughput/runs", response_model=list[ThroughputRunOut])
+def throughput_runs(
+    db: Session = Depends(get_db),
+    group_by: Annotated[list[GroupBy] | None, Query(alias="groupBy")] = None,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    filters: Annotated[SimulationFilter | None, Depends(SimulationFilter)] = None,
+    extra: Annotated[list[ExtraFilter] | None, Depends(extra_filters)] = None,
+):
+    """List the SYPD of each run, fastest first, ranked within its group.
+
+    A run's ``percentile`` and ``relativeToMean`` compare it with the other
+    selected runs of its group, so a low value flags a run that is slower
+    than its peers on the same machine or configuration.
+
+    Parameters
+    ----------
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+    group_by : list[GroupBy] | None, optional
+        The columns runs are ranked within, by default the machine.
+    limit : int, optional
+        The most runs returned, by default 100.
+    offset : int, optional
+        The number of runs skipped, by default 0.
+    filters : SimulationFilter | None, optional
+        Exact-match filters over the catalog columns.
+    extra : list[ExtraFilter] | None, optional
+        Filters over ``extra``, parsed from the ``extra.*`` query parameters.
+
+    Returns
+    -------
+    list[ThroughputRunOut]
+        The runs with their throughput and rank.
+    """
+    group_by = list(dict.fromkeys(group_by or ["machine"]))
+    runs = _filter(select_runs(group_by), filters, extra)
+    rows = db.execute(rank_runs(runs, group_by).limit(limit).offset(offset))
+
+    return [
+        ThroughputRunOut(
+            id=row.id,
+            name=row.name,
+            group={field: row._mapping[field] for field in group_by},
+            total_years=row.total_years,
+            run_start_date=row.run_start_date,
+            run_end_date=row.run_end_date,
+            sypd=row.sypd,
+            percentile=row.percentile,
+            relative_to_mean=row.relative_to_mean,
+        )
+        for row in rows
+    ]
+
+
+@router.get("/component-costs", response_model=list[ComponentCostGroupOut])
+def compare_component_costs(
+    db: Session = Depends(get_db),
+    group_by: Annotated[CostGroupBy, Query(alias="groupBy")] = "simulation",
+    simulation_ids: Annotated[list[UUID] | None, Query(alias="simulationIds")] = None,
+    filters: Annotated[SimulationFilter | None, Depends(SimulationFilter)] = None,
+    extra: Annotated[list[ExtraFilter] | None, Depends(extra_filters)] = None,
+):
+    """Compare the cost of each component across simulations or machines.
+
+    Averages the ingested timing files (see ``app/ingest/timing.py``) of the
+    selected simulations: the model cost and throughput, and per component
+    its PEs, seconds per model day, pe-hours per simulated year and share of
+    the model's run time. Simulations without timing files are left out.
+
+    Parameters
+    ----------
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+    group_by : {"simulation", "machine"}, optional
+        Whether to compare simulations or machines, by default "simulation".
+    simulation_ids : list[UUID] | None, optional
+        Only these simulations, e.g. ``?simulationIds=...&simulationIds=...``.
+    filters : SimulationFilter | None, optional
+        Exact-match filters over the catalog columns.
+    extra : list[ExtraFilter] | None, optional
+        Filters over ``extra``, parsed from the ``extra.*`` query parameters.
+
+    Returns
+    -------
+    list[ComponentCostGroupOut]
+        One entry per simulation or machine, by name, with its components by
+        descending cost.
+    """
+    selection = _filter(select(Simulation.id), filters, extra)
+    if simulation_ids:
+        selection = selection.where(Simulation.id.in_(simulation_ids))
+
+    return [
+        ComponentCostGroupOut(
+            id=group.id,
+            name=group.name,
+            runs=group.runs,
+            model_cost=group.model_cost,
+            model_throughput=group.model_throughput,
+            components=[
+                ComponentCostOut.model_validate(component)
+                for component in group.components
+            ],
+        )
+        for group in component_costs(db, selection, group_by)
+    ]
+
+
+@router.get("/campaigns", response_model=list[RollupOut])
+def list_campaign_rollups(db: Session = Depends(get_db)):
+    """List per-campaign aggregates, by campaign ID.
+
+    Served from the ``simulation_rollups`` materialized view, which is
+    refreshed a few seconds after writes (see ``app/api/rollups.py``).
+
+    Parameters
+    ----------
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+
+    Returns
+    -------
+    list[RollupOut]
+        The run counts by status, simulated years, date span, machine mix and
+        artifact volume of each campaign.
+    """
+    return _rollups(db, "campaign")
+
+
+@router.get("/campaigns/{campaign_id}", response_model=RollupOut)
+def get_campaign_rollup(campaign_id: str, db: Session = Depends(get_db)):
+    """Retrieve the aggregates of one campaign.
+
+    Parameters
+    ----------
+    campaign_id : str
+        The campaign ID.
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+
+    Returns
+    -------
+    RollupOut
+        The run counts by status, simulated years, date span, machine mix and
+        artifact volume of the campaign.
+
+    Raises
+    ------
+    HTTPException
+        404 if no simulation belongs to the campaign.
+    """
+    rollups = _rollups(db, "campaign", campaign_id)
+    if not rollups:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+
+    return rollups[0]
+
+
+@router.get("/groups", response_model=list[RollupOut])
+def list_group_rollups(db: Session = Depends(get_db)):
+    """List per-group aggregates, by group name.
+
+    Served from the ``simulation_rollups`` materialized view, which is
+    refreshed a few seconds after writes (see ``app/api/rollups.py``).
+
+    Parameters
+    ----------
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+
+    Returns
+    -------
+    list[RollupOut]
+        The run counts by status, simulated years, date span, machine mix and
+        artifact volume of each group.
+    """
+    return _rollups(db, "group")
+
+
+@router.get("/groups/{group_name}", response_model=RollupOut)
+def get_group_rollup(group_name: str, db: Session = Depends(get_db)):
+    """Retrieve the aggregates of one group.
+
+    Parameters
+    ----------
+    group_name : str
+        The group name.
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+
+    Returns
+    -------
+    RollupOut
+        The run counts by status, simulated years, date span, machine mix and
+        artifact volume of the group.
+
+    Raises
+    ------
+    HTTPException
+        404 if no simulation belongs to the group.
+    """
+    rollups = _rollups(db, "group", group_name)
+    if not rollups:
+        raise HTTPException(status_code=404, detail="Group not found")
+
+    return rollups[0]
+
+
+def _rollups(db: Session, dimension: str, key: str | None = None) -> list[RollupOut]:
+    """Read rollups of one dimension from the view, optionally for one key."""
+    stmt = select(simulation_rollups).where(simulation_rollups.c.dimension == dimension)
+    if key is not None:
+        stmt = stmt.where(simulation_rollups.c.key == key)
+
+    return [
+        RollupOut.model_validate(row._mapping)
+        for row in db.execute(stmt.order_by(simulation_rollups.c.key))
+    ]
+
+
+def _filter(
+    stmt: Select, filters: SimulationFilter | None, extra: list[ExtraFilter] | None
+) -> Select:
+    """Apply the catalog filters to a ``select_runs`` statement."""
+    if filters is not None:
+        stmt = apply_simulation_filter(stmt, filters)
+    if extra:
+        stmt = apply_extra_filters(stmt, extra)
+
+    return stmt
@@ -0,0 +1,119 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, selectinload
+
+from app.api.deps import get_db
+from app.db.cluster import Cluster, ClusterAssignment
+from app.db.simulation import Simulation
+from app.schemas import ClusterMember, ClusterOut, SimulationOut
+
+router = APIRouter(prefix="/clusters", tags=["Clusters"])
+
+
+@router.get("", response_model=list[ClusterOut])
+def list_clusters(
+    members: Annotated[int, Query(ge=0, le=50)] = 5,
+    db: Session = Depends(get_db),
+):
+    """List the simulation families, largest first, with their central members.
+
+    Clusters are built by the ``app.ai.clustering`` batch job. This is the
+    grouped catalog view: one entry per family instead of one row per run.
+
+    Parameters
+    ----------
+    members : int, optional
+        The number of members closest to each centroid to include, by default 5.
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+
+    Returns
+    -------
+    list[ClusterOut]
+        The clusters with up to ``members`` members each, closest first.
+    """
+    clusters = [
+        ClusterOut.model_validate(cluster)
+        for cluster in db.execute(
+            select(Cluster.id, Cluster.label, Cluster.size).order_by(
+                Cluster.size.desc(), Cluster.id
+            )
+        )
+    ]
+
+    if members and clusters:
+        # One pass over the (cluster_id, distance) index for every cluster.
+        rank = (
+            func.row_number()
+            .over(
+                partition_by=ClusterAssignment.cluster_id,
+                order_by=(ClusterAssignment.distance, ClusterAssignment.simulation_id),
+            )
+            .label("rank")
+        )
+        ranked = select(
+            ClusterAssignment.cluster_id,
+            ClusterAssignment.simulation_id,
+            ClusterAssignment.distance,
+            rank,
+        ).subquery()
+        rows = db.execute(
+            select(
+                ranked.c.cluster_id, Simulation.id, Simulation.name, ranked.c.distance
+            )
+            .join(Simulation, Simulation.id == ranked.c.simulation_id)
+            .where(ranked.c.rank <= members)
+            .order_by(ranked.c.cluster_id, ranked.c.rank)
+        )
+
+        by_id = {cluster.id: cluster for cluster in clusters}
+        for row in rows:
+            by_id[row.cluster_id].members.append(ClusterMember.model_validate(row))
+
+    return clusters
+
+
+@router.get("/{cluster_id}/simulations", response_model=list[SimulationOut])
+def list_cluster_simulations(
+    cluster_id: int,
+    limit: Annotated[int, Query(ge=1, le=1000)] = 100,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    db: Session = Depends(get_db),
+):
+    """List the simulations of one cluster, closest to its centroid first.
+
+    Parameters
+    ----------
+    cluster_id : int
+        The cluster ID.
+    limit : int, optional
+        The page size, by default 100.
+    offset : int, optional
+        The number of simulations to skip, by default 0.
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+
+    Returns
+    -------
+    list[SimulationOut]
+        One page of the cluster's simulations.
+
+    Raises
+    ------
+    HTTPException
+        404 if the cluster does not exist.
+    """
+    if db.get(Cluster, cluster_id) is None:
+        raise HTTPException(status_code=404, detail="Cluster not found")
+
+    return db.scalars(
+        select(Simulation)
+        .join(ClusterAssignment)
+        .where(ClusterAssignment.cluster_id == cluster_id)
+        .options(selectinload(Simulation.artifacts), selectinload(Simulation.links))
+        .order_by(ClusterAssignment.distance, Simulation.id)
+        .limit(limit)
+        .offset(offset)
+    ).all()
@@ -4,8 +4,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, transaction
+from app.api.machine_stats import machine_stats
 from app.db.machine import Machine
-from app.schemas import MachineCreate, MachineOut
+from app.schemas import MachineCreate, MachineOut, MachineStatsOut
 
 router = APIRouter(prefix="/machines", tags=["Machines"])
 
@@ -72,6 +73,58 @@ def list_machines(db: Session = Depends(get_db)):
     return machines
 
 
+@router.get("/stats", response_model=list[MachineStatsOut])
+def list_machine_stats(db: Session = Depends(get_db)):
+    """Retrieve usage statistics of every machine, ordered by name.
+
+    Each machine gets its simulation count, status breakdown, total simulated
+    years, most recent run and compilers, all computed in one grouped query
+    and cached until a simulation on the machine changes (see
+    ``app/api/machine_stats.py``).
+
+    Parameters
+    ----------
+    db : Session, optional
+        The database session dependency, by default provided by `Depends(get_db)`.
+
+    Returns
+    -------
+    list[MachineStatsOut]
+        The statistics of each machine, including machines without simulations.
+    """
+    return machine_stats(db)
+
+
+@router.get("/{machine_id}/stats", response_model=MachineStatsOut)
+def get_machine_stats(machine_id: UUID, db: Session = Depends(get_db)):
+    """Retrieve the usage statistics of a machine.
+
+    Parameters
+    ----------
+    machine_id : UUID
+        The unique identifier of the machine.
+    db : Session, optional
+        The database session dependency, by default provided by `Depends(get_db)`.
+
+    Returns
+    -------
+    MachineStatsOut
+        The machine's simulation count, status breakdown, total simulated
+        years, most recent run and compilers.
+
+    Raises
+    ------
+    HTTPException
+        If the machine with the given ID is not found, raises a 404 HTTP exception.
+    """
+    stats = machine_stats(db, machine_id)
+
+    if not stats:
+        raise HTTPException(status_code=404, detail="Machine not found")
+
+    return stats[0]
+
+
 @router.get("/{machine_id}", response_model=MachineOut)
 def get_machine(machine_id: UUID, db: Session = Depends(get_db)):
     """Retrieve a machine by its ID.
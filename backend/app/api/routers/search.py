@@ -0,0 +1,292 @@
+import base64
+import binascii
+import json
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import REAL, and_, cast, func, or_, select
+from sqlalchemy.dialects.postgresql import ts_headline, websearch_to_tsquery
+from sqlalchemy.orm import Session
+
+from app.ai.embedding_store import EmbeddingStore
+from app.ai.embeddings import encode
+from app.ai.similarity import SimilarityFeatures, build_features
+from app.api.deps import get_db
+from app.api.filters import (
+    ExtraFilter,
+    apply_extra_filters,
+    apply_simulation_filter,
+    extra_filters,
+)
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.simulation import SEARCH_CONFIG, Simulation
+from app.schemas.search import (
+    SemanticSearchHit,
+    SimilarSimulation,
+    TextSearchHit,
+    TextSearchPage,
+)
+from app.schemas.simulation import SimulationFilter
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+_store = EmbeddingStore(settings.embedding_dir)
+
+# Similarity features keyed by the catalog's state, rebuilt when it changes.
+_features_cache: TTLCache[tuple, SimilarityFeatures] = TTLCache(maxsize=1)
+
+# ts_headline options for text search snippets.
+_HEADLINE_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MinWords=10, MaxWords=30, "
+    'MaxFragments=2, FragmentDelimiter=" ... "'
+)
+
+
+@router.get("/semantic", response_model=list[SemanticSearchHit])
+def semantic_search(
+    q: str = Query(..., min_length=1, description="Free-text query."),
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Find the simulations whose descriptions are most similar to a query.
+
+    The query is embedded with the same model as the catalog and compared with
+    every stored embedding in one vectorized dot product.
+
+    Parameters
+    ----------
+    q : str
+        The free-text query.
+    limit : int, optional
+        The maximum number of results, by default 10.
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+
+    Returns
+    -------
+    list[SemanticSearchHit]
+        The matching simulations, most similar first.
+
+    Raises
+    ------
+    HTTPException
+        503 if the embedding index has not been built yet.
+    """
+    index = _store.index()
+    if index is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Semantic search index has not been built yet.",
+        )
+
+    hits = index.search(encode([q])[0], limit)
+    sims = {
+        str(sim.id): sim
+        for sim in db.query(Simulation).filter(
+            Simulation.id.in_([UUID(sim_id) for sim_id, _ in hits])
+        )
+    }
+
+    # Simulations deleted since the index was built are skipped.
+    return [
+        SemanticSearchHit(
+            id=sim.id,
+            name=sim.name,
+            case_name=sim.case_name,
+            compset=sim.compset,
+            grid_name=sim.grid_name,
+            score=score,
+        )
+        for sim_id, score in hits
+        if (sim := sims.get(sim_id)) is not None
+    ]
+
+
+@router.get("/text", response_model=TextSearchPage)
+def text_search(
+    q: str = Query(..., min_length=1, description='Words, "phrases" or -exclusions.'),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="`nextCursor` of the previous page."),
+    filters: SimulationFilter = Depends(),
+    extra: list[ExtraFilter] = Depends(extra_filters),
+    db: Session = Depends(get_db),
+):
+    """Search simulation names, case names, notes and known issues.
+
+    The query uses web search syntax (``cold bias``, ``"restart failed"``,
+    ``-spinup``) against the GIN-indexed ``search_vector`` column. Results are
+    ranked with ``ts_rank_cd`` and paginated with a keyset cursor on
+    ``(rank, id)``, so deep pages cost the same as the first one.
+
+    Parameters
+    ----------
+    q : str
+        The search query.
+    limit : int, optional
+        The page size, by default 20.
+    cursor : str | None, optional
+        The cursor returned with the previous page, by default None.
+    filters : SimulationFilter
+        Exact-match filters combined with the text query.
+    extra : list[ExtraFilter]
+        Filters over ``extra``, parsed from the ``extra.*`` query parameters.
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+
+    Returns
+    -------
+    TextSearchPage
+        The page of matches, best first, and the cursor of the next page.
+
+    Raises
+    ------
+    HTTPException
+        400 if the cursor is malformed.
+    """
+    query = websearch_to_tsquery(SEARCH_CONFIG, q)
+    rank = func.ts_rank_cd(Simulation.search_vector, query)
+
+    stmt = select(Simulation.id, rank.label("rank")).where(
+        Simulation.search_vector.op("@@")(query)
+    )
+    stmt = apply_extra_filters(apply_simulation_filter(stmt, filters), extra)
+    if cursor is not None:
+        after_rank, after_id = _decode_cursor(cursor)
+        # ts_rank_cd returns real, so compare in real to match it exactly.
+        after_rank = cast(after_rank, REAL)
+        stmt = stmt.where(
+            or_(rank < after_rank, and_(rank == after_rank, Simulation.id > after_id))
+        )
+    # Fetch one extra row to know whether there is a next page.
+    page = stmt.order_by(rank.desc(), Simulation.id).limit(limit + 1).subquery()
+
+    # Headlines are expensive, so they are only computed for the page.
+    document = func.nullif(
+        func.concat_ws(" ", Simulation.notes_markdown, Simulation.known_issues), ""
+    )
+    rows = db.execute(
+        select(
+            Simulation.id,
+            Simulation.name,
+            Simulation.case_name,
+            Simulation.compset,
+            Simulation.grid_name,
+            page.c.rank,
+            ts_headline(SEARCH_CONFIG, document, query, _HEADLINE_OPTIONS).label(
+                "snippet"
+            ),
+        )
+        .join(page, page.c.id == Simulation.id)
+        .order_by(page.c.rank.desc(), Simulation.id)
+    ).all()
+
+    items = [TextSearchHit.model_validate(row) for row in rows[:limit]]
+    next_cursor = (
+        _encode_cursor(items[-1].rank, items[-1].id) if len(rows) > limit else None
+    )
+
+    return TextSearchPage(items=items, next_cursor=next_cursor)
+
+
+@router.get("/similar/{sim_id}", response_model=list[SimilarSimulation])
+def similar_simulations(
+    sim_id: UUID,
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Find the simulations most similar to a given one.
+
+    Candidates are scored on exact matches of compset, grid, machine and
+    version tag plus the TF-IDF similarity of their notes, using feature
+    arrays precomputed for the whole catalog.
+
+    Parameters
+    ----------
+    sim_id : UUID
+        The simulation to compare against.
+    limit : int, optional
+        The maximum number of results, by default 10.
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+
+    Returns
+    -------
+    list[SimilarSimulation]
+        The most similar simulations, best first, with a per-field explanation
+        of each score.
+
+    Raises
+    ------
+    HTTPException
+        404 if the simulation does not exist.
+    """
+    features = _get_features(db)
+
+    try:
+        matches = features.similar(str(sim_id), limit)
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Simulation not found"
+        ) from None
+
+    sims = {
+        str(sim.id): sim
+        for sim in db.query(Simulation).filter(
+            Simulation.id.in_([UUID(match.id) for match in matches])
+        )
+    }
+
+    return [
+        SimilarSimulation(
+            id=sim.id,
+            name=sim.name,
+            case_name=sim.case_name,
+            compset=sim.compset,
+            grid_name=sim.grid_name,
+            score=match.score,
+            explanation=match.fields,
+        )
+        for match in matches
+        if (sim := sims.get(match.id)) is not None
+    ]
+
+
+def _get_features(db: Session) -> SimilarityFeatures:
+    """Return the similarity features, rebuilding them if the catalog changed.
+
+    The catalog's state is the simulation count and newest ``updated_at``, so
+    inserts, updates and deletes all invalidate the features at the cost of
+    one aggregate query.
+    """
+    key = tuple(
+        db.execute(
+            select(func.count(Simulation.id), func.max(Simulation.updated_at))
+        ).one()
+    )
+
+    features = _features_cache.get(key)
+    if features is None:
+        features = build_features(db)
+        _features_cache.set(key, features)
+
+    return features
+
+
+def _encode_cursor(rank: float, sim_id: UUID) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor."""
+    raw = json.dumps([rank, str(sim_id)]).encode()
+
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[float, UUID]:
+    """Decode a cursor from ``_encode_cursor``."""
+    try:
+        rank, sim_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+
+        return float(rank), UUID(sim_id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        ) from e
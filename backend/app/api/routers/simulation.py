@@ -1,16 +1,88 @@
+import json
+from collections.abc import Callable, Iterable
+from typing import Annotated, Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func, literal, select, text, union_all
 from sqlalchemy.orm import Session, selectinload
 
 from app.api.deps import get_db, transaction
+from app.api.facets import catalog_facets, query_facets
+from app.api.filters import (
+    ExtraFilter,
+    apply_extra_filters,
+    apply_simulation_filter,
+    apply_variable_filter,
+    extra_filters,
+)
+from app.api.lineage import Direction, lineage_query
+from app.api.variance import load_columns, variance_matrix
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.db.artifact import Artifact
 from app.db.link import ExternalLink
+from app.db.machine import Machine
 from app.db.simulation import Simulation
-from app.schemas import SimulationCreate, SimulationOut
+from app.db.timing import TimingRun
+from app.schemas import (
+    CollectionDiff,
+    ExtraKeyOut,
+    FacetQueryOut,
+    FieldVarianceOut,
+    LineageNode,
+    SimulationCompareRequest,
+    SimulationComparison,
+    SimulationCreate,
+    SimulationFilter,
+    SimulationOut,
+    Suggestion,
+    TimingRunOut,
+    ValueCount,
+    VarianceMatrixOut,
+)
+from app.schemas.utils import to_camel_case
 
 router = APIRouter(prefix="/simulations", tags=["Simulations"])
 
+# Fields of ``SimulationOut`` that are not compared: identity and bookkeeping,
+# collections (diffed separately) and ``extra`` (compared key by key).
+_UNCOMPARED_FIELDS = {"id", "created_at", "updated_at", "artifacts", "links", "extra"}
+
+# Suggestions per (lowercased query, limit). Kept briefly, so hot prefixes are
+# served from memory while new simulations still show up within seconds.
+_suggest_cache: TTLCache[tuple[str, int], list[Suggestion]] = TTLCache(
+    maxsize=1024, ttl=settings.suggest_cache_ttl
+)
+
+# Whether the pg_trgm extension is installed, checked once per process.
+_trigram_available: bool | None = None
+
+# Every (possibly nested) key of ``extra`` with its usage, found by walking
+# the objects recursively.
+_EXTRA_KEYS_SQL = text(
+    """
+    WITH RECURSIVE entries(sim_id, path, value) AS (
+        SELECT s.id, ARRAY[e.key], e.value
+        FROM simulations s, jsonb_each(s.extra) e
+      UNION ALL
+        SELECT entries.sim_id, entries.path || c.key, c.value
+        FROM entries, jsonb_each(
+            CASE WHEN jsonb_typeof(entries.value) = 'object'
+            THEN entries.value ELSE '{}'::jsonb END
+        ) c
+    )
+    SELECT
+        array_to_string(path, '.') AS key,
+        count(DISTINCT sim_id) AS simulations,
+        count(DISTINCT value) AS distinct_values,
+        array_agg(DISTINCT jsonb_typeof(value)) AS types
+    FROM entries
+    GROUP BY path
+    ORDER BY key
+    """
+)
+
 
 @router.post("", response_model=SimulationOut, status_code=status.HTTP_201_CREATED)
 def create_simulation(payload: SimulationCreate, db: Session = Depends(get_db)):
@@ -58,15 +130,34 @@ def create_simulation(payload: SimulationCreate, db: Session = Depends(get_db)):
 
 
 @router.get("", response_model=list[SimulationOut])
-def list_simulations(db: Session = Depends(get_db)):
+def list_simulations(
+    db: Session = Depends(get_db),
+    filters: Annotated[SimulationFilter | None, Depends(SimulationFilter)] = None,
+    extra: Annotated[list[ExtraFilter] | None, Depends(extra_filters)] = None,
+    variables: Annotated[
+        list[str] | None,
+        Query(description="Only simulations providing all of these variables."),
+    ] = None,
+):
     """
     Retrieve a list of simulations from the database, ordered by creation date
     in descending order.
 
+    Besides the exact-match filters, keys of the ``extra`` bucket can be
+    queried with ``extra.<path>=<value>`` (JSON containment) and
+    ``extra.<path>.exists`` parameters, e.g. ``?extra.ensemble_member=3``.
+
     Parameters
     ----------
     db : Session, optional
         The database session dependency, by default obtained via `Depends(get_db)`.
+    filters : SimulationFilter | None, optional
+        Exact-match filters over the catalog columns.
+    extra : list[ExtraFilter] | None, optional
+        Filters over ``extra``, parsed from the ``extra.*`` query parameters.
+    variables : list[str] | None, optional
+        Output variables that every returned simulation must provide, e.g.
+        ``?variables=TS&variables=PRECT``.
 
     Returns
     -------
@@ -74,18 +165,314 @@ def list_simulations(db: Session = Depends(get_db)):
         A list of `Simulation` objects, ordered by their `created_at` timestamp
         in descending order.
     """
-    sims = (
-        db.query(Simulation)
+    stmt = (
+        select(Simulation)
         .options(
             selectinload(Simulation.artifacts),
             selectinload(Simulation.links),
         )
         .order_by(Simulation.created_at.desc())
-        .all()
     )
+    if filters is not None:
+        stmt = apply_simulation_filter(stmt, filters)
+    if extra:
+        stmt = apply_extra_filters(stmt, extra)
+    if variables:
+        stmt = apply_variable_filter(stmt, variables)
+
+    sims = db.scalars(stmt).all()
     return sims
 
 
+@router.get("/variance", response_model=VarianceMatrixOut)
+def simulation_variance(
+    db: Session = Depends(get_db),
+    filters: Annotated[SimulationFilter | None, Depends(SimulationFilter)] = None,
+    extra: Annotated[list[ExtraFilter] | None, Depends(extra_filters)] = None,
+    variables: Annotated[
+        list[str] | None,
+        Query(description="Only simulations providing all of these variables."),
+    ] = None,
+    bins: Annotated[int, Query(ge=1, le=100)] = 10,
+    outlier_fraction: Annotated[
+        float, Query(alias="outlierFraction", gt=0, lt=0.5)
+    ] = 0.05,
+    max_outliers: Annotated[int, Query(alias="maxOutliers", ge=0, le=1000)] = 50,
+    varying_only: Annotated[bool, Query(alias="varyingOnly")] = False,
+):
+    """Summarize how every field varies across a selection of simulations.
+
+    For every ``Simulation`` column and every top-level ``extra`` key, this
+    returns the number of distinct values, a histogram of the most common
+    ones and the runs that are outliers (see ``app/api/variance.py``). The
+    selection takes the same filters as ``GET /simulations``, e.g.
+    ``?campaignId=v3.LR.ensemble``. The rows are fetched as columns in two
+    queries and summarized in one vectorized pass.
+
+    Parameters
+    ----------
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+    filters : SimulationFilter | None, optional
+        Exact-match filters over the catalog columns.
+    extra : list[ExtraFilter] | None, optional
+        Filters over ``extra``, parsed from the ``extra.*`` query parameters.
+    variables : list[str] | None, optional
+        Output variables that every selected simulation must provide.
+    bins : int, optional
+        The most common values listed per field, by default 10.
+    outlier_fraction : float, optional
+        The largest share of runs an outlying value may have, by default 0.05.
+    max_outliers : int, optional
+        The most outlier IDs listed per field, by default 50.
+    varying_only : bool, optional
+        Whether to omit fields with a single value, by default False.
+
+    Returns
+    -------
+    VarianceMatrixOut
+        The number of selected simulations and one summary per field.
+
+    Raises
+    ------
+    HTTPException
+        400 if more than ``settings.variance_max_simulations`` simulations match.
+    """
+    stmt = select(Simulation.id)
+    if filters is not None:
+        stmt = apply_simulation_filter(stmt, filters)
+    if extra:
+        stmt = apply_extra_filters(stmt, extra)
+    if variables:
+        stmt = apply_variable_filter(stmt, variables)
+
+    limit = settings.variance_max_simulations
+    ids, columns = load_columns(db, stmt, limit + 1)
+    if len(ids) > limit:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Select at most {limit} simulations for a variance matrix.",
+        )
+
+    summaries = variance_matrix(ids, columns, bins, outlier_fraction, max_outliers)
+
+    return VarianceMatrixOut(
+        total=len(ids),
+        fields=[
+            FieldVarianceOut(
+                field=summary.field,
+                distinct=summary.distinct,
+                nulls=summary.nulls,
+                histogram=[
+                    ValueCount(value=value, count=count)
+                    for value, count in summary.histogram
+                ],
+                other=summary.other,
+                outliers=summary.outliers,
+                outlier_count=summary.outlier_count,
+            )
+            for summary in summaries
+            if not varying_only or summary.distinct > 1
+        ],
+    )
+
+
+@router.get("/facets", response_model=FacetQueryOut)
+def facet_simulations(
+    status: Annotated[list[str] | None, Query()] = None,
+    compset: Annotated[list[str] | None, Query()] = None,
+    grid_resolution: Annotated[list[str] | None, Query(alias="gridResolution")] = None,
+    machine_id: Annotated[list[UUID] | None, Query(alias="machineId")] = None,
+    campaign_id: Annotated[list[str] | None, Query(alias="campaignId")] = None,
+    simulation_type: Annotated[list[str] | None, Query(alias="simulationType")] = None,
+    version_tag: Annotated[list[str] | None, Query(alias="versionTag")] = None,
+    db: Session = Depends(get_db),
+):
+    """Filter the catalog by facet values and count every facet value.
+
+    Repeating a parameter selects any of its values; different parameters
+    must all match. Each facet's counts apply the other facets' selections
+    but not its own, so they show what selecting another value would add.
+    The query runs on the in-process bitset index (see ``app/api/facets.py``)
+    without a database round trip once the index is built at startup, and as
+    one ``GROUP BY`` per facet otherwise.
+
+    Parameters
+    ----------
+    status, compset, grid_resolution, machine_id, campaign_id, simulation_type, version_tag : list | None, optional
+        The selected values of each facet.
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+
+    Returns
+    -------
+    FacetQueryOut
+        The IDs of the matching simulations and the facet counts.
+    """  # noqa: E501
+    selections = {
+        "status": status,
+        "compset": compset,
+        "grid_resolution": grid_resolution,
+        "machine_id": machine_id,
+        "campaign_id": campaign_id,
+        "simulation_type": simulation_type,
+        "version_tag": version_tag,
+    }
+    if settings.facet_index and catalog_facets.ready:
+        result = catalog_facets.get(db).query(
+            {
+                field: [str(v) for v in values or ()]
+                for field, values in selections.items()
+            }
+        )
+    else:
+        result = query_facets(
+            db, {field: values or () for field, values in selections.items()}
+        )
+
+    return FacetQueryOut(
+        total=result.total,
+        ids=result.ids,
+        facets={
+            to_camel_case(field): counts for field, counts in result.counts.items()
+        },
+    )
+
+
+@router.get("/extra-keys", response_model=list[ExtraKeyOut])
+def list_extra_keys(db: Session = Depends(get_db)):
+    """List the keys used in the ``extra`` bucket, including nested ones.
+
+    Parameters
+    ----------
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+
+    Returns
+    -------
+    list[ExtraKeyOut]
+        Each key's dotted path, the number of simulations using it, its number
+        of distinct values and their JSON types, ordered by path.
+    """
+    return [ExtraKeyOut.model_validate(row) for row in db.execute(_EXTRA_KEYS_SQL)]
+
+
+@router.get("/suggest", response_model=list[Suggestion])
+def suggest(
+    q: str = Query(..., description="The text typed so far."),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    """Suggest simulation names, case names and machines matching a prefix.
+
+    Names that start with the query rank first, then names that contain it or
+    are fuzzy matches, by trigram word similarity. The matching uses the
+    ``gin_trgm_ops`` indexes when pg_trgm is installed, and plain ``ILIKE``
+    otherwise. Queries shorter than ``settings.suggest_min_length`` return
+    nothing.
+
+    Parameters
+    ----------
+    q : str
+        The text typed so far.
+    limit : int, optional
+        The maximum number of suggestions, by default 10.
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+
+    Returns
+    -------
+    list[Suggestion]
+        The suggestions, best first.
+    """
+    q = q.strip()
+    if len(q) < settings.suggest_min_length:
+        return []
+
+    key = (q.lower(), limit)
+    suggestions = _suggest_cache.get(key)
+    if suggestions is None:
+        suggestions = [
+            Suggestion.model_validate(row)
+            for row in db.execute(_suggest_query(q, limit, _has_trigram(db)))
+        ]
+        _suggest_cache.set(key, suggestions)
+
+    return suggestions
+
+
+@router.post(":compare", response_model=SimulationComparison)
+def compare_simulations(
+    payload: SimulationCompareRequest, db: Session = Depends(get_db)
+):
+    """Diff N simulations field by field.
+
+    The simulations and their artifacts and links are loaded in three
+    queries, whatever N is. Fields every simulation agrees on are returned
+    once; only differing fields list a value per simulation, and only
+    artifacts and links that some simulations lack are listed.
+
+    Parameters
+    ----------
+    payload : SimulationCompareRequest
+        The IDs of the simulations to compare; duplicates are ignored.
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+
+    Returns
+    -------
+    SimulationComparison
+        The identical and differing fields and the differing artifacts and
+        links, with per-simulation values in the order of the request.
+
+    Raises
+    ------
+    HTTPException
+        400 if fewer than two distinct or more than
+        ``settings.compare_max_simulations`` simulations are given, and 404 if
+        any of them does not exist.
+    """
+    sim_ids = list(dict.fromkeys(payload.simulation_ids))
+    if not 2 <= len(sim_ids) <= settings.compare_max_simulations:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                "Compare between 2 and "
+                f"{settings.compare_max_simulations} distinct simulations."
+            ),
+        )
+
+    found = {
+        sim.id: sim
+        for sim in db.scalars(
+            select(Simulation)
+            .where(Simulation.id.in_(sim_ids))
+            .options(selectinload(Simulation.artifacts), selectinload(Simulation.links))
+        )
+    }
+    missing = [str(sim_id) for sim_id in sim_ids if sim_id not in found]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Simulations not found: {missing}",
+        )
+
+    sims = [found[sim_id] for sim_id in sim_ids]
+    identical, differing = _diff_fields([_field_values(sim) for sim in sims])
+
+    return SimulationComparison(
+        simulation_ids=sim_ids,
+        identical=identical,
+        differing=differing,
+        artifacts=_diff_collections(
+            sims, lambda sim: ((a.kind, a.uri) for a in sim.artifacts)
+        ),
+        links=_diff_collections(
+            sims, lambda sim: ((link.link_type, link.url) for link in sim.links)
+        ),
+    )
+
+
 @router.get("/{sim_id}", response_model=SimulationOut)
 def get_simulation(sim_id: UUID, db: Session = Depends(get_db)):
     """Retrieve a simulation by its unique identifier.
@@ -121,3 +508,282 @@ def get_simulation(sim_id: UUID, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Simulation not found")
 
     return sim
+
+
+@router.get("/{sim_id}/ancestors", response_model=list[LineageNode])
+def list_ancestors(
+    sim_id: UUID,
+    db: Session = Depends(get_db),
+    max_depth: Annotated[int | None, Query(alias="maxDepth", ge=1)] = None,
+    filters: Annotated[SimulationFilter | None, Depends(SimulationFilter)] = None,
+    extra: Annotated[list[ExtraFilter] | None, Depends(extra_filters)] = None,
+    variables: Annotated[list[str] | None, Query()] = None,
+):
+    """List the runs a simulation was branched from, nearest first.
+
+    Parameters
+    ----------
+    sim_id : UUID
+        The simulation whose ancestors are listed.
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+    max_depth : int | None, optional
+        The most generations walked up, e.g. 1 for the parent only; by
+        default all of them.
+    filters : SimulationFilter | None, optional
+        Exact-match filters the returned ancestors must pass.
+    extra : list[ExtraFilter] | None, optional
+        Filters over ``extra``, parsed from the ``extra.*`` query parameters.
+    variables : list[str] | None, optional
+        Output variables that every returned ancestor must provide.
+
+    Returns
+    -------
+    list[LineageNode]
+        The ancestors with their distance in generations.
+
+    Raises
+    ------
+    HTTPException
+        404 if the simulation does not exist.
+    """
+    return _lineage(db, sim_id, "ancestors", max_depth, filters, extra, variables)
+
+
+@router.get("/{sim_id}/descendants", response_model=list[LineageNode])
+def list_descendants(
+    sim_id: UUID,
+    db: Session = Depends(get_db),
+    max_depth: Annotated[int | None, Query(alias="maxDepth", ge=1)] = None,
+    filters: Annotated[SimulationFilter | None, Depends(SimulationFilter)] = None,
+    extra: Annotated[list[ExtraFilter] | None, Depends(extra_filters)] = None,
+    variables: Annotated[list[str] | None, Query()] = None,
+):
+    """List the branch and hybrid runs started from a simulation, nearest first.
+
+    The whole subtree is walked; the filters only select which of its runs
+    are returned, so a matching grandchild is listed even if its parent is
+    filtered out.
+
+    Parameters
+    ----------
+    sim_id : UUID
+        The simulation whose descendants are listed.
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+    max_depth : int | None, optional
+        The most generations walked down, e.g. 1 for direct children only; by
+        default all of them.
+    filters : SimulationFilter | None, optional
+        Exact-match filters the returned descendants must pass.
+    extra : list[ExtraFilter] | None, optional
+        Filters over ``extra``, parsed from the ``extra.*`` query parameters.
+    variables : list[str] | None, optional
+        Output variables that every returned descendant must provide.
+
+    Returns
+    -------
+    list[LineageNode]
+        The descendants with their distance in generations.
+
+    Raises
+    ------
+    HTTPException
+        404 if the simulation does not exist.
+    """
+    return _lineage(db, sim_id, "descendants", max_depth, filters, extra, variables)
+
+
+@router.get("/{sim_id}/timings", response_model=list[TimingRunOut])
+def list_timings(sim_id: UUID, db: Session = Depends(get_db)):
+    """List the ingested timing files of a simulation, most recent run first.
+
+    Timing files are ingested with ``python -m app.ingest.timing``.
+
+    Parameters
+    ----------
+    sim_id : UUID
+        The simulation whose timing files are listed.
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+
+    Returns
+    -------
+    list[TimingRunOut]
+        The timing summaries with the layout and run time of each component.
+
+    Raises
+    ------
+    HTTPException
+        404 if the simulation does not exist.
+    """
+    if db.get(Simulation, sim_id) is None:
+        raise HTTPException(status_code=404, detail="Simulation not found")
+
+    return db.scalars(
+        select(TimingRun)
+        .options(selectinload(TimingRun.components))
+        .where(TimingRun.simulation_id == sim_id)
+        .order_by(TimingRun.run_date.desc().nulls_last(), TimingRun.id.desc())
+    ).all()
+
+
+def _lineage(
+    db: Session,
+    sim_id: UUID,
+    direction: Direction,
+    max_depth: int | None,
+    filters: SimulationFilter | None,
+    extra: list[ExtraFilter] | None,
+    variables: list[str] | None,
+) -> list[LineageNode]:
+    """Run a lineage query with the catalog filters applied to its rows."""
+    if db.get(Simulation, sim_id) is None:
+        raise HTTPException(status_code=404, detail="Simulation not found")
+
+    stmt = lineage_query(sim_id, direction, max_depth, settings.lineage_closure)
+    if filters is not None:
+        stmt = apply_simulation_filter(stmt, filters)
+    if extra:
+        stmt = apply_extra_filters(stmt, extra)
+    if variables:
+        stmt = apply_variable_filter(stmt, variables)
+
+    rows = db.execute(stmt.order_by("depth", Simulation.created_at)).all()
+
+    return [
+        LineageNode(
+            id=sim.id,
+            name=sim.name,
+            case_name=sim.case_name,
+            status=sim.status,
+            parent_simulation_id=sim.parent_simulation_id,
+            depth=depth,
+        )
+        for sim, depth in rows
+    ]
+
+
+def _suggest_query(q: str, limit: int, trigram: bool):
+    """Build the ranked union of name, case name and machine matches."""
+    sources = [
+        ("simulation", Simulation.id, Simulation.name),
+        ("case", Simulation.id, Simulation.case_name),
+        ("machine", Machine.id, Machine.name),
+    ]
+    parts = []
+
+    for kind, id_column, column in sources:
+        match = column.icontains(q, autoescape=True)
+        if trigram:
+            match = match | literal(q).op("<%")(column)
+            score = func.word_similarity(q, column)
+        else:
+            score = literal(float(len(q))) / func.length(column)
+
+        prefix = column.istartswith(q, autoescape=True)
+        parts.append(
+            select(
+                literal(kind).label("kind"),
+                id_column.label("id"),
+                column.label("value"),
+                score.label("score"),
+                prefix.label("prefix"),
+            )
+            .where(match)
+            # Each source is cut to the limit before the union is ranked.
+            .order_by(prefix.desc(), score.desc(), func.length(column), column)
+            .limit(limit)
+        )
+
+    matches = union_all(*parts).subquery()
+
+    return (
+        select(matches.c.kind, matches.c.id, matches.c.value, matches.c.score)
+        .order_by(
+            matches.c.prefix.desc(),
+            matches.c.score.desc(),
+            func.length(matches.c.value),
+            matches.c.value,
+        )
+        .limit(limit)
+    )
+
+
+def _has_trigram(db: Session) -> bool:
+    """Return whether pg_trgm is installed, querying the catalog only once."""
+    global _trigram_available
+
+    if _trigram_available is None:
+        _trigram_available = (
+            db.scalar(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"))
+            is not None
+        )
+
+    return _trigram_available
+
+
+def _field_values(sim: Simulation) -> dict[str, Any]:
+    """Return a simulation's comparable fields as camelCase JSON values."""
+    values = SimulationOut.model_validate(sim).model_dump(
+        mode="json", by_alias=True, exclude=_UNCOMPARED_FIELDS
+    )
+
+    return values | _flatten(sim.extra or {}, "extra")
+
+
+def _flatten(value: dict[str, Any], prefix: str) -> dict[str, Any]:
+    """Flatten nested objects into ``prefix.<dotted path>`` keys."""
+    flat = {}
+
+    for key, item in value.items():
+        path = f"{prefix}.{key}"
+        if isinstance(item, dict) and item:
+            flat |= _flatten(item, path)
+        else:
+            flat[path] = item
+
+    return flat
+
+
+def _diff_fields(
+    runs: list[dict[str, Any]],
+) -> tuple[dict[str, Any], dict[str, list[Any]]]:
+    """Split fields into those equal across runs and the per-run values of the rest.
+
+    A field missing from a run (an ``extra`` key it does not have) is null.
+    """
+    identical, differing = {}, {}
+
+    for field in dict.fromkeys(key for run in runs for key in run):
+        values = [run.get(field) for run in runs]
+        # Compare serialized values, so that e.g. 1 and true stay distinct.
+        if len({json.dumps(v, sort_keys=True) for v in values}) == 1:
+            identical[field] = values[0]
+        else:
+            differing[field] = values
+
+    return identical, differing
+
+
+def _diff_collections(
+    sims: list[Simulation], items: Callable[[Simulation], Iterable[tuple[str, str]]]
+) -> list[CollectionDiff]:
+    """Diff the ``(kind, uri)`` items of simulations, per kind."""
+    by_kind: dict[str, list[set[str]]] = {}
+    for i, sim in enumerate(sims):
+        for kind, uri in items(sim):
+            by_kind.setdefault(kind, [set() for _ in sims])[i].add(uri)
+
+    diffs = []
+    for kind, uris in sorted(by_kind.items()):
+        common = set.intersection(*uris)
+        only = {
+            sim.id: sorted(sim_uris - common)
+            for sim, sim_uris in zip(sims, uris, strict=True)
+            if sim_uris - common
+        }
+        if only:
+            diffs.append(CollectionDiff(kind=kind, common=len(common), only=only))
+
+    return diffs
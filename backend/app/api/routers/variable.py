@@ -0,0 +1,251 @@
+from collections.abc import Iterable
+from uuid import UUID
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, transaction
+from app.db.simulation import Simulation
+from app.db.variable import SimulationVariable, Variable
+from app.schemas import (
+    VariableAttachmentOut,
+    VariableAttachmentRequest,
+    VariableIn,
+    VariableMatrixOut,
+    VariableMatrixRequest,
+    VariableOut,
+)
+
+router = APIRouter(prefix="/variables", tags=["Variables"])
+
+
+@router.get("", response_model=list[VariableOut])
+def list_variables(db: Session = Depends(get_db)):
+    """List the known output variables with the number of simulations providing each.
+
+    Parameters
+    ----------
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+
+    Returns
+    -------
+    list[VariableOut]
+        The variables, ordered by name.
+    """
+    return _variables_with_counts(db)
+
+
+@router.put("", response_model=list[VariableOut])
+def upsert_variables(payload: list[VariableIn], db: Session = Depends(get_db)):
+    """Create variables, or update the descriptions of existing ones, in bulk.
+
+    Parameters
+    ----------
+    payload : list[VariableIn]
+        The variables to write.
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+
+    Returns
+    -------
+    list[VariableOut]
+        The written variables, ordered by name.
+    """
+    if payload:
+        stmt = insert(Variable)
+        with transaction(db):
+            db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[Variable.name],
+                    set_={"description": stmt.excluded.description},
+                ),
+                [variable.model_dump() for variable in payload],
+            )
+
+    return _variables_with_counts(db, [variable.name for variable in payload])
+
+
+@router.post("/attach", response_model=VariableAttachmentOut)
+def attach_variables(payload: VariableAttachmentRequest, db: Session = Depends(get_db)):
+    """Record that simulations provide output variables, in bulk.
+
+    Unknown variable names are created without a description. Pairs that are
+    already attached are left alone, so the request is idempotent.
+
+    Parameters
+    ----------
+    payload : VariableAttachmentRequest
+        The variables of each simulation.
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+
+    Returns
+    -------
+    VariableAttachmentOut
+        The number of pairs that were not attached before.
+
+    Raises
+    ------
+    HTTPException
+        404 if a simulation does not exist.
+    """
+    pairs = _pairs(payload)
+    _check_simulations_exist(db, {sim_id for sim_id, _ in pairs})
+
+    with transaction(db):
+        db.execute(
+            insert(Variable).on_conflict_do_nothing(index_elements=[Variable.name]),
+            [{"name": name} for name in sorted({name for _, name in pairs})],
+        )
+        attached = db.execute(
+            insert(SimulationVariable)
+            .on_conflict_do_nothing()
+            .returning(SimulationVariable.simulation_id),
+            [
+                {"simulation_id": sim_id, "variable_name": name}
+                for sim_id, name in pairs
+            ],
+        ).all()
+
+    return VariableAttachmentOut(changed=len(attached))
+
+
+@router.post("/detach", response_model=VariableAttachmentOut)
+def detach_variables(payload: VariableAttachmentRequest, db: Session = Depends(get_db)):
+    """Remove (simulation, variable) pairs in bulk; missing pairs are ignored.
+
+    Parameters
+    ----------
+    payload : VariableAttachmentRequest
+        The variables to remove from each simulation.
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+
+    Returns
+    -------
+    VariableAttachmentOut
+        The number of pairs that were removed.
+    """
+    pairs = _pairs(payload)
+
+    with transaction(db):
+        detached = db.execute(
+            delete(SimulationVariable)
+            .where(
+                tuple_(
+                    SimulationVariable.simulation_id, SimulationVariable.variable_name
+                ).in_(pairs)
+            )
+            .returning(SimulationVariable.simulation_id)
+        ).all()
+
+    return VariableAttachmentOut(changed=len(detached))
+
+
+@router.post("/matrix", response_model=VariableMatrixOut)
+def variable_matrix(payload: VariableMatrixRequest, db: Session = Depends(get_db)):
+    """Build the availability matrix of variables across a selection.
+
+    The pairs are read in one query and scattered into a boolean matrix, whose
+    rows are returned as strings of "0" and "1" to keep the response small.
+
+    Parameters
+    ----------
+    payload : VariableMatrixRequest
+        The simulations (rows) and, optionally, the variables (columns).
+    db : Session, optional
+        The database session dependency, by default obtained via `Depends(get_db)`.
+
+    Returns
+    -------
+    VariableMatrixOut
+        The matrix, in the requested row and column order, and the variables
+        every simulation provides.
+
+    Raises
+    ------
+    HTTPException
+        404 if a simulation does not exist.
+    """
+    sim_ids = list(dict.fromkeys(payload.simulation_ids))
+    _check_simulations_exist(db, set(sim_ids))
+
+    stmt = select(
+        SimulationVariable.simulation_id, SimulationVariable.variable_name
+    ).where(SimulationVariable.simulation_id.in_(sim_ids))
+    if payload.variables is not None:
+        stmt = stmt.where(SimulationVariable.variable_name.in_(payload.variables))
+    pairs = db.execute(stmt).all()
+
+    if payload.variables is not None:
+        variables = list(dict.fromkeys(payload.variables))
+    else:
+        variables = sorted({name for _, name in pairs})
+
+    rows = {sim_id: i for i, sim_id in enumerate(sim_ids)}
+    columns = {name: j for j, name in enumerate(variables)}
+    matrix = np.zeros((len(sim_ids), len(variables)), dtype=np.uint8)
+    if pairs:
+        matrix[
+            [rows[sim_id] for sim_id, _ in pairs],
+            [columns[name] for _, name in pairs],
+        ] = 1
+
+    common = matrix.all(axis=0)
+
+    return VariableMatrixOut(
+        simulation_ids=sim_ids,
+        variables=variables,
+        matrix=[(row + ord("0")).tobytes().decode() for row in matrix],
+        common=[name for name, shared in zip(variables, common) if shared],
+    )
+
+
+def _variables_with_counts(
+    db: Session, names: list[str] | None = None
+) -> list[VariableOut]:
+    """Load variables, all or the given ones, with their simulation counts."""
+    stmt = (
+        select(
+            Variable.name,
+            Variable.description,
+            func.count(SimulationVariable.simulation_id).label("simulation_count"),
+        )
+        .outerjoin(
+            SimulationVariable, SimulationVariable.variable_name == Variable.name
+        )
+        .group_by(Variable.name)
+        .order_by(Variable.name)
+    )
+    if names is not None:
+        stmt = stmt.where(Variable.name.in_(names))
+
+    return [VariableOut.model_validate(row) for row in db.execute(stmt)]
+
+
+def _pairs(payload: VariableAttachmentRequest) -> list[tuple[UUID, str]]:
+    """Flatten a request into unique (simulation ID, variable name) pairs."""
+    return list(
+        dict.fromkeys(
+            (item.simulation_id, name)
+            for item in payload.items
+            for name in item.variables
+        )
+    )
+
+
+def _check_simulations_exist(db: Session, sim_ids: Iterable[UUID]) -> None:
+    """Raise a 404 listing the IDs that do not exist."""
+    sim_ids = set(sim_ids)
+    found = set(db.scalars(select(Simulation.id).where(Simulation.id.in_(sim_ids))))
+
+    missing = sim_ids - found
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Simulations not found: {sorted(str(i) for i in missing)}",
+        )
@@ -0,0 +1,207 @@
+"""Simulated years per day (SYPD) of runs and its distribution across groups.
+
+A run's throughput is ``total_years`` divided by its wall-clock duration,
+``run_end_date - run_start_date``, in days. Runs missing either date, with a
+non-positive duration or without simulated years have no throughput and are
+left out.
+
+Everything is computed in SQL: per-run ranks with window functions over the
+grouping columns, and per-group moments and percentiles with aggregates, so
+only one row per group (or per requested run) leaves the database.
+"""
+
+from dataclasses import dataclass
+from typing import Literal
+
+from sqlalchemy import Float, Select, cast, func, select
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.orm import Session
+
+from app.db.machine import Machine
+from app.db.simulation import Simulation
+
+GroupBy = Literal["machine", "compset", "gridResolution", "versionTag"]
+
+# The columns runs can be grouped by, keyed by their query parameter value.
+GROUP_COLUMNS = {
+    "machine": Machine.name,
+    "compset": Simulation.compset,
+    "gridResolution": Simulation.grid_resolution,
+    "versionTag": Simulation.version_tag,
+}
+
+# Percentiles reported per group.
+PERCENTILES = (0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95)
+
+_SECONDS_PER_DAY = 86400.0
+
+
+@dataclass(frozen=True)
+class ThroughputGroup:
+    """The throughput distribution of the runs sharing one group key."""
+
+    key: dict[str, str | None]
+    runs: int
+    mean: float
+    stddev: float | None
+    min: float
+    max: float
+    percentiles: dict[str, float]
+    histogram: list[int]
+
+
+def sypd():
+    """Return the SQL expression for the SYPD of a ``Simulation`` row."""
+    days = (
+        cast(
+            func.extract("epoch", Simulation.run_end_date - Simulation.run_start_date),
+            Float,
+        )
+        / _SECONDS_PER_DAY
+    )
+
+    return (Simulation.total_years / days).label("sypd")
+
+
+def select_runs(group_by: list[GroupBy]) -> Select:
+    """Select the runs that have a throughput, with their grouping columns.
+
+    Parameters
+    ----------
+    group_by : list[GroupBy]
+        The grouping columns to include, labeled by their parameter value.
+
+    Returns
+    -------
+    Select
+        A select over ``Simulation`` joined to ``Machine``, to which the
+        catalog filters can be applied.
+    """
+    return (
+        select(
+            Simulation.id,
+            Simulation.name,
+            Simulation.total_years,
+            Simulation.run_start_date,
+            Simulation.run_end_date,
+            sypd(),
+            *(GROUP_COLUMNS[field].label(field) for field in group_by),
+        )
+        .join(Machine, Machine.id == Simulation.machine_id)
+        .where(
+            Simulation.total_years > 0,
+            Simulation.run_end_date > Simulation.run_start_date,
+        )
+    )
+
+
+def rank_runs(runs: Select, group_by: list[GroupBy]) -> Select:
+    """Rank each run's throughput within its group.
+
+    Parameters
+    ----------
+    runs : Select
+        The (filtered) output of ``select_runs``.
+    group_by : list[GroupBy]
+        The grouping columns ranks are computed within.
+
+    Returns
+    -------
+    Select
+        The runs with ``percentile`` (``percent_rank``, 0 for the slowest run
+        of a group and 1 for the fastest) and ``relative_to_mean`` (SYPD over
+        the group mean), fastest first.
+    """
+    subquery = runs.subquery("runs")
+    partition = [subquery.c[field] for field in group_by]
+
+    return select(
+        subquery,
+        func.percent_rank()
+        .over(partition_by=partition, order_by=subquery.c.sypd)
+        .label("percentile"),
+        (
+            subquery.c.sypd / func.avg(subquery.c.sypd).over(partition_by=partition)
+        ).label("relative_to_mean"),
+    ).order_by(subquery.c.sypd.desc(), subquery.c.id)
+
+
+def throughput_distribution(
+    db: Session, runs: Select, group_by: list[GroupBy], bins: int = 10
+) -> tuple[list[float], list[ThroughputGroup]]:
+    """Aggregate the throughput of runs per group.
+
+    Parameters
+    ----------
+    db : Session
+        The database session.
+    runs : Select
+        The (filtered) output of ``select_runs``.
+    group_by : list[GroupBy]
+        The grouping columns.
+    bins : int, optional
+        The number of histogram bins, by default 10. All groups share the same
+        bin edges, spanning the whole selection, so they can be compared.
+
+    Returns
+    -------
+    tuple[list[float], list[ThroughputGroup]]
+        The ``bins + 1`` histogram edges, and the groups by descending run
+        count.
+    """
+    subquery = runs.subquery("runs")
+    keys = [subquery.c[field] for field in group_by]
+
+    stats = db.execute(
+        select(
+            *keys,
+            func.count().label("runs"),
+            func.avg(subquery.c.sypd).label("mean"),
+            func.stddev_samp(subquery.c.sypd).label("stddev"),
+            func.min(subquery.c.sypd).label("min"),
+            func.max(subquery.c.sypd).label("max"),
+            func.percentile_cont(array(PERCENTILES))
+            .within_group(subquery.c.sypd)
+            .label("percentiles"),
+        )
+        .group_by(*keys)
+        .order_by(func.count().desc(), *keys)
+    ).all()
+    if not stats:
+        return [], []
+
+    low = min(row.min for row in stats)
+    high = max(row.max for row in stats)
+    width = (high - low) / bins or 1.0
+    edges = [low + i * width for i in range(bins + 1)]
+
+    # width_bucket puts the maximum in bucket bins + 1; fold it into the last.
+    bucket = func.least(
+        func.width_bucket(subquery.c.sypd, low, low + bins * width, bins), bins
+    ).label("bucket")
+    counts: dict[tuple, list[int]] = {}
+    for *key, index, count in db.execute(
+        select(*keys, bucket, func.count()).group_by(*keys, bucket)
+    ):
+        counts.setdefault(tuple(key), [0] * bins)[index - 1] = count
+
+    groups = []
+    for row in stats:
+        key = tuple(row[: len(keys)])
+        groups.append(
+            ThroughputGroup(
+                key=dict(zip(group_by, key, strict=True)),
+                runs=row.runs,
+                mean=row.mean,
+                stddev=row.stddev,
+                min=row.min,
+                max=row.max,
+                percentiles={
+                    f"p{round(q * 100)}": value
+                    for q, value in zip(PERCENTILES, row.percentiles, strict=True)
+                },
+                histogram=counts[key],
+            )
+        )
+
+    return edges, groups
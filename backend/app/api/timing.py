@@ -0,0 +1,139 @@
+"""Comparison of component costs from ingested CIME timing files.
+
+A component's cost is the pe-hours it spends per simulated year,
+``comp_pes * seconds_per_mday * 365 / 3600`` (E3SM runs on a no-leap
+calendar), and its share is its seconds per model day over the whole
+model's. Both are averaged over the timing files of a simulation or of all
+simulations on a machine, in two grouped queries.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Literal
+from uuid import UUID
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import Session
+
+from app.db.machine import Machine
+from app.db.simulation import Simulation
+from app.db.timing import TimingComponent, TimingRun
+
+CostGroupBy = Literal["simulation", "machine"]
+
+_DAYS_PER_YEAR = 365
+_SECONDS_PER_HOUR = 3600
+
+
+@dataclass
+class ComponentCost:
+    component: str
+    runs: int
+    pes: float | None
+    seconds_per_mday: float | None
+    myears_per_wday: float | None
+    cost: float | None
+    share: float | None
+
+
+@dataclass
+class ComponentCostGroup:
+    id: UUID
+    name: str
+    runs: int
+    model_cost: float | None
+    model_throughput: float | None
+    components: list[ComponentCost] = field(default_factory=list)
+
+
+def component_costs(
+    db: Session, selection: Select, group_by: CostGroupBy = "simulation"
+) -> list[ComponentCostGroup]:
+    """Average the timing files of the selected simulations per group.
+
+    Parameters
+    ----------
+    db : Session
+        The database session.
+    selection : Select
+        A filtered select over ``Simulation``; only its WHERE clause is used.
+    group_by : {"simulation", "machine"}, optional
+        Whether to compare simulations or the machines they ran on, by default
+        "simulation".
+
+    Returns
+    -------
+    list[ComponentCostGroup]
+        The groups with at least one timing file, by name, each with its
+        components by descending cost.
+    """
+    if group_by == "simulation":
+        key, name = Simulation.id, Simulation.name
+    else:
+        key, name = Machine.id, Machine.name
+
+    def timed(*columns) -> Select:
+        stmt = (
+            select(key, *columns)
+            .select_from(TimingRun)
+            .join(Simulation, Simulation.id == TimingRun.simulation_id)
+            .join(Machine, Machine.id == Simulation.machine_id)
+        )
+        if selection.whereclause is not None:
+            stmt = stmt.where(selection.whereclause)
+
+        return stmt
+
+    groups = {
+        row.id: ComponentCostGroup(
+            id=row.id,
+            name=row.name,
+            runs=row.runs,
+            model_cost=row.model_cost,
+            model_throughput=row.model_throughput,
+        )
+        for row in db.execute(
+            timed(
+                name.label("name"),
+                func.count().label("runs"),
+                func.avg(TimingRun.model_cost).label("model_cost"),
+                func.avg(TimingRun.model_throughput).label("model_throughput"),
+            )
+            .group_by(key, name)
+            .order_by(name)
+        )
+    }
+
+    cost = func.avg(
+        TimingComponent.comp_pes
+        * TimingComponent.seconds_per_mday
+        * _DAYS_PER_YEAR
+        / _SECONDS_PER_HOUR
+    )
+    rows = db.execute(
+        timed(
+            TimingComponent.component,
+            func.count(),
+            func.avg(TimingComponent.comp_pes),
+            func.avg(TimingComponent.seconds_per_mday),
+            func.avg(TimingComponent.myears_per_wday),
+            cost,
+            func.avg(
+                TimingComponent.seconds_per_mday
+                / func.nullif(TimingRun.seconds_per_mday, 0)
+            ),
+        )
+        .join(TimingComponent, TimingComponent.timing_run_id == TimingRun.id)
+        .group_by(key, TimingComponent.component)
+        .order_by(cost.desc().nulls_last(), TimingComponent.component)
+    )
+    for group_id, component, runs, *means in rows:
+        groups[group_id].components.append(
+            ComponentCost(component, runs, *map(_float, means))
+        )
+
+    return list(groups.values())
+
+
+def _float(value: Any) -> float | None:
+    # avg() returns numeric (a Decimal) over integers.
+    return float(value) if value is not None else None
@@ -0,0 +1,254 @@
+"""Per-field variance of a selection of simulations, computed column-wise.
+
+The selected rows are fetched once with every ``Simulation`` column and every
+top-level ``extra`` key as a column; a key whose JSON values are all numbers
+(``jsonb_typeof``) is read as a float column, any other key as JSON text. Each
+column is then dictionary-encoded with ``np.unique`` into integer codes, so
+distinct counts and histograms are ``bincount``-style operations and the
+outlier tests are vectorized over all runs, instead of a Python loop over
+fields and rows.
+
+A run is an outlier in a field when:
+
+- the field is numeric and the run's value is more than
+  ``ROBUST_Z_THRESHOLD`` median absolute deviations from the median, or
+- otherwise, a majority of runs share one value and the run's value is held
+  by at most ``outlier_fraction`` of the runs (NULL counts as a value).
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from sqlalchemy import Float, Select, Text, cast, func, select, true
+from sqlalchemy.orm import Session
+
+from app.db.simulation import Simulation
+from app.schemas.utils import to_camel_case
+
+# Columns that identify or index a run rather than describe its configuration.
+_SKIPPED_COLUMNS = {"id", "search_vector", "extra"}
+
+# Modified z-score (Iglewicz and Hoaglin) above which a numeric value is an
+# outlier.
+ROBUST_Z_THRESHOLD = 3.5
+_MAD_SCALE = 0.6745
+
+# Upper bound on the ``extra`` keys read as columns.
+MAX_EXTRA_KEYS = 500
+
+
+@dataclass(frozen=True)
+class FieldVariance:
+    """How much one field varies across the selected runs."""
+
+    field: str
+    distinct: int
+    nulls: int
+    histogram: list[tuple[str | None, int]]
+    other: int
+    outliers: list[str]
+    outlier_count: int
+
+
+def load_columns(
+    db: Session, stmt: Select, limit: int
+) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """Fetch the selected simulations as columns.
+
+    Parameters
+    ----------
+    db : Session
+        The database session.
+    stmt : Select
+        A filtered select over ``Simulation``; only its WHERE clause is used.
+    limit : int
+        The most rows fetched.
+
+    Returns
+    -------
+    tuple[np.ndarray, dict[str, np.ndarray]]
+        The simulation IDs, and an object array per field: camelCase column
+        names, then ``extra.<key>`` with the key's number if every value of
+        the key is a number, and its JSON text otherwise (NULL if absent).
+    """
+    where = stmt.whereclause
+    entries = func.jsonb_each(Simulation.extra).table_valued("key", "value")
+    keys_stmt = (
+        select(
+            entries.c.key,
+            func.bool_and(
+                func.jsonb_typeof(entries.c.value).in_(["number", "null"])
+            ).label("numeric"),
+        )
+        .select_from(Simulation)
+        .join(entries, true())
+        .group_by(entries.c.key)
+        .order_by(entries.c.key)
+        .limit(MAX_EXTRA_KEYS)
+    )
+    if where is not None:
+        keys_stmt = keys_stmt.where(where)
+    keys = db.execute(keys_stmt).all()
+
+    columns = [
+        column
+        for column in Simulation.__table__.columns
+        if column.name not in _SKIPPED_COLUMNS
+    ]
+    fields = [to_camel_case(column.name) for column in columns] + [
+        f"extra.{key}" for key, _ in keys
+    ]
+
+    rows_stmt = select(
+        Simulation.id,
+        *columns,
+        *(
+            cast(Simulation.extra[key].astext, Float)
+            if numeric
+            else cast(Simulation.extra[key], Text)
+            for key, numeric in keys
+        ),
+    )
+    if where is not None:
+        rows_stmt = rows_stmt.where(where)
+    rows = db.execute(rows_stmt.order_by(Simulation.id).limit(limit)).all()
+
+    ids, *values = _transpose(rows, len(fields) + 1)
+
+    return ids.astype(str), dict(zip(fields, values, strict=True))
+
+
+def variance_matrix(
+    ids: np.ndarray,
+    columns: dict[str, np.ndarray],
+    bins: int = 10,
+    outlier_fraction: float = 0.05,
+    max_outliers: int = 50,
+) -> list[FieldVariance]:
+    """Summarize the variation of every column across runs.
+
+    Parameters
+    ----------
+    ids : np.ndarray
+        The ``(n,)`` run IDs, aligned with the columns.
+    columns : dict[str, np.ndarray]
+        ``(n,)`` object arrays of values per field; None is NULL.
+    bins : int, optional
+        The most common values listed per field, by default 10.
+    outlier_fraction : float, optional
+        The largest share of runs a value may have to be an outlier in a
+        field with a majority value, by default 0.05.
+    max_outliers : int, optional
+        The most outlier IDs listed per field, by default 50.
+
+    Returns
+    -------
+    list[FieldVariance]
+        One summary per field, in the order of ``columns``.
+    """
+    n = len(ids)
+    if n == 0:
+        return [FieldVariance(field, 0, 0, [], 0, [], 0) for field in columns]
+
+    fields = list(columns)
+    # codes[:, j] indexes labels[j], whose last entry stands for NULL.
+    codes = np.empty((n, len(fields)), dtype=np.int64)
+    labels: list[list[str | None]] = []
+    counts: list[np.ndarray] = []
+    numeric = np.zeros(len(fields), dtype=bool)
+    for j, field in enumerate(fields):
+        numeric[j] = _is_numeric(columns[field])
+        codes[:, j], field_labels, field_counts = _factorize(columns[field], numeric[j])
+        labels.append(field_labels)
+        counts.append(field_counts)
+
+    # Number of runs sharing each run's value, field by field.
+    shared = np.stack([counts[j][codes[:, j]] for j in range(len(fields))], axis=1)
+    majority = np.asarray([c.max() for c in counts]) * 2 > n
+    outliers = (shared <= outlier_fraction * n) & majority
+
+    for j in np.flatnonzero(numeric):
+        robust = _robust_outliers(columns[fields[j]])
+        if robust is not None:
+            outliers[:, j] = robust
+
+    summaries = []
+    for j, field in enumerate(fields):
+        order = np.argsort(-counts[j], kind="stable")
+        top = order[:bins]
+        rows = np.flatnonzero(outliers[:, j])
+        summaries.append(
+            FieldVariance(
+                field=field,
+                distinct=int((counts[j] > 0).sum()),
+                nulls=int(counts[j][-1]),
+                histogram=[
+                    (labels[j][k], int(counts[j][k])) for k in top if counts[j][k]
+                ],
+                other=int(n - counts[j][top].sum()),
+                outliers=ids[rows[:max_outliers]].tolist(),
+                outlier_count=len(rows),
+            )
+        )
+
+    return summaries
+
+
+def _transpose(rows: list[Any], width: int) -> list[np.ndarray]:
+    """Turn result rows into one object array per column."""
+    arrays = [np.empty(len(rows), dtype=object) for _ in range(width)]
+    for array, values in zip(arrays, zip(*rows, strict=True), strict=False):
+        array[:] = values
+
+    return arrays
+
+
+def _factorize(
+    values: np.ndarray, numeric: bool
+) -> tuple[np.ndarray, list[str | None], np.ndarray]:
+    """Encode values as codes into their distinct values plus NULL.
+
+    Returns the codes, the labels as strings (the last one None) and the count
+    of each. Numbers are compared as floats and everything else by its string
+    form, which avoids formatting every float.
+    """
+    null = np.equal(values, None)
+    present = values[~null]
+    labels, inverse, counts = np.unique(
+        present.astype(np.float64) if numeric else present.astype(str),
+        return_inverse=True,
+        return_counts=True,
+    )
+
+    codes = np.full(len(values), len(labels), dtype=np.int64)
+    codes[~null] = inverse
+
+    return (
+        codes,
+        [*(str(label) for label in labels.tolist()), None],
+        np.append(counts, null.sum()),
+    )
+
+
+def _is_numeric(values: np.ndarray) -> bool:
+    """Whether every non-NULL value of a column is an int or a float."""
+    present = values[~np.equal(values, None)]
+    types = set(np.frompyfunc(type, 1, 1)(present).tolist())
+
+    return len(present) > 0 and types <= {int, float}
+
+
+def _robust_outliers(values: np.ndarray) -> np.ndarray | None:
+    """Flag values far from the median in MADs, or None if the MAD is 0."""
+    present = ~np.equal(values, None)
+    x = values[present].astype(np.float64)
+    median = np.median(x)
+    mad = np.median(np.abs(x - median))
+    if mad == 0:
+        return None
+
+    outliers = np.zeros(len(values), dtype=bool)
+    outliers[present] = np.abs(_MAD_SCALE * (x - median) / mad) > ROBUST_Z_THRESHOLD
+
+    return outliers
@@ -0,0 +1,74 @@
+"""A small, thread-safe in-process cache with LRU eviction and optional TTL."""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded key/value cache shared by the threads of a single worker.
+
+    Entries are evicted least-recently-used first once ``maxsize`` is reached,
+    and are treated as missing once they are older than ``ttl`` seconds.
+
+    Parameters
+    ----------
+    maxsize : int
+        The maximum number of entries to keep.
+    ttl : float | None, optional
+        The time-to-live of an entry in seconds, by default None (no expiry).
+    """
+
+    def __init__(self, maxsize: int, ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | None:
+        """Return the cached value for ``key``, or None if missing or expired."""
+        with self._lock:
+            item = self._data.get(key)
+
+            if item is None:
+                return None
+
+            stored_at, value = item
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+
+                return None
+
+            self._data.move_to_end(key)
+
+            return value
+
+    def set(self, key: K, value: V) -> None:
+        """Store ``value`` under ``key``, evicting the oldest entry if full."""
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        """Remove ``key`` and return its value, or None if it was not cached."""
+        with self._lock:
+            item = self._data.pop(key, None)
+
+        return item[1] if item is not None else None
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,159 @@
+"""Parsing of CIME compset long names and grid aliases into their components.
+
+E3SM cases are configured through CIME, which names a compset by its
+components in a fixed order::
+
+    TIME_ATM[%opt]_LND[%opt]_ICE[%opt]_OCN[%opt]_ROF[%opt]_GLC[%opt]_WAV[%opt]
+
+e.g. ``2000_EAM%CMIP6_ELM%SPBC_MPASSI_MPASO_MOSART_SGLC_SWAV``, and a grid
+either by a short alias of ``atm[_lnd]_ocn`` grids (``ne30pg2_r05_IcoswISC30E3r5``)
+or by its long form (``a%ne30np4.pg2_l%r05_oi%IcoswISC30E3r5_r%r05_...``).
+
+The results are stored on ``Simulation`` as plain, indexed columns so that
+questions such as "every run with MPAS-Ocean" are equality lookups.
+"""
+
+import re
+from dataclasses import asdict, dataclass
+
+# A component model name, e.g. "EAM" or "MPASSI", before its "%" options.
+_MODEL = re.compile(r"^[A-Z][A-Z0-9]*$")
+_TIME = re.compile(r"^[0-9A-Z]+$")
+_GRID = re.compile(r"^[A-Za-z0-9.]+$")
+# A component of a long grid name, e.g. "_oi%IcoswISC30E3r5".
+_GRID_PART = re.compile(r"(?:^|_)(a|l|oi|o|i|r|g|w|z|m)%")
+
+# Placeholder CIME uses for components without a grid.
+_NULL_GRID = "null"
+
+
+@dataclass(frozen=True)
+class CompsetComponents:
+    """The time period and component models of a compset long name."""
+
+    compset_time: str | None = None
+    atm_component: str | None = None
+    lnd_component: str | None = None
+    ice_component: str | None = None
+    ocn_component: str | None = None
+    rof_component: str | None = None
+    glc_component: str | None = None
+    wav_component: str | None = None
+
+
+@dataclass(frozen=True)
+class GridComponents:
+    """The atmosphere, land and ocean/sea-ice grids of a grid name."""
+
+    atm_grid: str | None = None
+    lnd_grid: str | None = None
+    ocn_grid: str | None = None
+
+
+def parse_compset(long_name: str | None) -> CompsetComponents | None:
+    """Split a compset long name into its time period and component models.
+
+    Component options (``%CMIP6``) are dropped, and components after the
+    wave model (e.g. ``_SESP`` or ``_BGC%BDRD``) are ignored.
+
+    Parameters
+    ----------
+    long_name : str | None
+        The compset, e.g. ``"1850_EAM%CMIP6_ELM%SPBC_MPASSI_MPASO_MOSART_SGLC_SWAV"``.
+
+    Returns
+    -------
+    CompsetComponents | None
+        The components, or None if ``long_name`` is not a long name (for
+        example an alias such as ``"WCYCL1850"``).
+
+    Examples
+    --------
+    >>> parse_compset("2000_EAM%CMIP6_ELM%SPBC_MPASSI_MPASO_MOSART_SGLC_SWAV").ocn_component
+    'MPASO'
+    """
+    if not long_name:
+        return None
+
+    time, *parts = long_name.strip().split("_")
+    models = [part.split("%", 1)[0] for part in parts]
+    if (
+        len(models) < 7
+        or not _TIME.match(time)
+        or not all(_MODEL.match(model) for model in models)
+    ):
+        return None
+
+    return CompsetComponents(time, *models[:7])
+
+
+def parse_grid(name: str | None) -> GridComponents | None:
+    """Split a grid alias or long grid name into its component grids.
+
+    A short alias lists the atmosphere, land and ocean grids; with only two
+    grids, the land runs on the atmosphere grid as in CIME. A fourth grid
+    (the land-ice grid) is ignored.
+
+    Parameters
+    ----------
+    name : str | None
+        The grid, e.g. ``"ne30pg2_r05_IcoswISC30E3r5"`` or
+        ``"a%ne30np4.pg2_l%r05_oi%IcoswISC30E3r5_r%r05_g%null_..."``.
+
+    Returns
+    -------
+    GridComponents | None
+        The component grids, or None if ``name`` cannot be parsed.
+    """
+    if not name:
+        return None
+
+    name = name.strip()
+    if "%" in name:
+        return _parse_long_grid(name)
+
+    grids = name.split("_")
+    if len(grids) > 4 or not all(_GRID.match(grid) for grid in grids):
+        return None
+    if len(grids) == 1:
+        return GridComponents(atm_grid=grids[0])
+    if len(grids) == 2:
+        return GridComponents(atm_grid=grids[0], lnd_grid=grids[0], ocn_grid=grids[1])
+
+    return GridComponents(*grids[:3])
+
+
+def component_columns(
+    compset: str | None, compset_alias: str | None, grid_name: str | None
+) -> dict[str, str | None]:
+    """Return the ``Simulation`` component columns for a compset and grid.
+
+    The compset long name is looked up in ``compset`` first and then in
+    ``compset_alias``, since catalogs disagree on which column holds it.
+    Columns of a part that cannot be parsed are None.
+    """
+    parsed = parse_compset(compset) or parse_compset(compset_alias)
+
+    return asdict(parsed or CompsetComponents()) | asdict(
+        parse_grid(grid_name) or GridComponents()
+    )
+
+
+def _parse_long_grid(name: str) -> GridComponents | None:
+    # re.split alternates between the text before the first key, then the
+    # keys and their values.
+    _, *pairs = _GRID_PART.split(name)
+    grids = {key: value for key, value in zip(pairs[::2], pairs[1::2], strict=True)}
+    if not grids or not all(_GRID.match(value) for value in grids.values()):
+        return None
+
+    def grid(*keys: str) -> str | None:
+        for key in keys:
+            if grids.get(key) not in (None, _NULL_GRID):
+                return grids[key]
+
+        return None
+
+    return GridComponents(
+        atm_grid=grid("a"), lnd_grid=grid("l"), ocn_grid=grid("oi", "o")
+    )
@@ -0,0 +1,188 @@
+"""Parsing of the summary of CIME timing files (``timing/e3sm_timing.*``).
+
+At the end of a run, CIME writes ``<model>_timing.<case>.<lid>`` (gzipped once
+archived). Its summary part gives the case, the PE layout of every component,
+the overall cost and throughput, and the run time of every component::
+
+      component       comp_pes    root_pe   tasks  x threads instances (stride)
+      atm = eam        5400        0        5400   x 1       1      (1     )
+      ...
+        Model Cost:             766.32   pe-hrs/simulated_year
+        Model Throughput:       209.19   simulated_years/day
+      ...
+        ATM Run Time:     280.123 seconds        0.767 seconds/mday       308.44 myears/wday
+
+It is followed by the per-timer breakdown, which can run to megabytes and is
+not read: the file is streamed line by line and parsing stops there.
+"""
+
+import gzip
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+_NUMBER = r"([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?|nan|inf)"
+
+_HEADER = re.compile(r"^\s*(Case|LID|Machine|Curr Date|run length)\s*:\s*(.*?)\s*$")
+_LAYOUT = re.compile(
+    r"^\s*([a-z]+)\s*=\s*(\S+)\s+(\d+)\s+(\d+)\s+(\d+)\s+x\s+(\d+)\s+(\d+)"
+    r"\s+\(\s*(\d+)\s*\)"
+)
+_METRICS = {
+    "total_pes": re.compile(r"^\s*total pes active\s*:\s*(\d+)"),
+    "pes_per_node": re.compile(r"^\s*mpi tasks per node\s*:\s*(\d+)"),
+    "model_cost": re.compile(rf"^\s*Model Cost:\s*{_NUMBER}"),
+    "model_throughput": re.compile(rf"^\s*Model Throughput:\s*{_NUMBER}"),
+    "init_seconds": re.compile(rf"^\s*Init Time\s*:\s*{_NUMBER}"),
+    "run_seconds": re.compile(rf"^\s*Run Time\s*:\s*{_NUMBER}"),
+    "final_seconds": re.compile(rf"^\s*Final Time\s*:\s*{_NUMBER}"),
+}
+_RUN_TIME = re.compile(
+    rf"^\s*([A-Z]+) Run Time:\s*{_NUMBER} seconds\s+{_NUMBER} seconds/mday"
+    rf"\s+{_NUMBER} myears/wday"
+)
+_INTEGER_METRICS = {"total_pes", "pes_per_node"}
+# Start of the per-timer breakdown that follows the summary.
+_END = re.compile(r"TIMING FLOWCHART")
+# e.g. "Fri Jan  1 12:00:00 2021", once runs of spaces are collapsed. CIME
+# writes no time zone; the date is stored as UTC.
+_DATE_FORMAT = "%a %b %d %H:%M:%S %Y"
+
+
+@dataclass
+class ComponentTiming:
+    """The PE layout and run time of one component."""
+
+    model: str | None = None
+    comp_pes: int | None = None
+    root_pe: int | None = None
+    tasks: int | None = None
+    threads: int | None = None
+    instances: int | None = None
+    stride: int | None = None
+    run_seconds: float | None = None
+    seconds_per_mday: float | None = None
+    myears_per_wday: float | None = None
+
+
+@dataclass
+class TimingSummary:
+    """The summary of one timing file."""
+
+    case: str | None = None
+    lid: str | None = None
+    machine: str | None = None
+    run_date: datetime | None = None
+    run_length_days: float | None = None
+    total_pes: int | None = None
+    pes_per_node: int | None = None
+    # pe-hours per simulated year.
+    model_cost: float | None = None
+    # Simulated years per wall-clock day.
+    model_throughput: float | None = None
+    init_seconds: float | None = None
+    run_seconds: float | None = None
+    seconds_per_mday: float | None = None
+    final_seconds: float | None = None
+    # Keyed by lowercase component, e.g. "atm" or "cpl".
+    components: dict[str, ComponentTiming] = field(default_factory=dict)
+
+
+def read_lines(path: str | Path) -> Iterator[str]:
+    """Stream the lines of a timing file, gunzipping it if needed."""
+    path = Path(path)
+    opener = gzip.open if path.suffix == ".gz" else open
+
+    with opener(path, "rt", errors="replace") as f:
+        yield from f
+
+
+def parse_timing(lines: Iterable[str]) -> TimingSummary:
+    """Parse the summary of a timing file.
+
+    Parameters
+    ----------
+    lines : Iterable[str]
+        The lines of the file, e.g. from ``read_lines``. Consumption stops at
+        the end of the summary.
+
+    Returns
+    -------
+    TimingSummary
+        The parsed values; those missing from the file are None.
+
+    Raises
+    ------
+    ValueError
+        If the lines hold neither a model cost nor a component run time, i.e.
+        are not a timing summary.
+    """
+    summary = TimingSummary()
+
+    for line in lines:
+        if _END.search(line):
+            break
+
+        if match := _RUN_TIME.match(line):
+            key, seconds, per_mday, per_wday = match.groups()
+            if key == "TOT":
+                summary.seconds_per_mday = float(per_mday)
+            else:
+                component = summary.components.setdefault(
+                    key.lower(), ComponentTiming()
+                )
+                component.run_seconds = float(seconds)
+                component.seconds_per_mday = float(per_mday)
+                component.myears_per_wday = float(per_wday)
+            continue
+
+        if match := _LAYOUT.match(line):
+            key, model, *numbers = match.groups()
+            component = summary.components.setdefault(key, ComponentTiming())
+            component.model = model
+            (
+                component.comp_pes,
+                component.root_pe,
+                component.tasks,
+                component.threads,
+                component.instances,
+                component.stride,
+            ) = map(int, numbers)
+            continue
+
+        if match := _HEADER.match(line):
+            _set_header(summary, *match.groups())
+            continue
+
+        for name, pattern in _METRICS.items():
+            if (match := pattern.match(line)) and getattr(summary, name) is None:
+                cast = int if name in _INTEGER_METRICS else float
+                setattr(summary, name, cast(match.group(1)))
+                break
+
+    if summary.model_cost is None and not any(
+        c.seconds_per_mday is not None for c in summary.components.values()
+    ):
+        raise ValueError("Not a timing summary: no model cost or run times found.")
+
+    return summary
+
+
+def _set_header(summary: TimingSummary, key: str, value: str) -> None:
+    if key == "Case":
+        summary.case = value
+    elif key == "LID":
+        summary.lid = value
+    elif key == "Machine":
+        summary.machine = value
+    elif key == "Curr Date":
+        try:
+            summary.run_date = datetime.strptime(
+                " ".join(value.split()), _DATE_FORMAT
+            ).replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+    elif key == "run length" and (match := re.match(_NUMBER, value)):
+        summary.run_length_days = float(match.group(1))
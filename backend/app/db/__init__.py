@@ -1,8 +1,12 @@
+from app.db.ai_job import AIJob
 from app.db.artifact import Artifact
+from app.db.cluster import Cluster, ClusterAssignment
+from app.db.lineage import SimulationLineage
 from app.db.link import ExternalLink
 from app.db.machine import Machine
 from app.db.simulation import Simulation
 from app.db.status import Status
+from app.db.timing import TimingComponent, TimingRun
 from app.db.variable import SimulationVariable, Variable
 
 __all__ = [
@@ -13,4 +17,10 @@ __all__ = [
     "Artifact",
     "ExternalLink",
     "Simulation",
+    "AIJob",
+    "Cluster",
+    "ClusterAssignment",
+    "SimulationLineage",
+    "TimingRun",
+    "TimingComponent",
 ]
@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.db.mixins import IDMixin, TimestampMixin
+
+
+class AIJob(Base, IDMixin, TimestampMixin):
+    __tablename__ = "ai_jobs"
+
+    # queued, running, succeeded, failed
+    status: Mapped[str] = mapped_column(String(20), default="queued", index=True)
+    # SHA-256 of the canonical request, used to deduplicate in-flight jobs.
+    request_hash: Mapped[str] = mapped_column(String(64), index=True)
+    request: Mapped[dict] = mapped_column(JSONB)
+
+    # Latest reduction step ({"level", "chunk", "total"}) while running.
+    progress: Mapped[dict | None] = mapped_column(JSONB)
+
+    # Results
+    summary: Mapped[str | None] = mapped_column(Text)
+    mode: Mapped[str | None] = mapped_column(String(20))
+    error: Mapped[str | None] = mapped_column(Text)
+
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from sqlalchemy import Float, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY, REAL, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.db.mixins import TimestampMixin
+
+
+class Cluster(Base, TimestampMixin):
+    """A family of similar simulations found by ``app/ai/clustering.py``."""
+
+    __tablename__ = "clusters"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # Human-readable summary of the members, e.g. "WCYCL1850 · ne30pg2_r05_...".
+    label: Mapped[str] = mapped_column(String(300))
+    size: Mapped[int] = mapped_column(Integer, default=0)
+    # Mean feature vector of the members, used to place new simulations.
+    centroid: Mapped[list[float]] = mapped_column(ARRAY(REAL), deferred=True)
+
+
+class ClusterAssignment(Base):
+    """The cluster of one simulation.
+
+    Kept out of ``simulations`` so that (re)clustering does not bump
+    ``Simulation.updated_at`` and trigger re-embedding.
+    """
+
+    __tablename__ = "cluster_assignments"
+
+    simulation_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("simulations.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    cluster_id: Mapped[int] = mapped_column(
+        ForeignKey("clusters.id", ondelete="CASCADE")
+    )
+    # Euclidean distance from the simulation's features to the centroid.
+    distance: Mapped[float] = mapped_column(Float)
+
+    __table_args__ = (
+        # Members of a cluster are listed closest to the centroid first.
+        Index("ix_cluster_assignments_cluster_id_distance", "cluster_id", "distance"),
+    )
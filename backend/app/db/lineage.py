@@ -0,0 +1,37 @@
+from uuid import UUID
+
+from sqlalchemy import ForeignKey, Index, Integer
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class SimulationLineage(Base):
+    """Closure table of ``Simulation.parent_simulation_id``.
+
+    Holds one row per (ancestor, descendant) pair at any distance, so the
+    whole ancestry or subtree of a run is a single index range scan. Rows are
+    maintained by the ``simulations_lineage`` trigger on insert and on
+    re-parenting (see the migration that adds this table), never by the ORM.
+    """
+
+    __tablename__ = "simulation_lineage"
+
+    ancestor_id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("simulations.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    descendant_id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("simulations.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # Number of parent links between the two; 1 for a direct child.
+    depth: Mapped[int] = mapped_column(Integer)
+
+    __table_args__ = (
+        # The primary key serves descendant lookups; this serves ancestors.
+        Index("ix_simulation_lineage_descendant_id_depth", "descendant_id", "depth"),
+    )
@@ -19,3 +19,7 @@ class Machine(Base, IDMixin, TimestampMixin):
     simulations: Mapped[list[Simulation]] = relationship(
         back_populates="machine", cascade="all,save-update"
     )
+
+    # The gin_trgm_ops index on name is migration-only: revision a6fa8dcef095
+    # creates it when pg_trgm is available, and /simulations/suggest falls back
+    # to ILIKE otherwise.
@@ -0,0 +1,28 @@
+"""The ``simulation_rollups`` materialized view.
+
+It holds one row per campaign (``dimension = 'campaign'``) and per group
+(``dimension = 'group'``) with the aggregates dashboards show, and is created
+by a migration rather than from ``Base.metadata``. The view is refreshed
+concurrently after writes by ``app/api/rollups.py``, so it is declared here as
+a lightweight, read-only ``table`` that autogenerate does not see.
+"""
+
+from sqlalchemy import BigInteger, DateTime, Float, Integer, String, column, table
+from sqlalchemy.dialects.postgresql import JSONB
+
+simulation_rollups = table(
+    "simulation_rollups",
+    column("dimension", String),
+    column("key", String),
+    column("simulations", Integer),
+    column("total_years", Float),
+    column("first_model_start_date", DateTime(timezone=True)),
+    column("last_simulation_end_date", DateTime(timezone=True)),
+    column("first_run_start_date", DateTime(timezone=True)),
+    column("last_run_end_date", DateTime(timezone=True)),
+    column("artifacts", BigInteger),
+    column("artifact_bytes", BigInteger),
+    # {status: count} and {machine name: count}.
+    column("status_counts", JSONB),
+    column("machine_counts", JSONB),
+)
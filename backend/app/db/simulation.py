@@ -3,10 +3,20 @@ from __future__ import annotations
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, Float, ForeignKey, String, Text, UniqueConstraint
-from sqlalchemy.dialects.postgresql import JSONB, UUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    Computed,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
+from app.core.cime import component_columns
 from app.db.base import Base
 from app.db.mixins import IDMixin, TimestampMixin
 
@@ -16,6 +26,23 @@ if TYPE_CHECKING:
     from app.db.machine import Machine
     from app.db.variable import Variable
 
+# Text search configuration of ``Simulation.search_vector`` and its queries.
+SEARCH_CONFIG = "english"
+
+
+def _search_text(column: str) -> str:
+    # The parser reads dotted names such as "v3.LR.historical_0101" as a single
+    # host token, so the name is indexed again with its separators as spaces.
+    return f"coalesce({column}, '') || ' ' || translate(coalesce({column}, ''), '._-', '   ')"
+
+
+SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', {_search_text('name')}), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', {_search_text('case_name')}), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(notes_markdown, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(known_issues, '')), 'B')"
+)
+
 
 class Simulation(Base, IDMixin, TimestampMixin):
     __tablename__ = "simulations"
@@ -37,11 +64,26 @@ class Simulation(Base, IDMixin, TimestampMixin):
     )
     model_start_date: Mapped[datetime] = mapped_column(DateTime(timezone=True))
 
+    # Components parsed from the compset long name and grid (see app/core/cime.py);
+    # set whenever those columns are. The glc and wav components are stubs in
+    # almost every E3SM compset, so they are not indexed.
+    compset_time: Mapped[str | None] = mapped_column(String(50), index=True)
+    atm_component: Mapped[str | None] = mapped_column(String(50), index=True)
+    lnd_component: Mapped[str | None] = mapped_column(String(50), index=True)
+    ice_component: Mapped[str | None] = mapped_column(String(50), index=True)
+    ocn_component: Mapped[str | None] = mapped_column(String(50), index=True)
+    rof_component: Mapped[str | None] = mapped_column(String(50), index=True)
+    glc_component: Mapped[str | None] = mapped_column(String(50))
+    wav_component: Mapped[str | None] = mapped_column(String(50))
+    atm_grid: Mapped[str | None] = mapped_column(String(100), index=True)
+    lnd_grid: Mapped[str | None] = mapped_column(String(100), index=True)
+    ocn_grid: Mapped[str | None] = mapped_column(String(100), index=True)
+
     # Optional context / provenance
     version_tag: Mapped[str | None] = mapped_column(String(100))
     git_hash: Mapped[str | None] = mapped_column(String(64), index=True)
     parent_simulation_id: Mapped[UUID | None] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("simulations.id")
+        UUID(as_uuid=True), ForeignKey("simulations.id"), index=True
     )
     campaign_id: Mapped[str | None] = mapped_column(String(100))
     experiment_type_id: Mapped[str | None] = mapped_column(String(100))
@@ -64,6 +106,13 @@ class Simulation(Base, IDMixin, TimestampMixin):
     notes_markdown: Mapped[str | None] = mapped_column(Text)
     known_issues: Mapped[str | None] = mapped_column(Text)
 
+    # Full-text search document, maintained by Postgres. Names rank above notes.
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+        deferred=True,
+    )
+
     # Provenance & audit (explicit, optional; we still keep created_at/updated_at)
     uploaded_by: Mapped[str | None] = mapped_column(String(100))
     upload_date: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
@@ -89,6 +138,31 @@ class Simulation(Base, IDMixin, TimestampMixin):
         back_populates="simulation", cascade="all, delete-orphan"
     )
 
+    @validates("compset", "compset_alias", "grid_name")
+    def _parse_components(self, key: str, value: str) -> str:
+        names = {
+            "compset": self.compset,
+            "compset_alias": self.compset_alias,
+            "grid_name": self.grid_name,
+        }
+        names[key] = value
+
+        for column, component in component_columns(**names).items():
+            setattr(self, column, component)
+
+        return value
+
     __table_args__ = (
         UniqueConstraint("name", "version_tag", name="uq_simulation_name_version"),
+        Index("ix_simulations_search_vector", "search_vector", postgresql_using="gin"),
+        # Containment (@>) and jsonpath (@?, @@) queries over the extension bucket.
+        Index(
+            "ix_simulations_extra",
+            "extra",
+            postgresql_using="gin",
+            postgresql_ops={"extra": "jsonb_path_ops"},
+        ),
+        # The gin_trgm_ops indexes on name and case_name are migration-only:
+        # revision a6fa8dcef095 creates them when pg_trgm is available, and
+        # /simulations/suggest falls back to ILIKE otherwise.
     )
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import (
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import REAL
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.db.base import Base
+from app.db.mixins import TimestampMixin
+
+
+class TimingRun(Base, TimestampMixin):
+    """The summary of one CIME timing file of a simulation (see app/core/timing.py)."""
+
+    __tablename__ = "timing_runs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    simulation_id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("simulations.id", ondelete="CASCADE"),
+    )
+    # The job's log ID, e.g. "123456.210101-120000"; one file per job.
+    lid: Mapped[str] = mapped_column(String(100))
+    # The machine as reported in the file.
+    machine: Mapped[str | None] = mapped_column(String(100))
+    run_date: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    run_length_days: Mapped[float | None] = mapped_column(Float)
+    total_pes: Mapped[int | None] = mapped_column(Integer)
+    pes_per_node: Mapped[int | None] = mapped_column(Integer)
+    # pe-hours per simulated year, and simulated years per wall-clock day.
+    model_cost: Mapped[float | None] = mapped_column(Float)
+    model_throughput: Mapped[float | None] = mapped_column(Float)
+    init_seconds: Mapped[float | None] = mapped_column(Float)
+    run_seconds: Mapped[float | None] = mapped_column(Float)
+    seconds_per_mday: Mapped[float | None] = mapped_column(Float)
+    final_seconds: Mapped[float | None] = mapped_column(Float)
+
+    components: Mapped[list[TimingComponent]] = relationship(
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        order_by="TimingComponent.component",
+    )
+
+    # Also serves lookups by simulation_id.
+    __table_args__ = (UniqueConstraint("simulation_id", "lid"),)
+
+
+class TimingComponent(Base):
+    """The PE layout and run time of one component in a timing file."""
+
+    __tablename__ = "timing_components"
+
+    timing_run_id: Mapped[int] = mapped_column(
+        ForeignKey("timing_runs.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Lowercase component class, e.g. "atm", "ocn" or "cpl".
+    component: Mapped[str] = mapped_column(String(8), primary_key=True)
+    # The component model, e.g. "eam" or "mpaso".
+    model: Mapped[str | None] = mapped_column(String(32))
+    comp_pes: Mapped[int | None] = mapped_column(Integer)
+    root_pe: Mapped[int | None] = mapped_column(Integer)
+    tasks: Mapped[int | None] = mapped_column(Integer)
+    threads: Mapped[int | None] = mapped_column(Integer)
+    instances: Mapped[int | None] = mapped_column(Integer)
+    stride: Mapped[int | None] = mapped_column(Integer)
+    run_seconds: Mapped[float | None] = mapped_column(REAL)
+    seconds_per_mday: Mapped[float | None] = mapped_column(REAL)
+    myears_per_wday: Mapped[float | None] = mapped_column(REAL)
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -29,3 +29,14 @@ class SimulationVariable(Base):
     variable_name: Mapped[str] = mapped_column(
         ForeignKey("variables.name"), primary_key=True
     )
+
+    __table_args__ = (
+        # The primary key leads with simulation_id; lookups by variable need
+        # their own index. Including simulation_id makes "which simulations
+        # provide these variables" an index-only scan.
+        Index(
+            "ix_simulation_variables_variable_name_simulation_id",
+            "variable_name",
+            "simulation_id",
+        ),
+    )
@@ -0,0 +1,159 @@
+"""Ingestion of CIME timing files into ``timing_runs`` and ``timing_components``.
+
+Each ``timing/e3sm_timing.<case>.<lid>[.gz]`` file is streamed from disk and
+parsed by ``app/core/timing.py``, then stored against the simulation whose
+case name it reports (or the one given). Re-ingesting a file replaces the
+stored copy, so a case directory can be ingested again after new jobs ran.
+
+Usage
+-----
+Ingest every timing file below one or more case or archive directories::
+
+    poetry run python -m app.ingest.timing PATH [PATH ...] [--simulation ID]
+"""
+
+import argparse
+import zlib
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict
+from pathlib import Path
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app._logger import _setup_custom_logger
+from app.core.timing import parse_timing, read_lines
+from app.db.simulation import Simulation
+from app.db.timing import TimingComponent, TimingRun
+
+logger = _setup_custom_logger(__name__)
+
+# Timing files written by CIME for E3SM, gzipped or not.
+TIMING_GLOB = "e3sm_timing.*"
+
+
+def find_timing_files(paths: Iterable[str | Path]) -> Iterator[Path]:
+    """Yield the given files and the timing files below the given directories."""
+    for path in map(Path, paths):
+        if path.is_dir():
+            yield from sorted(path.rglob(TIMING_GLOB))
+        else:
+            yield path
+
+
+def ingest_timing_file(
+    db: Session, path: str | Path, simulation_id: UUID | None = None
+) -> TimingRun | None:
+    """Parse a timing file and store it, replacing an earlier copy.
+
+    Parameters
+    ----------
+    db : Session
+        The database session; the caller commits.
+    path : str | Path
+        The timing file, plain or gzipped.
+    simulation_id : UUID | None, optional
+        The simulation the file belongs to, by default the one whose case name
+        is the file's ``Case``.
+
+    Returns
+    -------
+    TimingRun | None
+        The stored run, or None if no simulation matches the file's case.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a timing summary.
+    """
+    path = Path(path)
+    summary = parse_timing(read_lines(path))
+
+    if simulation_id is None:
+        simulation_id = db.scalar(
+            select(Simulation.id).where(Simulation.case_name == summary.case)
+        )
+        if simulation_id is None:
+            logger.warning(f"No simulation with case name {summary.case!r}: {path}")
+
+            return None
+
+    # Files without a LID line are told apart by their name.
+    lid = summary.lid or path.name.removesuffix(".gz")
+    db.execute(
+        delete(TimingRun).where(
+            TimingRun.simulation_id == simulation_id, TimingRun.lid == lid
+        )
+    )
+
+    fields = asdict(summary)
+    del fields["case"], fields["lid"], fields["components"]
+    run = TimingRun(
+        simulation_id=simulation_id,
+        lid=lid,
+        **fields,
+        components=[
+            TimingComponent(component=component, **asdict(timing))
+            for component, timing in summary.components.items()
+        ],
+    )
+    db.add(run)
+    db.flush()
+
+    return run
+
+
+def ingest_timing_files(
+    db: Session, paths: Iterable[str | Path], simulation_id: UUID | None = None
+) -> int:
+    """Ingest every timing file found under ``paths`` and commit.
+
+    Files that cannot be read, parsed (including truncated gzip files) or
+    stored (e.g. a value too long for its column), or that match no
+    simulation, are logged and skipped. Each file is written in its own
+    savepoint, so a bad file does not discard the others.
+
+    Returns
+    -------
+    int
+        The number of files stored.
+    """
+    stored = 0
+    for path in find_timing_files(paths):
+        try:
+            with db.begin_nested():
+                run = ingest_timing_file(db, path, simulation_id)
+        except (OSError, ValueError, EOFError, zlib.error, SQLAlchemyError) as e:
+            logger.warning(f"Skipped {path}: {e}")
+            continue
+
+        stored += run is not None
+
+    db.commit()
+    logger.info(f"Ingested {stored} timing files.")
+
+    return stored
+
+
+def main() -> None:
+    from app.db.session import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Ingest CIME timing files.")
+    parser.add_argument(
+        "paths", nargs="+", help="Timing files, or directories to search."
+    )
+    parser.add_argument(
+        "--simulation",
+        type=UUID,
+        help="Store every file against this simulation instead of by case name.",
+    )
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        ingest_timing_files(db, args.paths, args.simulation)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,40 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app._logger import _setup_root_logger
-from app.api.routers import ai, machine, simulation
+from app.api.facets import warm_facet_index
+from app.api.rollups import rollup_refresher
+from app.api.routers import (
+    ai,
+    analytics,
+    cluster,
+    machine,
+    search,
+    simulation,
+    variable,
+)
 from app.core.config import settings
 from app.exceptions import register_exception_handlers
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.facet_index:
+        warm_facet_index()
+    if settings.rollup_refresh:
+        rollup_refresher.start()
+
+    yield
+
+    rollup_refresher.stop()
+
+
 def create_app() -> FastAPI:
     _setup_root_logger()
 
-    app = FastAPI(title="EarthFrame API")
+    app = FastAPI(title="EarthFrame API", lifespan=lifespan)
 
     # Register custom exception handlers that map SQLAlchemy errors to HTTP
     # responses.
@@ -29,6 +53,10 @@ def create_app() -> FastAPI:
     app.include_router(ai.router)
     app.include_router(simulation.router)
     app.include_router(machine.router)
+    app.include_router(search.router)
+    app.include_router(variable.router)
+    app.include_router(cluster.router)
+    app.include_router(analytics.router)
 
     return app
 
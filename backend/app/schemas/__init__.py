@@ -1,15 +1,91 @@
+from app.schemas.ai import AIJobOut, AnalyzeSimulationsRequest
+from app.schemas.analytics import (
+    RollupOut,
+    ThroughputGroupOut,
+    ThroughputOut,
+    ThroughputRunOut,
+)
 from app.schemas.artifact import ArtifactIn, ArtifactOut
+from app.schemas.cluster import ClusterMember, ClusterOut
 from app.schemas.link import ExternalLinkIn, ExternalLinkOut
-from app.schemas.machine import MachineCreate, MachineOut
-from app.schemas.simulation import SimulationCreate, SimulationOut
+from app.schemas.machine import MachineCreate, MachineOut, MachineStatsOut
+from app.schemas.search import (
+    SemanticSearchHit,
+    SimilarSimulation,
+    Suggestion,
+    TextSearchHit,
+    TextSearchPage,
+)
+from app.schemas.simulation import (
+    CollectionDiff,
+    ExtraKeyOut,
+    FacetQueryOut,
+    FieldVarianceOut,
+    LineageNode,
+    SimulationCompareRequest,
+    SimulationComparison,
+    SimulationCreate,
+    SimulationFilter,
+    SimulationOut,
+    ValueCount,
+    VarianceMatrixOut,
+)
+from app.schemas.timing import (
+    ComponentCostGroupOut,
+    ComponentCostOut,
+    TimingComponentOut,
+    TimingRunOut,
+)
+from app.schemas.variable import (
+    VariableAttachmentOut,
+    VariableAttachmentRequest,
+    VariableIn,
+    VariableMatrixOut,
+    VariableMatrixRequest,
+    VariableOut,
+)
 
 __all__ = [
     "MachineCreate",
     "MachineOut",
+    "MachineStatsOut",
     "ArtifactIn",
     "ArtifactOut",
     "ExternalLinkIn",
     "ExternalLinkOut",
     "SimulationCreate",
     "SimulationOut",
+    "SimulationFilter",
+    "ExtraKeyOut",
+    "FacetQueryOut",
+    "LineageNode",
+    "SimulationCompareRequest",
+    "SimulationComparison",
+    "CollectionDiff",
+    "ValueCount",
+    "FieldVarianceOut",
+    "VarianceMatrixOut",
+    "VariableIn",
+    "VariableOut",
+    "VariableAttachmentRequest",
+    "VariableAttachmentOut",
+    "VariableMatrixRequest",
+    "VariableMatrixOut",
+    "AnalyzeSimulationsRequest",
+    "AIJobOut",
+    "SemanticSearchHit",
+    "SimilarSimulation",
+    "Suggestion",
+    "TextSearchHit",
+    "TextSearchPage",
+    "ClusterMember",
+    "ClusterOut",
+    "ThroughputRunOut",
+    "ThroughputGroupOut",
+    "ThroughputOut",
+    "RollupOut",
+    "TimingRunOut",
+    "TimingComponentOut",
+    "ComponentCostOut",
+    "ComponentCostGroupOut",
 ]
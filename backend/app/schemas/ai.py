@@ -0,0 +1,50 @@
+from datetime import datetime
+from typing import Literal
+from uuid import UUID
+
+from pydantic import model_validator
+
+from app.schemas.base import CamelInModel, CamelOutModel
+from app.schemas.simulation import SimulationFilter
+
+# "abstractive" generates a summary with the model (quality); "extractive"
+# selects the most central sentences from the metadata and notes (fast).
+AnalysisMode = Literal["abstractive", "extractive"]
+
+
+class AnalyzeSimulationsRequest(CamelInModel):
+    """Selects the simulations to analyze, either by ID or by catalog filter."""
+
+    simulation_ids: list[UUID] | None = None
+    filters: SimulationFilter | None = None
+    mode: AnalysisMode = "abstractive"
+
+    @model_validator(mode="after")
+    def _check_selection(self) -> "AnalyzeSimulationsRequest":
+        if (self.simulation_ids is None) == (self.filters is None):
+            raise ValueError("Provide exactly one of `simulationIds` or `filters`.")
+        if self.simulation_ids is not None and not self.simulation_ids:
+            raise ValueError("`simulationIds` must not be empty.")
+
+        return self
+
+
+class AIJobProgress(CamelOutModel):
+    """The latest intermediate summary step of a running job."""
+
+    level: int
+    chunk: int
+    total: int
+
+
+class AIJobOut(CamelOutModel):
+    id: UUID
+    status: Literal["queued", "running", "succeeded", "failed"]
+    progress: AIJobProgress | None = None
+    summary: str | None = None
+    mode: AnalysisMode | None = None
+    error: str | None = None
+    created_at: datetime
+    updated_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
@@ -0,0 +1,62 @@
+from datetime import datetime
+from uuid import UUID
+
+from app.schemas.base import CamelOutModel
+
+
+class ThroughputRunOut(CamelOutModel):
+    """The throughput of one run, ranked within its group."""
+
+    id: UUID
+    name: str
+    group: dict[str, str | None]
+    total_years: float
+    run_start_date: datetime
+    run_end_date: datetime
+    # Simulated years per wall-clock day.
+    sypd: float
+    # Share of the group's runs that are slower (0 for the slowest).
+    percentile: float
+    # SYPD over the group's mean SYPD.
+    relative_to_mean: float
+
+
+class ThroughputGroupOut(CamelOutModel):
+    """The SYPD distribution of the runs sharing one group key."""
+
+    group: dict[str, str | None]
+    runs: int
+    mean: float
+    # None for a group of a single run.
+    stddev: float | None
+    min: float
+    max: float
+    # Keyed "p5", "p10", ..., "p95".
+    percentiles: dict[str, float]
+    # Run counts per bin of ``ThroughputOut.bin_edges``.
+    histogram: list[int]
+
+
+class ThroughputOut(CamelOutModel):
+    group_by: list[str]
+    # The bins + 1 SYPD edges shared by every group's histogram.
+    bin_edges: list[float]
+    groups: list[ThroughputGroupOut]
+
+
+class RollupOut(CamelOutModel):
+    """Aggregates over the simulations of one campaign or group."""
+
+    # The campaign ID or group name.
+    key: str
+    simulations: int
+    status_counts: dict[str, int]
+    total_years: float
+    first_model_start_date: datetime | None = None
+    last_simulation_end_date: datetime | None = None
+    first_run_start_date: datetime | None = None
+    last_run_end_date: datetime | None = None
+    # Simulations per machine name.
+    machine_counts: dict[str, int]
+    artifacts: int
+    artifact_bytes: int
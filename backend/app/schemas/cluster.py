@@ -0,0 +1,21 @@
+from uuid import UUID
+
+from pydantic import Field
+
+from app.schemas.base import CamelOutModel
+
+
+class ClusterMember(CamelOutModel):
+    id: UUID
+    name: str
+    # Distance from the simulation's features to the cluster centroid.
+    distance: float
+
+
+class ClusterOut(CamelOutModel):
+    """A family of similar simulations and its most central members."""
+
+    id: int
+    label: str
+    size: int
+    members: list[ClusterMember] = Field(default_factory=list)
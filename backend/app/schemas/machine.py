@@ -23,3 +23,19 @@ class MachineOut(CamelOutModel):
     created_at: datetime
     updated_at: datetime
     notes: str | None = None
+
+
+class MachineStatsOut(CamelOutModel):
+    """How a machine is used across the catalog."""
+
+    machine_id: UUID
+    name: str
+    simulations: int
+    status_counts: dict[str, int]
+    total_years: float
+    # The simulation that ran most recently (by run start date, or catalog
+    # date if unknown), and that date.
+    latest_simulation_id: UUID | None = None
+    latest_simulation_name: str | None = None
+    latest_run_date: datetime | None = None
+    compilers: list[str]
@@ -0,0 +1,67 @@
+from typing import Literal
+from uuid import UUID
+
+from app.schemas.base import CamelOutModel
+
+
+class SemanticSearchHit(CamelOutModel):
+    id: UUID
+    name: str
+    case_name: str
+    compset: str
+    grid_name: str
+    # Cosine similarity between the query and the simulation's description.
+    score: float
+
+
+class SimilarityFieldScore(CamelOutModel):
+    # "compset", "grid_name", "machine_id", "version_tag" or "notes".
+    field: str
+    # The candidate's value of a structural field (None for "notes" or NULL).
+    value: str | None
+    # Whether a structural field equals the query's (None for "notes").
+    match: bool | None
+    # 1/0 for structural fields, cosine similarity of the TF-IDF vectors of
+    # the notes for "notes".
+    similarity: float
+    weight: float
+    contribution: float
+
+
+class SimilarSimulation(CamelOutModel):
+    id: UUID
+    name: str
+    case_name: str
+    compset: str
+    grid_name: str
+    # Sum of the field contributions.
+    score: float
+    explanation: list[SimilarityFieldScore]
+
+
+class TextSearchHit(CamelOutModel):
+    id: UUID
+    name: str
+    case_name: str
+    compset: str
+    grid_name: str
+    # ts_rank_cd of the match; names weigh more than notes.
+    rank: float
+    # Excerpt of the notes and known issues with matches wrapped in <mark>.
+    snippet: str | None
+
+
+class TextSearchPage(CamelOutModel):
+    items: list[TextSearchHit]
+    # Pass as ``cursor`` to fetch the next page; None on the last page.
+    next_cursor: str | None
+
+
+class Suggestion(CamelOutModel):
+    # "simulation" (a simulation name), "case" (a case name) or "machine".
+    kind: Literal["simulation", "case", "machine"]
+    # The ID of the simulation or machine.
+    id: UUID
+    value: str
+    # Trigram word similarity to the query, from 0 to 1.
+    score: float
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Any
 from uuid import UUID
 
 from pydantic import Field
@@ -87,8 +88,140 @@ class SimulationOut(CamelOutModel):
     last_edited_at: datetime | None = None
     extra: dict = {}
 
+    # Components parsed from the compset long name and grid name.
+    compset_time: str | None = None
+    atm_component: str | None = None
+    lnd_component: str | None = None
+    ice_component: str | None = None
+    ocn_component: str | None = None
+    rof_component: str | None = None
+    glc_component: str | None = None
+    wav_component: str | None = None
+    atm_grid: str | None = None
+    lnd_grid: str | None = None
+    ocn_grid: str | None = None
+
     created_at: datetime
     updated_at: datetime
 
     artifacts: list[ArtifactOut] = Field(default_factory=list)
     links: list[ExternalLinkOut] = Field(default_factory=list)
+
+
+class SimulationFilter(CamelInModel):
+    """Exact-match filters over the catalog; unset fields are ignored."""
+
+    campaign_id: str | None = None
+    experiment_type_id: str | None = None
+    group_name: str | None = None
+    version_tag: str | None = None
+    machine_id: UUID | None = None
+    status: str | None = None
+    compset: str | None = None
+    grid_resolution: str | None = None
+    simulation_type: str | None = None
+    compset_time: str | None = None
+    atm_component: str | None = None
+    lnd_component: str | None = None
+    ice_component: str | None = None
+    ocn_component: str | None = None
+    rof_component: str | None = None
+    glc_component: str | None = None
+    wav_component: str | None = None
+    atm_grid: str | None = None
+    lnd_grid: str | None = None
+    ocn_grid: str | None = None
+
+
+class ExtraKeyOut(CamelOutModel):
+    """Usage of one key of the ``extra`` bucket across the catalog."""
+
+    # Dotted path of the key, usable as an ``extra.<key>`` filter.
+    key: str
+    # Number of simulations that have the key.
+    simulations: int
+    # Number of distinct values of the key.
+    distinct_values: int
+    # JSON types of the values, e.g. ["number", "string"].
+    types: list[str]
+
+
+class FacetQueryOut(CamelOutModel):
+    """The simulations matching a facet selection, with counts per value."""
+
+    total: int
+    ids: list[UUID]
+    # Per facet (camelCase column name), the number of simulations with each
+    # value under the selections of the other facets.
+    facets: dict[str, dict[str, int]]
+
+
+class LineageNode(CamelOutModel):
+    """An ancestor or descendant of a simulation."""
+
+    id: UUID
+    name: str
+    case_name: str
+    status: str
+    parent_simulation_id: UUID | None = None
+    # Parent links between this simulation and the one queried; 1 for a
+    # parent or child.
+    depth: int
+
+
+class SimulationCompareRequest(CamelInModel):
+    simulation_ids: list[UUID] = Field(min_length=2)
+
+
+class CollectionDiff(CamelOutModel):
+    """Artifacts or links of one kind that not every simulation has."""
+
+    kind: str
+    # Number of items (by URI) that every simulation has.
+    common: int
+    # The other items, by the IDs of the simulations that have any.
+    only: dict[UUID, list[str]]
+
+
+class SimulationComparison(CamelOutModel):
+    """A field-level diff of N simulations.
+
+    Per-run values are only listed for fields that differ, in the order of
+    ``simulation_ids``. Keys of ``extra`` are compared one by one as
+    ``extra.<dotted path>`` fields.
+    """
+
+    simulation_ids: list[UUID]
+    # camelCase field name -> the value every simulation has.
+    identical: dict[str, Any]
+    # camelCase field name -> the value of each simulation.
+    differing: dict[str, list[Any]]
+    artifacts: list[CollectionDiff]
+    links: list[CollectionDiff]
+
+
+class ValueCount(CamelOutModel):
+    # The value as a string (JSON text for ``extra`` keys); null for NULL.
+    value: str | None
+    count: int
+
+
+class FieldVarianceOut(CamelOutModel):
+    """How one field varies across a selection of simulations."""
+
+    # camelCase column name, or ``extra.<key>`` for a top-level extra key.
+    field: str
+    distinct: int
+    nulls: int
+    # The most common values, most common first.
+    histogram: list[ValueCount]
+    # Number of simulations whose value is not in the histogram.
+    other: int
+    # IDs of outlier simulations, capped; ``outlier_count`` has the total.
+    outliers: list[UUID]
+    outlier_count: int
+
+
+class VarianceMatrixOut(CamelOutModel):
+    total: int
+    fields: list[FieldVarianceOut]
@@ -0,0 +1,67 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import Field
+
+from app.schemas.base import CamelOutModel
+
+
+class TimingComponentOut(CamelOutModel):
+    component: str
+    model: str | None = None
+    comp_pes: int | None = None
+    root_pe: int | None = None
+    tasks: int | None = None
+    threads: int | None = None
+    instances: int | None = None
+    stride: int | None = None
+    run_seconds: float | None = None
+    seconds_per_mday: float | None = None
+    myears_per_wday: float | None = None
+
+
+class TimingRunOut(CamelOutModel):
+    """The summary of one timing file of a simulation."""
+
+    id: int
+    lid: str
+    machine: str | None = None
+    run_date: datetime | None = None
+    run_length_days: float | None = None
+    total_pes: int | None = None
+    pes_per_node: int | None = None
+    # pe-hours per simulated year.
+    model_cost: float | None = None
+    # Simulated years per wall-clock day.
+    model_throughput: float | None = None
+    init_seconds: float | None = None
+    run_seconds: float | None = None
+    seconds_per_mday: float | None = None
+    final_seconds: float | None = None
+    components: list[TimingComponentOut] = Field(default_factory=list)
+
+
+class ComponentCostOut(CamelOutModel):
+    """The mean cost of one component over the timing files of a group."""
+
+    component: str
+    runs: int
+    pes: float | None = None
+    seconds_per_mday: float | None = None
+    myears_per_wday: float | None = None
+    # pe-hours per simulated year spent in the component.
+    cost: float | None = None
+    # Share of the model's run time per model day spent in the component.
+    share: float | None = None
+
+
+class ComponentCostGroupOut(CamelOutModel):
+    """The component costs of one simulation or machine."""
+
+    id: UUID
+    name: str
+    # Number of timing files.
+    runs: int
+    model_cost: float | None = None
+    model_throughput: float | None = None
+    components: list[ComponentCostOut] = Field(default_factory=list)
@@ -0,0 +1,55 @@
+from typing import Annotated
+from uuid import UUID
+
+from pydantic import Field
+
+from app.schemas.base import CamelInModel, CamelOutModel
+
+# An output variable name such as "TS" or "PRECT".
+VariableName = Annotated[str, Field(min_length=1, max_length=100)]
+
+
+class VariableIn(CamelInModel):
+    name: VariableName
+    description: str | None = Field(default=None, max_length=300)
+
+
+class VariableOut(CamelOutModel):
+    name: str
+    description: str | None = None
+    # Number of simulations that provide the variable.
+    simulation_count: int
+
+
+class SimulationVariablesIn(CamelInModel):
+    """The output variables of one simulation."""
+
+    simulation_id: UUID
+    variables: list[VariableName] = Field(min_length=1)
+
+
+class VariableAttachmentRequest(CamelInModel):
+    """(simulation, variable) pairs to attach or detach in one request."""
+
+    items: list[SimulationVariablesIn] = Field(min_length=1)
+
+
+class VariableAttachmentOut(CamelOutModel):
+    # Number of (simulation, variable) pairs actually added or removed.
+    changed: int
+
+
+class VariableMatrixRequest(CamelInModel):
+    simulation_ids: list[UUID] = Field(min_length=1)
+    # The columns of the matrix; by default every variable of the selection.
+    variables: list[VariableName] | None = None
+
+
+class VariableMatrixOut(CamelOutModel):
+    simulation_ids: list[UUID]
+    variables: list[str]
+    # One string per simulation with one character per variable, "1" if the
+    # simulation provides it and "0" otherwise.
+    matrix: list[str]
+    # The variables provided by every simulation of the selection.
+    common: list[str]
@@ -0,0 +1,60 @@
+"""Benchmark semantic search over a synthetic embedding store on CPU.
+
+Builds a store of random unit-length vectors (no model is loaded), memory-maps
+it the same way the API does and times top-k queries against it.
+
+Usage
+-----
+    poetry run python -m benchmarks.semantic_search --rows 100000 --dim 384
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+from app.ai.embedding_store import EmbeddingStore
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000, help="Stored vectors.")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension.")
+    parser.add_argument("--k", type=int, default=10, help="Results per query.")
+    parser.add_argument("--queries", type=int, default=200, help="Timed queries.")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = _unit(rng.standard_normal((args.rows, args.dim), dtype=np.float32))
+    queries = _unit(rng.standard_normal((args.queries, args.dim), dtype=np.float32))
+    ids = [str(uuid.uuid4()) for _ in range(args.rows)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = EmbeddingStore(directory)
+        store.save(ids, vectors)
+        index = store.index()
+
+        # Warm up so the mapped pages are resident.
+        index.search(queries[0], args.k)
+
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            index.search(query, args.k)
+            latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+    print(f"rows={args.rows} dim={args.dim} k={args.k}")
+    print(f"p50={statistics.median(latencies) * 1e3:.2f} ms")
+    print(f"p95={latencies[int(0.95 * (len(latencies) - 1))] * 1e3:.2f} ms")
+
+
+def _unit(matrix: np.ndarray) -> np.ndarray:
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+if __name__ == "__main__":
+    main()
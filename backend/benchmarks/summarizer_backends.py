@@ -0,0 +1,215 @@
+"""Benchmark the summarizer inference backends on CPU.
+
+Each backend is loaded in a fresh subprocess so its peak memory is measured in
+isolation, then run over a fixed set of E3SM simulation prompts. The first
+backend listed is the reference for ROUGE drift.
+
+Usage
+-----
+    poetry run python -m benchmarks.summarizer_backends \\
+        --backend torch=facebook/bart-large-cnn \\
+        --backend torch-int8=facebook/bart-large-cnn \\
+        --backend onnx=/models/bart-large-cnn-onnx
+
+Reported metrics
+----------------
+- load_s: time to build the pipeline.
+- p50_s / p95_s: per-prompt generation latency.
+- prompts_per_s: throughput over the full prompt set.
+- peak_rss_mb: peak resident memory of the subprocess.
+- rouge1 / rougeL: mean F1 of each summary against the reference backend's.
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import re
+import resource
+import statistics
+import sys
+import time
+from collections import Counter
+
+from app.ai.prompts import compare_prompt
+
+# A fixed set of per-simulation descriptions used as model input.
+DESCRIPTIONS = [
+    "Name: v3.LR.historical_0101, Case Name: v3.LR.historical_0101: Tag: v3.0.0, "
+    "Campaign: v3.LR, Compset: WCYCL20TR, Resolution: ne30pg2_r05_IcoswISC30E3r5, "
+    "Machine: chrysalis, Notes: First historical ensemble member; cold bias over "
+    "the Southern Ocean after year 40.",
+    "Name: v3.LR.historical_0151, Case Name: v3.LR.historical_0151: Tag: v3.0.0, "
+    "Campaign: v3.LR, Compset: WCYCL20TR, Resolution: ne30pg2_r05_IcoswISC30E3r5, "
+    "Machine: chrysalis, Notes: Ensemble member branched from piControl year 151.",
+    "Name: v3.LR.piControl, Case Name: v3.LR.piControl: Tag: v3.0.0, "
+    "Campaign: v3.LR, Compset: WCYCL1850, Resolution: ne30pg2_r05_IcoswISC30E3r5, "
+    "Machine: chrysalis, Notes: 500-year pre-industrial control; stable TOA "
+    "imbalance after spin-up.",
+    "Name: v3.LR.amip_0101, Case Name: v3.LR.amip_0101: Tag: v3.0.1, "
+    "Campaign: v3.LR, Compset: F20TR, Resolution: ne30pg2_r05, Machine: pm-cpu, "
+    "Notes: AMIP run with prescribed SST; restart failed once at year 1998.",
+    "Name: v2.1.HR.piControl, Case Name: v2.1.HR.piControl: Tag: v2.1.0, "
+    "Campaign: v2.1.HR, Compset: WCYCL1950, Resolution: ne120pg2_r025_RRSwISC6to18E3r5, "
+    "Machine: frontier, Notes: High-resolution control; ocean spun up from v2.1 "
+    "LR state.",
+    "Name: v3.LR.abrupt-4xCO2_0101, Case Name: v3.LR.abrupt-4xCO2_0101: Tag: v3.0.0, "
+    "Campaign: v3.LR, Compset: WCYCL1850-4xCO2, Resolution: ne30pg2_r05_IcoswISC30E3r5, "
+    "Machine: chrysalis, Notes: Abrupt quadrupling of CO2 for ECS estimation.",
+]
+
+# Prompts of increasing size, all within BART's 1024-token input window.
+PROMPTS = [compare_prompt(DESCRIPTIONS[:n]) for n in (1, 3, 6)] + [
+    compare_prompt(DESCRIPTIONS[i : i + 2]) for i in (0, 2, 4)
+]
+
+GENERATE_KWARGS = {"max_length": 300, "min_length": 100, "do_sample": False}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--backend",
+        action="append",
+        required=True,
+        metavar="BACKEND=MODEL",
+        help="A backend and its model ID or directory; repeat to compare.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Passes over the prompt set."
+    )
+    parser.add_argument(
+        "--threads", type=int, default=None, help="torch intra-op threads."
+    )
+    parser.add_argument("--json", help="Also write the results to this file.")
+    args = parser.parse_args()
+
+    specs = [tuple(spec.split("=", 1)) for spec in args.backend]
+
+    # Use "spawn" so every backend starts from an empty process.
+    ctx = mp.get_context("spawn")
+    runs = []
+    for backend, model in specs:
+        with ctx.Pool(1) as pool:
+            runs.append(
+                pool.apply(_run_backend, (backend, model, args.repeat, args.threads))
+            )
+
+    reference = runs[0]["summaries"]
+    for run in runs:
+        rouge1 = [_rouge_n(ref, out) for ref, out in zip(reference, run["summaries"])]
+        rougel = [_rouge_l(ref, out) for ref, out in zip(reference, run["summaries"])]
+        run["rouge1"] = statistics.fmean(rouge1)
+        run["rougeL"] = statistics.fmean(rougel)
+
+    _print_table(runs)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(runs, f, indent=2)
+
+
+def _run_backend(backend: str, model: str, repeat: int, threads: int | None) -> dict:
+    """Load one backend and time it over the prompt set (runs in a subprocess)."""
+    import torch
+
+    from app.ai.summarizer import build_summarizer
+
+    if threads is not None:
+        torch.set_num_threads(threads)
+
+    start = time.perf_counter()
+    summarizer = build_summarizer(backend, model)  # type: ignore[arg-type]
+    load_s = time.perf_counter() - start
+
+    # Warm up so one-time graph and allocator costs are not timed.
+    summarizer(PROMPTS[0], **GENERATE_KWARGS)
+
+    latencies = []
+    summaries = []
+    for _ in range(repeat):
+        summaries = []
+        for prompt in PROMPTS:
+            start = time.perf_counter()
+            result = summarizer(prompt, **GENERATE_KWARGS)
+            latencies.append(time.perf_counter() - start)
+            summaries.append(result[0]["summary_text"])
+
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS.
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss_mb = peak_rss / (1024**2 if sys.platform == "darwin" else 1024)
+
+    return {
+        "backend": backend,
+        "model": model,
+        "load_s": load_s,
+        "p50_s": statistics.median(latencies),
+        "p95_s": _percentile(latencies, 0.95),
+        "prompts_per_s": len(latencies) / sum(latencies),
+        "peak_rss_mb": peak_rss_mb,
+        "summaries": summaries,
+    }
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+
+    return ordered[min(len(ordered) - 1, round(q * (len(ordered) - 1)))]
+
+
+def _tokens(text: str) -> list[str]:
+    return re.findall(r"\w+", text.lower())
+
+
+def _f1(overlap: int, n_ref: int, n_out: int) -> float:
+    if overlap == 0:
+        return 0.0
+
+    precision, recall = overlap / n_out, overlap / n_ref
+
+    return 2 * precision * recall / (precision + recall)
+
+
+def _rouge_n(reference: str, output: str) -> float:
+    """ROUGE-1 F1 between two texts."""
+    ref, out = Counter(_tokens(reference)), Counter(_tokens(output))
+
+    return _f1(sum((ref & out).values()), sum(ref.values()), sum(out.values()))
+
+
+def _rouge_l(reference: str, output: str) -> float:
+    """ROUGE-L F1 (longest common subsequence) between two texts."""
+    ref, out = _tokens(reference), _tokens(output)
+
+    prev = [0] * (len(out) + 1)
+    for r in ref:
+        curr = [0]
+        for j, o in enumerate(out, start=1):
+            curr.append(prev[j - 1] + 1 if r == o else max(prev[j], curr[j - 1]))
+        prev = curr
+
+    return _f1(prev[-1], len(ref), len(out))
+
+
+def _print_table(runs: list[dict]) -> None:
+    columns = [
+        "backend",
+        "load_s",
+        "p50_s",
+        "p95_s",
+        "prompts_per_s",
+        "peak_rss_mb",
+        "rouge1",
+        "rougeL",
+    ]
+    print(" | ".join(f"{c:>13}" for c in columns))
+
+    for run in runs:
+        cells = [
+            f"{run[c]:>13.3f}" if isinstance(run[c], float) else f"{run[c]:>13}"
+            for c in columns
+        ]
+        print(" | ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
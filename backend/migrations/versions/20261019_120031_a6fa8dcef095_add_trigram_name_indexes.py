@@ -0,0 +1,62 @@
+"""add trigram name indexes
+
+Revision ID: a6fa8dcef095
+Revises: 095446e7982f
+Create Date: 2026-10-19 12:00:31.107021
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from app._logger import _setup_custom_logger
+
+logger = _setup_custom_logger(__name__)
+
+# revision identifiers, used by Alembic.
+revision: str = "a6fa8dcef095"
+down_revision: Union[str, Sequence[str], None] = "095446e7982f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, column)
+INDEXES = [
+    ("ix_simulations_name_trgm", "simulations", "name"),
+    ("ix_simulations_case_name_trgm", "simulations", "case_name"),
+    ("ix_machines_name_trgm", "machines", "name"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    available = op.get_bind().scalar(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    )
+    if not available:
+        # Autocomplete falls back to ILIKE matching without the extension.
+        logger.warning(
+            "pg_trgm is not available on this server; skipping trigram indexes."
+        )
+
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for name, table, column in INDEXES:
+        op.create_index(
+            name,
+            table,
+            [column],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The extension is left installed; other objects may depend on it.
+    for name, table, _ in INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,153 @@
+"""add simulation lineage closure
+
+Revision ID: 643fc166aae0
+Revises: 6f823fec20c9
+Create Date: 2026-10-19 12:26:26.205638
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "643fc166aae0"
+down_revision: Union[str, Sequence[str], None] = "6f823fec20c9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keeps simulation_lineage in step with simulations.parent_simulation_id. When
+# a run is inserted or re-parented, the paths from its old ancestors into its
+# subtree are dropped and every (new ancestor, subtree member) pair is added;
+# a parent inside the run's own subtree is rejected as a cycle.
+LINEAGE_FUNCTION = """
+CREATE FUNCTION simulations_lineage() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        IF NEW.parent_simulation_id IS NOT DISTINCT FROM OLD.parent_simulation_id THEN
+            RETURN NULL;
+        END IF;
+
+        DELETE FROM simulation_lineage
+        WHERE descendant_id IN (
+                SELECT NEW.id
+                UNION ALL
+                SELECT descendant_id FROM simulation_lineage WHERE ancestor_id = NEW.id
+            )
+            AND ancestor_id IN (
+                SELECT ancestor_id FROM simulation_lineage WHERE descendant_id = NEW.id
+            );
+    END IF;
+
+    IF NEW.parent_simulation_id IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    IF NEW.parent_simulation_id = NEW.id OR EXISTS (
+        SELECT 1 FROM simulation_lineage
+        WHERE ancestor_id = NEW.id AND descendant_id = NEW.parent_simulation_id
+    ) THEN
+        RAISE EXCEPTION 'simulation % cannot descend from itself', NEW.id
+            USING ERRCODE = 'check_violation';
+    END IF;
+
+    INSERT INTO simulation_lineage (ancestor_id, descendant_id, depth)
+    SELECT a.ancestor_id, s.descendant_id, a.depth + s.depth + 1
+    FROM (
+        SELECT NEW.parent_simulation_id AS ancestor_id, 0 AS depth
+        UNION ALL
+        SELECT ancestor_id, depth FROM simulation_lineage
+        WHERE descendant_id = NEW.parent_simulation_id
+    ) AS a
+    CROSS JOIN (
+        SELECT NEW.id AS descendant_id, 0 AS depth
+        UNION ALL
+        SELECT descendant_id, depth FROM simulation_lineage
+        WHERE ancestor_id = NEW.id
+    ) AS s;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+LINEAGE_TRIGGER = """
+CREATE TRIGGER simulations_lineage
+AFTER INSERT OR UPDATE OF parent_simulation_id ON simulations
+FOR EACH ROW EXECUTE FUNCTION simulations_lineage()
+"""
+
+# Walks every parent chain once; CYCLE stops at a (corrupt) loop.
+BACKFILL = """
+INSERT INTO simulation_lineage (ancestor_id, descendant_id, depth)
+WITH RECURSIVE lineage (ancestor_id, descendant_id, depth) AS (
+    SELECT parent_simulation_id, id, 1
+    FROM simulations
+    WHERE parent_simulation_id IS NOT NULL
+    UNION ALL
+    SELECT s.parent_simulation_id, l.descendant_id, l.depth + 1
+    FROM lineage AS l
+    JOIN simulations AS s ON s.id = l.ancestor_id
+    WHERE s.parent_simulation_id IS NOT NULL
+) CYCLE ancestor_id SET is_cycle USING path
+SELECT ancestor_id, descendant_id, min(depth)
+FROM lineage
+WHERE NOT is_cycle
+GROUP BY ancestor_id, descendant_id
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.create_table(
+        "simulation_lineage",
+        sa.Column("ancestor_id", sa.UUID(), nullable=False),
+        sa.Column("descendant_id", sa.UUID(), nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["ancestor_id"],
+            ["simulations.id"],
+            name=op.f("fk_simulation_lineage_ancestor_id_simulations"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["descendant_id"],
+            ["simulations.id"],
+            name=op.f("fk_simulation_lineage_descendant_id_simulations"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "ancestor_id", "descendant_id", name=op.f("pk_simulation_lineage")
+        ),
+    )
+    op.create_index(
+        op.f("ix_simulations_parent_simulation_id"),
+        "simulations",
+        ["parent_simulation_id"],
+        unique=False,
+    )
+    # ### end Alembic commands ###
+    op.execute(sa.text(BACKFILL))
+    op.create_index(
+        "ix_simulation_lineage_descendant_id_depth",
+        "simulation_lineage",
+        ["descendant_id", "depth"],
+        unique=False,
+    )
+    op.execute(sa.text(LINEAGE_FUNCTION))
+    op.execute(sa.text(LINEAGE_TRIGGER))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.text("DROP TRIGGER simulations_lineage ON simulations"))
+    op.execute(sa.text("DROP FUNCTION simulations_lineage()"))
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_index(op.f("ix_simulations_parent_simulation_id"), table_name="simulations")
+    op.drop_index(
+        "ix_simulation_lineage_descendant_id_depth", table_name="simulation_lineage"
+    )
+    op.drop_table("simulation_lineage")
+    # ### end Alembic commands ###
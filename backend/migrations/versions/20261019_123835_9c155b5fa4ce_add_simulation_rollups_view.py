@@ -0,0 +1,108 @@
+"""add simulation rollups view
+
+Revision ID: 9c155b5fa4ce
+Revises: aa051806744c
+Create Date: 2026-10-19 12:38:35.512306
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9c155b5fa4ce"
+down_revision: Union[str, Sequence[str], None] = "aa051806744c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# One row per campaign and per group (see app/db/rollup.py). Runs without a
+# campaign or group are not rolled up under that dimension.
+ROLLUPS_VIEW = """
+CREATE MATERIALIZED VIEW simulation_rollups AS
+WITH runs AS (
+    SELECT
+        id,
+        campaign_id,
+        group_name,
+        status,
+        machine_id,
+        total_years,
+        model_start_date,
+        simulation_end_date,
+        run_start_date,
+        run_end_date
+    FROM simulations
+),
+keyed AS (
+    SELECT 'campaign'::text AS dimension, campaign_id AS key, runs.*
+    FROM runs
+    WHERE campaign_id IS NOT NULL
+    UNION ALL
+    SELECT 'group'::text, group_name, runs.*
+    FROM runs
+    WHERE group_name IS NOT NULL
+),
+artifact_totals AS (
+    SELECT simulation_id, count(*) AS artifacts, sum(size_bytes) AS artifact_bytes
+    FROM artifacts
+    GROUP BY simulation_id
+),
+totals AS (
+    SELECT
+        k.dimension,
+        k.key,
+        count(*) AS simulations,
+        coalesce(sum(k.total_years), 0) AS total_years,
+        min(k.model_start_date) AS first_model_start_date,
+        max(k.simulation_end_date) AS last_simulation_end_date,
+        min(k.run_start_date) AS first_run_start_date,
+        max(k.run_end_date) AS last_run_end_date,
+        coalesce(sum(a.artifacts), 0)::bigint AS artifacts,
+        coalesce(sum(a.artifact_bytes), 0)::bigint AS artifact_bytes
+    FROM keyed AS k
+    LEFT JOIN artifact_totals AS a ON a.simulation_id = k.id
+    GROUP BY k.dimension, k.key
+),
+statuses AS (
+    SELECT dimension, key, jsonb_object_agg(status, n) AS status_counts
+    FROM (
+        SELECT dimension, key, status, count(*) AS n
+        FROM keyed
+        GROUP BY dimension, key, status
+    ) AS counts
+    GROUP BY dimension, key
+),
+machines AS (
+    SELECT counts.dimension, counts.key, jsonb_object_agg(m.name, n) AS machine_counts
+    FROM (
+        SELECT dimension, key, machine_id, count(*) AS n
+        FROM keyed
+        GROUP BY dimension, key, machine_id
+    ) AS counts
+    JOIN machines AS m ON m.id = counts.machine_id
+    GROUP BY counts.dimension, counts.key
+)
+SELECT totals.*, statuses.status_counts, machines.machine_counts
+FROM totals
+JOIN statuses USING (dimension, key)
+JOIN machines USING (dimension, key)
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.text(ROLLUPS_VIEW))
+    # REFRESH ... CONCURRENTLY needs a unique index over plain columns.
+    op.create_index(
+        "ux_simulation_rollups_dimension_key",
+        "simulation_rollups",
+        ["dimension", "key"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.text("DROP MATERIALIZED VIEW simulation_rollups"))
@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+from app.ai.aggregate import aggregate_lines, aggregate_simulations
+
+
+def _sim(name: str, **fields) -> SimpleNamespace:
+    defaults = {
+        "version_tag": "v3.0.0",
+        "campaign_id": "v3.LR",
+        "compset": "WCYCL1850",
+        "grid_resolution": "ne30pg2",
+        "machine_name": "chrysalis",
+        "notes_markdown": None,
+    }
+
+    return SimpleNamespace(name=name, **{**defaults, **fields})
+
+
+class TestAggregateSimulations:
+    def test_shared_and_varying_fields(self):
+        sims = [
+            _sim("a", compset="WCYCL20TR"),
+            _sim("b", compset="WCYCL1850"),
+            _sim("c", compset="WCYCL20TR", machine_name=None),
+        ]
+
+        aggregate = aggregate_simulations(sims)
+
+        assert aggregate.count == 3
+        assert aggregate.shared == {
+            "Tag": "v3.0.0",
+            "Campaign": "v3.LR",
+            "Resolution": "ne30pg2",
+        }
+        assert aggregate.value_counts == {
+            "Compset": {"WCYCL20TR": 2, "WCYCL1850": 1},
+            "Machine": {"chrysalis": 2, "n/a": 1},
+        }
+
+    def test_configuration_groups_keep_first_appearance_order(self):
+        sims = [
+            _sim("a", compset="Z"),
+            _sim("b", compset="A"),
+            _sim("c", compset="Z"),
+            _sim("d", compset="A"),
+            _sim("e", compset="M"),
+        ]
+
+        aggregate = aggregate_simulations(sims)
+
+        assert [(g.values, g.names) for g in aggregate.configs] == [
+            ({"Compset": "Z"}, ["a", "c"]),
+            ({"Compset": "A"}, ["b", "d"]),
+            ({"Compset": "M"}, ["e"]),
+        ]
+        assert [g.names for g in aggregate.duplicate_configs] == [
+            ["a", "c"],
+            ["b", "d"],
+        ]
+
+    def test_identical_simulations_form_one_group(self):
+        aggregate = aggregate_simulations([_sim("a"), _sim("b")])
+
+        assert aggregate.value_counts == {}
+        assert [g.names for g in aggregate.configs] == [["a", "b"]]
+
+    def test_notes_are_deduplicated_ignoring_whitespace_and_case(self):
+        sims = [
+            _sim("a", notes_markdown="Cold  bias in\nthe Arctic."),
+            _sim("b", notes_markdown="cold bias in the arctic."),
+            _sim("c", notes_markdown="   "),
+            _sim("d", notes_markdown="Restart failed."),
+        ]
+
+        aggregate = aggregate_simulations(sims)
+
+        assert [(n.text, n.names) for n in aggregate.notes] == [
+            ("Cold bias in the Arctic.", ["a", "b"]),
+            ("Restart failed.", ["d"]),
+        ]
+
+
+class TestAggregateLines:
+    def test_renders_compact_difference_table(self):
+        sims = [_sim(f"run{i}", compset="A" if i < 7 else "B") for i in range(8)]
+        sims[0].notes_markdown = "Reference run."
+
+        lines = aggregate_lines(aggregate_simulations(sims))
+
+        assert lines == [
+            "8 simulations. Shared by all: Tag: v3.0.0; Campaign: v3.LR; "
+            "Resolution: ne30pg2; Machine: chrysalis.",
+            "Compset varies: A (7), B (1).",
+            "Runs with Compset: A: run0, run1, run2, run3, run4 and 2 more.",
+            "Runs with Compset: B: run7.",
+            "Notes for run0: Reference run.",
+        ]
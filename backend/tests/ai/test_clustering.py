@@ -0,0 +1,144 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+
+from app.ai.clustering import (
+    FIELD_WEIGHTS,
+    HASH_BUCKETS,
+    TEXT_WEIGHT,
+    align_vectors,
+    assign_new_simulations,
+    build_clusters,
+    featurize,
+    kmeans,
+    refresh_clusters,
+)
+from app.ai.embedding_store import EmbeddingIndex
+from app.db.cluster import Cluster, ClusterAssignment
+from app.db.simulation import Simulation
+
+
+def _compset_index(db) -> EmbeddingIndex:
+    """Embed every simulation as the one-hot vector of its compset."""
+    sims = db.scalars(select(Simulation)).all()
+    compsets = sorted({sim.compset for sim in sims})
+    vectors = np.eye(len(compsets), dtype=np.float32)[
+        [compsets.index(sim.compset) for sim in sims]
+    ]
+
+    return EmbeddingIndex(
+        ids=np.asarray([str(sim.id) for sim in sims]), vectors=vectors
+    )
+
+
+def _assignments(db) -> dict[str, int]:
+    rows = db.execute(
+        select(Simulation.name, ClusterAssignment.cluster_id).join(ClusterAssignment)
+    )
+
+    return {row.name: row.cluster_id for row in rows}
+
+
+class TestFeaturize:
+    def test_weights_text_and_hashed_categorical_blocks(self):
+        index = EmbeddingIndex(
+            ids=np.asarray(["a"], dtype="U36"),
+            vectors=np.asarray([[1.0, 0.0]], dtype=np.float32),
+        )
+        row = SimpleNamespace(
+            id="a",
+            compset="WCYCL1850",
+            grid_name=None,
+            machine_id="m1",
+            version_tag=None,
+        )
+
+        features = featurize([row], index)
+
+        assert set(FIELD_WEIGHTS) == {"machine_id", "version_tag"}
+        assert features.shape == (1, 2 + len(FIELD_WEIGHTS) * HASH_BUCKETS)
+        assert features[0, 0] == pytest.approx(np.sqrt(TEXT_WEIGHT))
+        # A full match on every set field is the sum of their weights; the
+        # compset is part of the embedded text and gets no block of its own.
+        assert (features[0] ** 2).sum() == pytest.approx(
+            TEXT_WEIGHT + FIELD_WEIGHTS["machine_id"]
+        )
+
+    def test_align_vectors_gathers_live_embeddings_by_id(self):
+        index = EmbeddingIndex(
+            ids=np.array(["b", "a", "b"]),
+            vectors=np.array([[0, 1], [1, 0], [0.6, 0.8]], dtype=np.float32),
+            live=np.array([False, True, True]),
+        )
+
+        vectors = align_vectors(np.array(["a", "c", "b"]), index)
+
+        np.testing.assert_allclose(vectors, [[1, 0], [0, 0], [0.6, 0.8]])
+
+
+class TestKMeans:
+    def test_separates_blobs(self):
+        rng = np.random.default_rng(1)
+        centers = np.asarray([[0.0, 0.0], [10.0, 0.0], [0.0, 10.0]])
+        features = np.concatenate([c + rng.normal(size=(200, 2)) for c in centers])
+
+        result = kmeans(features, 3, batch_size=64)
+
+        labels = result.labels.reshape(3, 200)
+        assert all(len(set(row)) == 1 for row in labels.tolist())
+        assert len({row[0] for row in labels.tolist()}) == 3
+        assert result.distances.max() < 5
+
+    def test_caps_k_at_row_count(self):
+        result = kmeans(np.zeros((2, 3)), 5)
+
+        assert result.centroids.shape == (2, 3)
+
+
+class TestClusterCatalog:
+    def test_builds_then_assigns_new_simulations_incrementally(
+        self, db, create_simulations
+    ):
+        cpl = create_simulations(
+            2, compset="WCYCL1850", grid_name="ne30pg2_r05_IcoswISC30E3r5"
+        )
+        atm = create_simulations(
+            2, compset="F2010", grid_name="ne120pg2_r0125_oRRS18to6v3"
+        )
+
+        assert build_clusters(db, _compset_index(db), k=2) == 2
+
+        clusters = _assignments(db)
+        assert clusters[cpl[0].name] == clusters[cpl[1].name] != clusters[atm[0].name]
+        assert clusters[atm[0].name] == clusters[atm[1].name]
+        labels = set(db.scalars(select(Cluster.label)))
+        assert labels == {
+            "WCYCL1850 · ne30pg2_r05_IcoswISC30E3r5",
+            "F2010 · ne120pg2_r0125_oRRS18to6v3",
+        }
+
+        (new,) = create_simulations(
+            1, compset="F2010", grid_name="ne120pg2_r0125_oRRS18to6v3"
+        )
+        result = refresh_clusters(db, _compset_index(db))
+
+        assert (result.clusters, result.assigned, result.rebuilt) == (2, 1, False)
+        clusters = _assignments(db)
+        assert clusters[new.name] == clusters[atm[0].name]
+        assert db.get(Cluster, clusters[new.name]).size == 3
+
+    def test_assign_requires_clusters(self, db):
+        with pytest.raises(ValueError):
+            assign_new_simulations(db, None)
+
+    def test_full_run_replaces_clusters(self, db, create_simulations):
+        create_simulations(2, compset="F2010", grid_name="ne30")
+        build_clusters(db, None, k=1)
+        first = db.scalar(select(Cluster.id))
+
+        result = refresh_clusters(db, None, full=True, k=1)
+
+        assert (result.clusters, result.assigned, result.rebuilt) == (1, 2, True)
+        assert db.get(Cluster, first) is None
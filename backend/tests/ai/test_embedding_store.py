@@ -0,0 +1,141 @@
+import numpy as np
+import pytest
+
+from app.ai.embedding_store import EmbeddingIndex, EmbeddingStore
+
+
+def _unit(rows: list[list[float]]) -> np.ndarray:
+    vectors = np.asarray(rows, dtype=np.float32)
+
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _ids(index: EmbeddingIndex) -> list[str]:
+    return index.ids[index.live].tolist()
+
+
+class TestEmbeddingIndex:
+    def test_search_returns_top_k_by_similarity(self):
+        index = EmbeddingIndex(
+            ids=np.array(["a", "b", "c", "d"]),
+            vectors=_unit([[1, 0], [0, 1], [1, 1], [-1, 0]]),
+        )
+
+        hits = index.search(_unit([[1, 0.1]])[0], k=2)
+
+        assert [sim_id for sim_id, _ in hits] == ["a", "c"]
+        assert hits[0][1] == pytest.approx(0.995, abs=1e-3)
+
+    def test_search_skips_dead_rows(self):
+        index = EmbeddingIndex(
+            ids=np.array(["a", "b", "c"]),
+            vectors=_unit([[1, 0], [0, 1], [1, 1]]),
+            live=np.array([False, True, True]),
+        )
+
+        hits = index.search(_unit([[1, 0]])[0], k=5)
+
+        assert [sim_id for sim_id, _ in hits] == ["c", "b"]
+
+    def test_search_with_k_larger_than_index(self):
+        index = EmbeddingIndex(ids=np.array(["a"]), vectors=_unit([[1, 0]]))
+
+        assert [sim_id for sim_id, _ in index.search(_unit([[0, 1]])[0], 5)] == ["a"]
+
+    def test_search_empty_index(self):
+        index = EmbeddingIndex(
+            ids=np.array([], dtype="U36"), vectors=np.empty((0, 2), np.float32)
+        )
+
+        assert index.search(_unit([[1, 0]])[0], 3) == []
+
+
+class TestEmbeddingStore:
+    def test_index_is_none_before_first_save(self, tmp_path):
+        assert EmbeddingStore(tmp_path).index() is None
+
+    def test_save_then_index_memory_maps_snapshot(self, tmp_path):
+        store = EmbeddingStore(tmp_path)
+        store.save(["a", "b"], _unit([[1, 0], [0, 1]]), watermark="2025-01-01")
+
+        index = store.index()
+
+        assert isinstance(index.vectors, np.memmap)
+        assert index.vectors.dtype == np.float32
+        assert _ids(index) == ["a", "b"]
+        assert store.snapshot().watermark == "2025-01-01"
+        assert store.index() is index
+
+    def test_new_generation_replaces_old_one(self, tmp_path):
+        store = EmbeddingStore(tmp_path)
+        first = store.save(["a"], _unit([[1, 0]]))
+        old_index = store.index()
+
+        second = store.save(["b", "c"], _unit([[0, 1], [1, 1]]))
+
+        assert store.current() == second.name
+        assert _ids(store.index()) == ["b", "c"]
+        assert not (tmp_path / first.generation).exists()
+        # Readers holding the old snapshot keep a consistent view.
+        assert _ids(old_index) == ["a"]
+
+    def test_save_rejects_mismatched_lengths(self, tmp_path):
+        with pytest.raises(ValueError):
+            EmbeddingStore(tmp_path).save(["a", "b"], _unit([[1, 0]]))
+
+    def test_apply_appends_in_place_and_supersedes_old_rows(self, tmp_path):
+        store = EmbeddingStore(tmp_path)
+        first = store.save(["a", "b"], _unit([[1, 0], [0, 1]]))
+        old_index = store.index()
+
+        with store.lock():
+            snapshot = store.apply(
+                ["b", "c"],
+                _unit([[1, 1], [-1, 0]]),
+                np.array([5, 6]),
+                deleted=["a"],
+                watermark="2025-01-02",
+            )
+
+        assert snapshot.generation == first.generation
+        assert (snapshot.rows, snapshot.live_rows) == (4, 2)
+        assert snapshot.watermark == "2025-01-02"
+
+        index = store.index()
+        assert _ids(index) == ["b", "c"]
+        assert index.updated[index.live].tolist() == [5, 6]
+        hits = index.search(_unit([[1, 1]])[0], 1)
+        assert hits[0][0] == "b"
+
+        # The old snapshot still sees exactly its own rows.
+        assert _ids(old_index) == ["a", "b"]
+        assert old_index.vectors.shape == (2, 2)
+
+    def test_apply_compacts_when_generation_is_full(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("app.ai.embedding_store.MIN_SPARE_ROWS", 1)
+        store = EmbeddingStore(tmp_path)
+        first = store.save(["a", "b"], _unit([[1, 0], [0, 1]]))
+
+        with store.lock():
+            store.apply(["a"], _unit([[1, 1]]), np.array([1]))
+            snapshot = store.apply(
+                ["c", "d"], _unit([[1, 0], [0, 1]]), np.array([2, 3])
+            )
+
+        assert snapshot.generation != first.generation
+        assert snapshot.rows == snapshot.live_rows == 4
+        assert sorted(_ids(store.index())) == ["a", "b", "c", "d"]
+
+    def test_compact_drops_dead_rows(self, tmp_path):
+        store = EmbeddingStore(tmp_path)
+        store.save(["a", "b", "c"], _unit([[1, 0], [0, 1], [1, 1]]), watermark="w")
+
+        with store.lock():
+            store.apply([], np.empty((0, 2), np.float32), [], deleted=["b"])
+            assert store.snapshot().dead_ratio == pytest.approx(1 / 3)
+            snapshot = store.compact()
+
+        assert (snapshot.rows, snapshot.live_rows) == (2, 2)
+        assert snapshot.dead_ratio == 0
+        assert snapshot.watermark == "w"
+        assert _ids(store.index()) == ["a", "c"]
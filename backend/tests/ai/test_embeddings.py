@@ -0,0 +1,141 @@
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from app.ai.embedding_store import EmbeddingStore
+from app.ai.embeddings import (
+    build_embeddings,
+    encode,
+    refresh_embeddings,
+    simulation_text,
+)
+from app.core.config import settings
+
+
+def _fake_encode(texts, batch_size):
+    return np.ones((len(texts), 4), dtype=np.float32) / 2
+
+
+@pytest.fixture
+def mock_encoder():
+    with (
+        patch("app.ai.embeddings.encode", side_effect=_fake_encode) as mock_encode,
+        patch("app.ai.embeddings.get_encoder") as mock_get_encoder,
+    ):
+        mock_get_encoder.return_value.get_sentence_embedding_dimension.return_value = 4
+
+        yield mock_encode
+
+
+class TestSimulationText:
+    def test_joins_non_empty_fields(self):
+        sim = SimpleNamespace(
+            name="v3.LR.piControl",
+            compset="WCYCL1850",
+            grid_name="ne30pg2_r05_IcoswISC30E3r5",
+            grid_resolution="",
+            notes_markdown="Stable  TOA\nimbalance.",
+            known_issues=None,
+        )
+
+        assert simulation_text(sim) == (
+            "Name: v3.LR.piControl; Compset: WCYCL1850; "
+            "Grid: ne30pg2_r05_IcoswISC30E3r5; Notes: Stable TOA imbalance."
+        )
+
+
+class TestEncode:
+    @patch("app.ai.embeddings.get_encoder")
+    def test_returns_normalized_float32(self, mock_get_encoder):
+        encoder = MagicMock()
+        encoder.encode.return_value = np.ones((2, 3), dtype=np.float64)
+        mock_get_encoder.return_value = encoder
+
+        vectors = encode(["a", "b"])
+
+        assert vectors.dtype == np.float32
+        assert encoder.encode.call_args.kwargs["normalize_embeddings"] is True
+
+
+class TestBuildEmbeddings:
+    def test_embeds_every_simulation_in_batches(
+        self, mock_encoder, db, tmp_path, create_simulations
+    ):
+        sims = create_simulations(3)
+        store = EmbeddingStore(tmp_path)
+
+        count = build_embeddings(db, store, batch_size=2)
+
+        assert count == 3
+        assert mock_encoder.call_count == 2
+        assert mock_encoder.call_args_list[0].args[0][0].startswith("Name: Simulation")
+        assert store.index().vectors.shape == (3, 4)
+        assert (
+            store.snapshot().watermark
+            == max(sim.updated_at for sim in sims).isoformat()
+        )
+
+
+class TestRefreshEmbeddings:
+    def test_builds_store_on_first_run(
+        self, mock_encoder, db, tmp_path, create_simulations
+    ):
+        create_simulations(2)
+        store = EmbeddingStore(tmp_path)
+
+        result = refresh_embeddings(db, store)
+
+        assert result.embedded == 2
+        assert len(store.index()) == 2
+
+    def test_embeds_only_changed_rows_and_drops_deleted(
+        self, mock_encoder, db, tmp_path, monkeypatch, create_simulations
+    ):
+        monkeypatch.setattr(settings, "embedding_compact_ratio", 1.0)
+        sims = create_simulations(3)
+        store = EmbeddingStore(tmp_path)
+        build_embeddings(db, store)
+        first = store.snapshot()
+        mock_encoder.reset_mock()
+
+        # Unchanged rows inside the lag window are skipped.
+        result = refresh_embeddings(db, store)
+        assert result.embedded == 0
+        assert store.snapshot() == first
+        mock_encoder.assert_not_called()
+
+        sims[0].notes_markdown = "Cold bias."
+        sims[0].updated_at = sims[0].updated_at + timedelta(minutes=1)
+        db.delete(sims[1])
+        db.commit()
+
+        result = refresh_embeddings(db, store)
+
+        assert (result.embedded, result.deleted, result.compacted) == (1, 1, False)
+        assert "Notes: Cold bias." in mock_encoder.call_args.args[0][0]
+
+        index = store.index()
+        live_ids = sorted(index.ids[index.live].tolist())
+        assert live_ids == sorted([str(sims[0].id), str(sims[2].id)])
+        assert store.snapshot().generation == first.generation
+        assert store.snapshot().watermark == sims[0].updated_at.isoformat()
+
+    def test_compacts_when_dead_ratio_exceeds_threshold(
+        self, mock_encoder, db, tmp_path, create_simulations
+    ):
+        sims = create_simulations(2)
+        store = EmbeddingStore(tmp_path)
+        build_embeddings(db, store)
+        first = store.snapshot()
+        db.delete(sims[0])
+        db.commit()
+
+        result = refresh_embeddings(db, store)
+
+        assert result.compacted
+        snapshot = store.snapshot()
+        assert snapshot.generation != first.generation
+        assert snapshot.rows == snapshot.live_rows == 1
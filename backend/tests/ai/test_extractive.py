@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+from app.ai.aggregate import aggregate_simulations
+from app.ai.extractive import extractive_summary, textrank
+
+
+def _sim(name: str, **fields) -> SimpleNamespace:
+    defaults = {
+        "version_tag": "v3.0.0",
+        "campaign_id": "v3.LR",
+        "compset": "WCYCL1850",
+        "grid_resolution": "ne30pg2",
+        "machine_name": "chrysalis",
+        "notes_markdown": None,
+    }
+
+    return SimpleNamespace(name=name, **{**defaults, **fields})
+
+
+class TestTextRank:
+    def test_returns_all_sentences_when_few(self):
+        assert textrank(["a b", "c d"], k=3) == [0, 1]
+
+    def test_prefers_central_sentences_in_document_order(self):
+        sentences = [
+            "Unrelated remark about the weather.",
+            "Cold bias over the Southern Ocean.",
+            "Another unrelated remark about lunch.",
+            "Southern Ocean cold bias after year 40.",
+            "Cold bias in the Southern Ocean persists.",
+        ]
+
+        assert textrank(sentences, k=2) == [1, 4]
+
+    def test_handles_sentences_without_tokens(self):
+        assert textrank(["...", "!!!", "a"], k=1) == [0]
+
+
+class TestExtractiveSummary:
+    def test_leads_with_shared_fields_and_attributes_notes(self):
+        sims = [
+            _sim("a", compset="WCYCL20TR", notes_markdown="Cold bias. Restart ok."),
+            _sim("b", notes_markdown="Cold bias over ocean."),
+        ]
+
+        summary = extractive_summary(aggregate_simulations(sims), max_sentences=10)
+        lines = summary.splitlines()
+
+        assert lines[0].startswith("2 simulations. Shared by all: Tag: v3.0.0")
+        assert "Compset varies: WCYCL1850 (1), WCYCL20TR (1)." in lines
+        assert "Cold bias. (a)" in lines
+        assert "Restart ok. (a)" in lines
+        assert "Cold bias over ocean. (b)" in lines
+
+    def test_elides_long_note_attributions(self):
+        sims = [_sim(f"run{i}", notes_markdown="Same note.") for i in range(8)]
+
+        summary = extractive_summary(aggregate_simulations(sims), max_sentences=10)
+
+        assert "Same note. (run0, run1, run2, run3, run4 and 3 more)" in (
+            summary.splitlines()
+        )
+
+    def test_limits_number_of_sentences(self):
+        sims = [
+            _sim(f"run{i}", compset=f"C{i}", notes_markdown=f"Note {i}.")
+            for i in range(10)
+        ]
+
+        summary = extractive_summary(aggregate_simulations(sims), max_sentences=3)
+
+        assert len(summary.splitlines()) == 4
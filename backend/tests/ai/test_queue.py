@@ -0,0 +1,49 @@
+import threading
+
+import pytest
+
+from app.ai.queue import InferenceQueue, InferenceQueueFull
+
+
+class TestInferenceQueue:
+    def test_rejects_admission_beyond_depth(self):
+        queue = InferenceQueue(workers=1, depth=2)
+
+        with queue.admit(), queue.admit():
+            assert queue.saturated
+
+            with pytest.raises(InferenceQueueFull):
+                with queue.admit():
+                    pass
+
+        assert queue.admitted == 0
+        assert not queue.saturated
+
+    def test_releases_admission_on_error(self):
+        queue = InferenceQueue(workers=1, depth=1)
+
+        with pytest.raises(RuntimeError):
+            with queue.admit():
+                raise RuntimeError("boom")
+
+        assert queue.admitted == 0
+
+    def test_slots_limit_concurrent_calls(self):
+        queue = InferenceQueue(workers=1, depth=2)
+        entered = threading.Event()
+
+        def worker():
+            with queue.slot():
+                entered.set()
+
+        with queue.slot():
+            thread = threading.Thread(target=worker)
+            thread.start()
+            assert not entered.wait(timeout=0.1)
+
+        thread.join(timeout=1)
+        assert entered.is_set()
+
+    def test_rejects_invalid_sizes(self):
+        with pytest.raises(ValueError):
+            InferenceQueue(workers=0, depth=1)
@@ -0,0 +1,112 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from app.ai.similarity import (
+    CATEGORICAL_WEIGHTS,
+    TEXT_WEIGHT,
+    SimilarityFeatures,
+    build_features,
+)
+
+
+def _row(sim_id, compset, grid_name, machine_id="m1", version_tag=None, notes=None):
+    return SimpleNamespace(
+        id=sim_id,
+        compset=compset,
+        grid_name=grid_name,
+        machine_id=machine_id,
+        version_tag=version_tag,
+        notes_markdown=notes,
+    )
+
+
+def _features(rows) -> SimilarityFeatures:
+    db = MagicMock()
+    db.execute.return_value.all.return_value = rows
+
+    return build_features(db)
+
+
+class TestBuildFeatures:
+    def test_factorizes_categorical_columns(self):
+        features = _features(
+            [
+                _row("a", "WCYCL1850", "ne30", version_tag="v3"),
+                _row("b", "F2010", "ne30"),
+                _row("c", "WCYCL1850", "ne120", version_tag="v3"),
+            ]
+        )
+
+        compset = features.codes["compset"]
+        assert compset[0] == compset[2] != compset[1]
+        assert features.labels["compset"][compset[1]] == "F2010"
+        assert features.codes["version_tag"].tolist()[1] == -1
+
+    def test_notes_vectors_have_unit_length(self):
+        features = _features(
+            [
+                _row("a", "x", "g", notes="Ocean spin-up, ocean restart"),
+                _row("b", "x", "g"),
+                _row("c", "x", "g", notes="ocean"),
+            ]
+        )
+
+        notes = features.notes
+        norms = np.bincount(notes.rows, weights=notes.weights**2, minlength=3)
+        np.testing.assert_allclose(norms, [1, 0, 1])
+        cosine = notes.cosine(0, 3)
+        assert cosine[0] == pytest.approx(1)
+        assert cosine[1] == 0
+        assert 0 < cosine[2] < 1
+
+    def test_without_notes(self):
+        features = _features([_row("a", "x", "g"), _row("b", "x", "g")])
+
+        np.testing.assert_array_equal(features.notes.cosine(0, 2), [0, 0])
+
+
+class TestSimilar:
+    def test_ranks_by_weighted_matches_and_notes(self):
+        features = _features(
+            [
+                _row("q", "WCYCL1850", "ne30", version_tag="v3", notes="spin-up"),
+                _row("same", "WCYCL1850", "ne30", version_tag="v3", notes="tuning"),
+                _row("text", "F2010", "ne120", machine_id="m2", notes="Spin-up."),
+                _row("none", "F2010", "ne120", machine_id="m2"),
+            ]
+        )
+
+        matches = features.similar("q", k=5)
+
+        assert [m.id for m in matches] == ["same", "text", "none"]
+        assert matches[0].score == pytest.approx(sum(CATEGORICAL_WEIGHTS.values()))
+        assert matches[1].score == pytest.approx(TEXT_WEIGHT)
+        assert matches[2].score == 0
+
+        fields = {f.field: f for f in matches[0].fields}
+        assert fields["compset"].match is True
+        assert fields["compset"].value == "WCYCL1850"
+        assert fields["notes"].match is None
+        assert fields["notes"].similarity == 0
+        assert sum(f.contribution for f in matches[0].fields) == pytest.approx(
+            matches[0].score
+        )
+
+    def test_missing_values_never_match(self):
+        features = _features([_row("q", "x", "g"), _row("o", "y", "h")])
+
+        fields = {f.field: f for f in features.similar("q", 1)[0].fields}
+
+        assert fields["version_tag"].match is False
+        assert fields["version_tag"].value is None
+        assert fields["machine_id"].match is True
+
+    def test_unknown_simulation(self):
+        with pytest.raises(KeyError):
+            _features([_row("q", "x", "g")]).similar("missing", 3)
+
+    def test_single_simulation_has_no_neighbours(self):
+        assert _features([_row("q", "x", "g")]).similar("q", 3) == []
@@ -0,0 +1,91 @@
+import builtins
+from unittest.mock import patch
+
+import pytest
+import torch
+
+from app.ai.summarizer import build_summarizer
+
+
+class TestBuildSummarizer:
+    @patch("app.ai.summarizer.pipeline")
+    def test_torch_backend_loads_model_by_id(self, mock_pipeline):
+        summarizer = build_summarizer("torch", "facebook/bart-large-cnn")
+
+        mock_pipeline.assert_called_once_with(
+            "summarization", model="facebook/bart-large-cnn"
+        )
+        assert summarizer is mock_pipeline.return_value
+
+    @patch("app.ai.summarizer.pipeline")
+    @patch("app.ai.summarizer.AutoTokenizer")
+    @patch("app.ai.summarizer.AutoModelForSeq2SeqLM")
+    def test_int8_backend_quantizes_linear_layers(
+        self, mock_model_cls, mock_tokenizer_cls, mock_pipeline
+    ):
+        fp32_model = torch.nn.Sequential(torch.nn.Linear(4, 4))
+        mock_model_cls.from_pretrained.return_value = fp32_model
+
+        build_summarizer("torch-int8", "/models/bart")
+
+        model = mock_pipeline.call_args.kwargs["model"]
+        assert isinstance(model[0], torch.ao.nn.quantized.dynamic.Linear)
+        assert (
+            mock_pipeline.call_args.kwargs["tokenizer"]
+            is mock_tokenizer_cls.from_pretrained.return_value
+        )
+
+    @patch("app.ai.summarizer.pipeline")
+    @patch("app.ai.summarizer.AutoTokenizer")
+    def test_onnx_backend_requires_optimum(self, mock_tokenizer_cls, mock_pipeline):
+        real_import = builtins.__import__
+
+        def fake_import(name, *args, **kwargs):
+            if name.startswith("optimum"):
+                raise ImportError(name)
+
+            return real_import(name, *args, **kwargs)
+
+        with patch("builtins.__import__", side_effect=fake_import):
+            with pytest.raises(RuntimeError, match="optimum"):
+                build_summarizer("onnx", "/models/bart-onnx")
+
+        mock_pipeline.assert_not_called()
+
+    @patch("app.ai.summarizer.pipeline")
+    @patch("app.ai.summarizer.AutoTokenizer")
+    def test_unknown_backend(self, mock_tokenizer_cls, mock_pipeline):
+        with pytest.raises(ValueError, match="Unknown summarizer backend"):
+            build_summarizer("tensorrt", "/models/bart")  # type: ignore[arg-type]
+
+        mock_pipeline.assert_not_called()
+
+    @patch("app.ai.summarizer.pipeline")
+    @patch("app.ai.summarizer.AutoTokenizer")
+    @patch("app.ai.summarizer.load_mmap_model")
+    def test_mmap_loads_local_directory_offline(
+        self, mock_load, mock_tokenizer_cls, mock_pipeline, tmp_path
+    ):
+        build_summarizer("torch", str(tmp_path), mmap=True)
+
+        mock_load.assert_called_once_with(str(tmp_path))
+        mock_tokenizer_cls.from_pretrained.assert_called_once_with(
+            str(tmp_path), local_files_only=True
+        )
+        assert mock_pipeline.call_args.kwargs["model"] is mock_load.return_value
+
+    @pytest.mark.parametrize(
+        ("backend", "model", "match"),
+        [
+            ("torch-int8", None, "'torch' backend"),
+            ("torch", "facebook/bart-large-cnn", "local model directory"),
+        ],
+    )
+    @patch("app.ai.summarizer.pipeline")
+    def test_mmap_rejects_unsupported_setups(
+        self, mock_pipeline, backend, model, match, tmp_path
+    ):
+        with pytest.raises(ValueError, match=match):
+            build_summarizer(backend, model or str(tmp_path), mmap=True)
+
+        mock_pipeline.assert_not_called()
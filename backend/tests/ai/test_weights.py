@@ -0,0 +1,94 @@
+import json
+import struct
+import sys
+
+import pytest
+import torch
+from transformers import BartConfig, BartForConditionalGeneration
+
+from app.ai.weights import load_mmap_model, mmap_safetensors
+
+
+@pytest.fixture(scope="module")
+def model_dir(tmp_path_factory):
+    """Save a tiny randomly initialized BART model with safetensors weights."""
+    path = tmp_path_factory.mktemp("bart")
+    config = BartConfig(
+        vocab_size=64,
+        d_model=16,
+        encoder_layers=1,
+        decoder_layers=1,
+        encoder_attention_heads=2,
+        decoder_attention_heads=2,
+        encoder_ffn_dim=32,
+        decoder_ffn_dim=32,
+        max_position_embeddings=32,
+    )
+    torch.manual_seed(0)
+    BartForConditionalGeneration(config).save_pretrained(path)
+
+    return path
+
+
+class TestMmapSafetensors:
+    def test_reads_tensors_by_name(self, tmp_path):
+        data = torch.arange(6, dtype=torch.float32)
+        header = json.dumps(
+            {
+                "__metadata__": {"format": "pt"},
+                "x": {"dtype": "F32", "shape": [2, 3], "data_offsets": [0, 24]},
+            }
+        ).encode()
+        path = tmp_path / "w.safetensors"
+        path.write_bytes(
+            struct.pack("<Q", len(header)) + header + data.numpy().tobytes()
+        )
+
+        tensors = mmap_safetensors(path)
+
+        assert list(tensors) == ["x"]
+        assert torch.equal(tensors["x"], data.view(2, 3))
+
+
+class TestLoadMmapModel:
+    def test_matches_from_pretrained(self, model_dir):
+        model = load_mmap_model(model_dir)
+        reference = BartForConditionalGeneration.from_pretrained(model_dir).eval()
+        input_ids = torch.tensor([[0, 5, 6, 7, 2]])
+
+        with torch.no_grad():
+            logits = model(input_ids=input_ids, decoder_input_ids=input_ids).logits
+            expected = reference(
+                input_ids=input_ids, decoder_input_ids=input_ids
+            ).logits
+
+        assert torch.allclose(logits, expected)
+        assert not model.training
+
+    @pytest.mark.skipif(
+        not sys.platform.startswith("linux"), reason="reads /proc/self/maps"
+    )
+    def test_weights_view_the_mapped_file_and_stay_tied(self, model_dir):
+        model = load_mmap_model(model_dir)
+
+        ranges = _mapped_ranges(model_dir / "model.safetensors")
+        for param in model.parameters():
+            assert any(start <= param.data_ptr() < end for start, end in ranges)
+        assert model.lm_head.weight is model.model.shared.weight
+
+    def test_requires_safetensors(self, tmp_path):
+        with pytest.raises(FileNotFoundError, match="safetensors"):
+            load_mmap_model(tmp_path)
+
+
+def _mapped_ranges(path) -> list[tuple[int, int]]:
+    """Return the address ranges where the process maps ``path``."""
+    ranges = []
+
+    with open("/proc/self/maps") as f:
+        for line in f:
+            if line.rstrip().endswith(str(path)):
+                start, end = line.split()[0].split("-")
+                ranges.append((int(start, 16), int(end, 16)))
+
+    return ranges
@@ -1,140 +1,650 @@
-from datetime import datetime
+import json
+import re
+import threading
+from contextlib import nullcontext
+from datetime import timedelta
 from unittest.mock import patch
 from uuid import uuid4
 
 import pytest
-from fastapi import HTTPException
-from fastapi.testclient import TestClient
+import torch
+from sqlalchemy import update
+from sqlalchemy.orm import Session
 
-from app.api.routers.ai import analyze_simulations, router
+from app.ai.queue import InferenceQueue
+from app.api.routers.ai import (
+    _CancelCriteria,
+    _job_heartbeat,
+    _run_job,
+    _summary_cache,
+)
+from app.db.ai_job import AIJob
 
-client = TestClient(router, raise_server_exceptions=False)
+
+@pytest.fixture(autouse=True)
+def _clear_summary_cache():
+    _summary_cache.clear()
+    yield
+    _summary_cache.clear()
+
+
+class _WordTokenizer:
+    """A whitespace tokenizer standing in for BART's: one token per word."""
+
+    model_max_length = 128
+
+    def __init__(self):
+        self.words: list[str] = []
+
+    def __call__(self, text, add_special_tokens=True):
+        if isinstance(text, str):
+            return {"input_ids": self._encode(text, add_special_tokens)}
+
+        return {"input_ids": [self._encode(t, add_special_tokens) for t in text]}
+
+    def decode(self, ids, skip_special_tokens=True):
+        return " ".join(self.words[i] for i in ids)
+
+    def _encode(self, text: str, add_special_tokens: bool) -> list[int]:
+        ids = []
+        for word in text.split():
+            self.words.append(word)
+            ids.append(len(self.words) - 1)
+
+        return [-1, *ids, -2] if add_special_tokens else ids
+
+
+@pytest.fixture
+def full_queue():
+    """Replace the inference queue with one whose only place is taken."""
+    queue = InferenceQueue(workers=1, depth=1)
+
+    with patch("app.api.routers.ai.inference_queue", queue), queue.admit():
+        yield queue
+
+
+@pytest.fixture
+def mock_summarizer():
+    with patch("app.api.routers.ai.summarizer") as summarizer:
+        summarizer.tokenizer = _WordTokenizer()
+
+        yield summarizer
+
+
+# Column values that differ per simulation, so a selection varies in each.
+_VARYING = {
+    "compset": lambda i: f"compset{i}",
+    "compset_alias": lambda i: f"alias{i}",
+    "grid_name": lambda i: f"grid{i}",
+    "grid_resolution": lambda i: f"{i}x{i}",
+    "version_tag": lambda i: f"v{i}.0",
+    "campaign_id": "campaign1",
+    "notes_markdown": lambda i: f"Test notes {i}",
+}
 
 
 class TestAnalyzeSimulations:
-    @patch("app.api.routers.ai.summarizer")
-    def test_analyze_simulations_with_few_simulations(self, mock_summarizer):
-        # Mock summarizer response
+    def test_analyze_simulations_with_few_simulations(
+        self, mock_summarizer, client, db: Session, create_simulations
+    ):
         mock_summarizer.return_value = [{"summary_text": "Mocked summary"}]
+        sims = create_simulations(1, **_VARYING)
 
-        # Create test payload
-        payload = [
-            {
-                "id": str(uuid4()),
-                "name": "Simulation 1",
-                "case_name": "Case 1",
-                "compset": "compset1",
-                "compset_alias": "alias1",
-                "grid_name": "grid1",
-                "grid_resolution": "1x1",
-                "initialization_type": "type1",
-                "simulation_type": "typeA",
-                "status": "completed",
-                "machine_id": str(uuid4()),
-                "model_start_date": datetime.now().isoformat(),
-                "version_tag": "v1.0",
-                "campaign_id": "campaign1",
-                "notes_markdown": "Test notes 1",
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-                "artifacts": [],
-                "links": [],
-            }
-        ]
+        response = client.post(
+            "/ai/analyze-simulations", json={"simulationIds": [str(sims[0].id)]}
+        )
 
-        response = client.post("/ai/analyze-simulations", json=payload)
+        assert response.status_code == 200
+        assert response.json() == {"summary": "Mocked summary", "mode": "abstractive"}
+        mock_summarizer.assert_called_once()
+
+        # The description is built from the server-side rows, including the
+        # machine name rather than its ID.
+        input_text = mock_summarizer.call_args.args[0]
+        assert "Notes for Simulation 1: Test notes 1" in input_text
+        assert f"Machine: {sims[0].machine.name}" in input_text
+
+    def test_analyze_simulations_with_many_simulations(
+        self, mock_summarizer, client, db: Session, create_simulations
+    ):
+        mock_summarizer.return_value = [{"summary_text": "Mocked summary"}]
+        sims = create_simulations(8, **_VARYING)
+
+        response = client.post(
+            "/ai/analyze-simulations",
+            json={"simulationIds": [str(sim.id) for sim in sims]},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {"summary": "Mocked summary", "mode": "abstractive"}
+
+        # Eight distinct configurations overflow one prompt, so they are
+        # summarized in chunks and then reduced.
+        prompts = [call.args[0] for call in mock_summarizer.call_args_list]
+        assert len(prompts) > 2
+        assert prompts[-1].endswith("Overall Summary:")
+
+    def test_analyze_simulations_collapses_identical_configurations(
+        self, mock_summarizer, client, db: Session, create_simulations
+    ):
+        mock_summarizer.return_value = [{"summary_text": "Mocked summary"}]
+        sims = create_simulations(40, **_VARYING)
+        for sim in sims:
+            sim.compset = "WCYCL1850"
+            sim.grid_resolution = "ne30pg2_r05_IcoswISC30E3r5"
+            sim.version_tag = "v3.0.0"
+            sim.notes_markdown = "Spun up from  piControl."
+        db.commit()
+
+        response = client.post(
+            "/ai/analyze-simulations",
+            json={"simulationIds": [str(sim.id) for sim in sims]},
+        )
 
         assert response.status_code == 200
-        assert response.json() == {"summary": "Mocked summary"}
+
+        # Forty identical runs fit in a single prompt of a few lines.
         mock_summarizer.assert_called_once()
+        input_text = mock_summarizer.call_args.args[0]
+        assert "40 simulations. Shared by all: Tag: v3.0.0;" in input_text
+        assert "and 35 more: Spun up from piControl." in input_text
+        assert input_text.count("piControl") == 1
 
-    @patch("app.api.routers.ai.summarizer")
-    def test_analyze_simulations_with_many_simulations(self, mock_summarizer):
-        # Mock summarizer response
-        mock_summarizer.side_effect = [
-            [{"summary_text": "Intermediate summary 1"}],
-            [{"summary_text": "Intermediate summary 2"}],
-            [{"summary_text": "Final summary"}],
-        ]
+    def test_analyze_simulations_by_filters(
+        self, mock_summarizer, client, db: Session, create_simulations
+    ):
+        mock_summarizer.return_value = [{"summary_text": "Filtered summary"}]
+        create_simulations(2, **_VARYING)
 
-        # Create test payload
-        payload = [
-            {
-                "id": str(uuid4()),
-                "name": f"Simulation {i}",
-                "case_name": f"Case {i}",
-                "compset": f"compset{i}",
-                "compset_alias": f"alias{i}",
-                "grid_name": f"grid{i}",
-                "grid_resolution": f"{i}x{i}",
-                "initialization_type": f"type{i}",
-                "simulation_type": f"type{i}",
-                "status": "completed",
-                "machine_id": str(uuid4()),
-                "model_start_date": datetime.now().isoformat(),
-                "version_tag": f"v{i}.0",
-                "campaign_id": f"campaign{i}",
-                "notes_markdown": f"Test notes {i}",
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-                "artifacts": [],
-                "links": [],
-            }
-            for i in range(1, 9)
-        ]
+        response = client.post(
+            "/ai/analyze-simulations",
+            json={"filters": {"campaignId": "campaign1", "versionTag": "v2.0"}},
+        )
 
-        response = client.post("/ai/analyze-simulations", json=payload)
+        assert response.status_code == 200
+        assert response.json() == {"summary": "Filtered summary", "mode": "abstractive"}
+
+        input_text = mock_summarizer.call_args.args[0]
+        assert "Notes for Simulation 2" in input_text
+        assert "Simulation 1" not in input_text
+
+    def test_analyze_simulations_uses_cache_until_updated(
+        self, mock_summarizer, client, db: Session, create_simulations
+    ):
+        mock_summarizer.return_value = [{"summary_text": "Mocked summary"}]
+        sims = create_simulations(2, **_VARYING)
+        payload = {"simulationIds": [str(sim.id) for sim in sims]}
+
+        client.post("/ai/analyze-simulations", json=payload)
+        client.post("/ai/analyze-simulations", json=payload)
+        assert mock_summarizer.call_count == 1
+
+        # Editing a simulation bumps `updated_at` and misses the cache. The
+        # timestamp is set explicitly because `now()` is frozen for the
+        # duration of the surrounding test transaction.
+        sims[0].notes_markdown = "Edited notes"
+        sims[0].updated_at = sims[0].updated_at + timedelta(seconds=1)
+        db.commit()
+
+        client.post("/ai/analyze-simulations", json=payload)
+        assert mock_summarizer.call_count == 2
+
+    def test_analyze_simulations_splits_long_notes_without_truncation(
+        self, mock_summarizer, client, db: Session, create_simulations
+    ):
+        mock_summarizer.return_value = [{"summary_text": "Mocked summary"}]
+        notes = " ".join(f"note{i}" for i in range(300))
+        sims = create_simulations(1, **_VARYING)
+        sims[0].notes_markdown = notes
+        db.commit()
+
+        response = client.post(
+            "/ai/analyze-simulations", json={"simulationIds": [str(sims[0].id)]}
+        )
 
         assert response.status_code == 200
-        assert response.json() == {"summary": "Final summary"}
-        assert mock_summarizer.call_count == 3
 
-    @pytest.mark.xfail(reason="500 status code returned instead of 422")
-    def test_analyze_simulations_invalid_payload(self):
-        # Create invalid payload
-        payload = [{"invalid": "data"}]
+        # The description is too long for one prompt, so it is summarized in
+        # pieces and then reduced; every word reaches the model exactly once.
+        prompts = [call.args[0] for call in mock_summarizer.call_args_list]
+        assert len(prompts) > 2
+        assert all(len(p.split()) <= 128 for p in prompts)
 
-        response = client.post("/ai/analyze-simulations", json=payload)
+        words = " ".join(prompts[:-1]).split()
+        assert [w for w in words if re.fullmatch(r"note\d+", w)] == notes.split()
 
-        assert response.status_code == 422  # Unprocessable Entity
+    def test_analyze_simulations_unknown_id(self, client, db: Session):
+        missing_id = str(uuid4())
 
-        with pytest.raises(HTTPException):
-            analyze_simulations(payload)
+        response = client.post(
+            "/ai/analyze-simulations", json={"simulationIds": [missing_id]}
+        )
 
-    @pytest.mark.xfail(reason="json() not returning expected detail")
-    @patch("app.api.routers.ai.summarizer")
-    def test_analyze_simulations_summarization_failure(self, mock_summarizer):
-        # Mock summarizer to raise an exception
-        mock_summarizer.side_effect = Exception("Summarization error")
+        assert response.status_code == 404
+        assert missing_id in response.json()["detail"]
 
-        # Create test payload
-        payload = [
-            {
-                "id": str(uuid4()),
-                "name": "Simulation 1",
-                "case_name": "Case 1",
-                "compset": "compset1",
-                "compset_alias": "alias1",
-                "grid_name": "grid1",
-                "grid_resolution": "1x1",
-                "initialization_type": "type1",
-                "simulation_type": "typeA",
-                "status": "completed",
-                "machine_id": str(uuid4()),
-                "model_start_date": datetime.now().isoformat(),
-                "version_tag": "v1.0",
-                "campaign_id": "campaign1",
-                "notes_markdown": "Test notes 1",
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-                "artifacts": [],
-                "links": [],
-            }
-        ]
+    def test_analyze_simulations_no_filter_matches(self, client, db: Session):
+        response = client.post(
+            "/ai/analyze-simulations", json={"filters": {"campaignId": "nope"}}
+        )
 
+        assert response.status_code == 404
+        assert response.json() == {"detail": "No simulations match the given filters."}
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            {},
+            {"invalid": "data"},
+            {"simulationIds": []},
+            {"simulationIds": [str(uuid4())], "filters": {"campaignId": "c"}},
+        ],
+    )
+    def test_analyze_simulations_invalid_payload(self, client, payload):
         response = client.post("/ai/analyze-simulations", json=payload)
 
+        assert response.status_code == 422  # Unprocessable Entity
+
+    def test_analyze_simulations_summarization_failure(
+        self, mock_summarizer, client, db: Session, create_simulations
+    ):
+        mock_summarizer.side_effect = Exception("Summarization error")
+        sims = create_simulations(1, **_VARYING)
+
+        response = client.post(
+            "/ai/analyze-simulations", json={"simulationIds": [str(sims[0].id)]}
+        )
+
         assert response.status_code == 500
         assert response.json() == {
             "detail": "Summarization failed: Summarization error"
         }
+
+    def test_analyze_simulations_extractive_mode(
+        self, mock_summarizer, client, db: Session, create_simulations
+    ):
+        sims = create_simulations(3, **_VARYING)
+
+        response = client.post(
+            "/ai/analyze-simulations",
+            json={"simulationIds": [str(sim.id) for sim in sims], "mode": "extractive"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["mode"] == "extractive"
+
+        summary = response.json()["summary"]
+        assert summary.startswith("3 simulations. Shared by all: Campaign: campaign1")
+        assert "Test notes 1 (Simulation 1)" in summary
+        mock_summarizer.assert_not_called()
+
+    def test_analyze_simulations_falls_back_when_queue_full(
+        self, mock_summarizer, full_queue, client, db: Session, create_simulations
+    ):
+        sims = create_simulations(2, **_VARYING)
+
+        response = client.post(
+            "/ai/analyze-simulations",
+            json={"simulationIds": [str(sim.id) for sim in sims]},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["mode"] == "extractive"
+        mock_summarizer.assert_not_called()
+
+        # The fallback is not cached as the abstractive summary.
+        mock_summarizer.return_value = [{"summary_text": "Mocked summary"}]
+        full_queue.depth = 2
+
+        response = client.post(
+            "/ai/analyze-simulations",
+            json={"simulationIds": [str(sim.id) for sim in sims]},
+        )
+
+        assert response.json() == {"summary": "Mocked summary", "mode": "abstractive"}
+
+    def test_analyze_simulations_invalid_mode(
+        self, client, db: Session, create_simulations
+    ):
+        sims = create_simulations(1, **_VARYING)
+
+        response = client.post(
+            "/ai/analyze-simulations",
+            json={"simulationIds": [str(sims[0].id)], "mode": "fast"},
+        )
+
+        assert response.status_code == 422
+
+
+def _fake_summarizer(final_tokens: list[str]):
+    """Build a summarizer stand-in that streams ``final_tokens`` when asked."""
+
+    def summarize(input_text, **kwargs):
+        streamer = kwargs.get("streamer")
+
+        if streamer is not None:
+            for token in final_tokens:
+                streamer.on_finalized_text(token)
+
+            return [{"summary_text": "".join(final_tokens)}]
+
+        return [{"summary_text": "Chunk summary"}]
+
+    return summarize
+
+
+def _parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+
+    return events
+
+
+class TestStreamAnalyzeSimulations:
+    def test_stream_with_few_simulations(
+        self, mock_summarizer, client, db: Session, create_simulations
+    ):
+        mock_summarizer.side_effect = _fake_summarizer(["Final ", "summary"])
+        sims = create_simulations(2, **_VARYING)
+
+        response = client.post(
+            "/ai/analyze-simulations/stream",
+            json={"simulationIds": [str(sim.id) for sim in sims]},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert _parse_sse(response.text) == [
+            ("token", {"text": "Final "}),
+            ("token", {"text": "summary"}),
+            ("summary", {"summary": "Final summary", "mode": "abstractive"}),
+        ]
+
+    def test_stream_reports_chunk_progress(
+        self, mock_summarizer, client, db: Session, create_simulations
+    ):
+        mock_summarizer.side_effect = _fake_summarizer(["Overall"])
+        sims = create_simulations(8, **_VARYING)
+
+        response = client.post(
+            "/ai/analyze-simulations/stream",
+            json={"simulationIds": [str(sim.id) for sim in sims]},
+        )
+
+        events = _parse_sse(response.text)
+        progress = [data for event, data in events if event == "progress"]
+        assert len(progress) > 1
+        assert [(p["level"], p["chunk"]) for p in progress] == [
+            (1, i) for i in range(1, len(progress) + 1)
+        ]
+        assert all(p["total"] == len(progress) for p in progress)
+        assert events[len(progress) :] == [
+            ("token", {"text": "Overall"}),
+            ("summary", {"summary": "Overall", "mode": "abstractive"}),
+        ]
+
+        # A repeated request is answered from the summary cache.
+        response = client.post(
+            "/ai/analyze-simulations/stream",
+            json={"simulationIds": [str(sim.id) for sim in sims]},
+        )
+        assert _parse_sse(response.text) == [
+            ("summary", {"summary": "Overall", "mode": "abstractive"})
+        ]
+        assert mock_summarizer.call_count == len(progress) + 1
+
+    def test_stream_reduces_over_multiple_levels(
+        self, mock_summarizer, client, db: Session, create_simulations
+    ):
+        # Summaries as long as allowed force the reduce step to overflow.
+        mock_summarizer.side_effect = lambda text, **kwargs: [
+            {"summary_text": " ".join(["word"] * kwargs["max_length"])}
+        ]
+        sims = create_simulations(20, **_VARYING)
+
+        response = client.post(
+            "/ai/analyze-simulations/stream",
+            json={"simulationIds": [str(sim.id) for sim in sims]},
+        )
+
+        events = _parse_sse(response.text)
+        levels = [data["level"] for event, data in events if event == "progress"]
+        assert levels[0] == 1 and max(levels) >= 2
+        assert levels == sorted(levels)
+        assert events[-1][0] == "summary"
+
+        prompts = [call.args[0] for call in mock_summarizer.call_args_list]
+        assert all(len(p.split()) <= 128 for p in prompts)
+
+    def test_stream_reports_failure_as_event(
+        self, mock_summarizer, client, db: Session, create_simulations
+    ):
+        mock_summarizer.side_effect = Exception("Summarization error")
+        sims = create_simulations(1, **_VARYING)
+
+        response = client.post(
+            "/ai/analyze-simulations/stream",
+            json={"simulationIds": [str(sims[0].id)]},
+        )
+
+        assert response.status_code == 200
+        assert _parse_sse(response.text) == [
+            ("error", {"detail": "Summarization failed: Summarization error"})
+        ]
+
+    def test_stream_falls_back_when_queue_full(
+        self, mock_summarizer, full_queue, client, db: Session, create_simulations
+    ):
+        sims = create_simulations(2, **_VARYING)
+
+        response = client.post(
+            "/ai/analyze-simulations/stream",
+            json={"simulationIds": [str(sim.id) for sim in sims]},
+        )
+
+        events = _parse_sse(response.text)
+        assert [event for event, _ in events] == ["summary"]
+        assert events[0][1]["mode"] == "extractive"
+        mock_summarizer.assert_not_called()
+
+    def test_stream_unknown_id(self, client, db: Session):
+        response = client.post(
+            "/ai/analyze-simulations/stream", json={"simulationIds": [str(uuid4())]}
+        )
+
+        assert response.status_code == 404
+
+
+class _RecordingExecutor:
+    """Stands in for the job executor, optionally running jobs inline."""
+
+    def __init__(self, run: bool):
+        self.run = run
+        self.submitted: list = []
+
+    def submit(self, fn, *args):
+        self.submitted.append(args)
+        if self.run:
+            fn(*args)
+
+
+@pytest.fixture
+def job_executor(db: Session):
+    """Run submitted jobs inline, on the test session."""
+    executor = _RecordingExecutor(run=True)
+
+    with (
+        patch("app.api.routers.ai._job_executor", executor),
+        patch("app.api.routers.ai.SessionLocal", return_value=nullcontext(db)),
+    ):
+        yield executor
+
+
+@pytest.fixture
+def idle_job_executor():
+    """Accept submitted jobs without running them, so they stay queued."""
+    executor = _RecordingExecutor(run=False)
+
+    with patch("app.api.routers.ai._job_executor", executor):
+        yield executor
+
+
+class TestAnalysisJobs:
+    def test_job_runs_and_records_progress(
+        self, mock_summarizer, job_executor, client, db: Session, create_simulations
+    ):
+        mock_summarizer.return_value = [{"summary_text": "Job summary"}]
+        sims = create_simulations(8, **_VARYING)
+
+        response = client.post(
+            "/ai/jobs", json={"simulationIds": [str(sim.id) for sim in sims]}
+        )
+
+        assert response.status_code == 202
+        created = response.json()
+        assert created["status"] == "queued"
+        assert len(job_executor.submitted) == 1
+
+        response = client.get(f"/ai/jobs/{created['id']}")
+
+        assert response.status_code == 200
+        job = response.json()
+        assert job["status"] == "succeeded"
+        assert job["summary"] == "Job summary"
+        assert job["mode"] == "abstractive"
+        assert job["progress"]["level"] == 1
+        assert job["progress"]["chunk"] == job["progress"]["total"] > 1
+        assert job["startedAt"] is not None
+        assert job["finishedAt"] is not None
+
+    def test_job_records_failure(
+        self, mock_summarizer, job_executor, client, db: Session, create_simulations
+    ):
+        mock_summarizer.side_effect = Exception("Summarization error")
+        sims = create_simulations(1, **_VARYING)
+
+        response = client.post("/ai/jobs", json={"simulationIds": [str(sims[0].id)]})
+        job = client.get(f"/ai/jobs/{response.json()['id']}").json()
+
+        assert job["status"] == "failed"
+        assert job["error"] == "Summarization failed: Summarization error"
+        assert job["summary"] is None
+
+    def test_identical_inflight_requests_are_deduplicated(
+        self, idle_job_executor, client, db: Session, create_simulations
+    ):
+        sims = create_simulations(2, **_VARYING)
+        ids = [str(sim.id) for sim in sims]
+
+        first = client.post("/ai/jobs", json={"simulationIds": ids})
+        second = client.post("/ai/jobs", json={"simulationIds": ids[::-1]})
+        other = client.post(
+            "/ai/jobs", json={"simulationIds": ids, "mode": "extractive"}
+        )
+
+        assert first.json()["id"] == second.json()["id"]
+        assert other.json()["id"] != first.json()["id"]
+        assert len(idle_job_executor.submitted) == 2
+
+    def test_abandoned_jobs_are_not_deduplicated(
+        self, idle_job_executor, client, db: Session, create_simulations
+    ):
+        sims = create_simulations(1, **_VARYING)
+        payload = {"simulationIds": [str(sims[0].id)]}
+
+        first = client.post("/ai/jobs", json=payload).json()
+        job = db.get(AIJob, first["id"])
+        job.updated_at = job.updated_at - timedelta(days=1)
+        db.commit()
+
+        second = client.post("/ai/jobs", json=payload).json()
+
+        assert second["id"] != first["id"]
+        db.refresh(job)
+        assert job.status == "failed"
+        assert job.error == "Job was abandoned before it finished."
+
+    def test_job_failed_before_it_starts_is_not_run(
+        self,
+        mock_summarizer,
+        idle_job_executor,
+        client,
+        db: Session,
+        create_simulations,
+    ):
+        sims = create_simulations(1, **_VARYING)
+        created = client.post("/ai/jobs", json={"simulationIds": [str(sims[0].id)]})
+        job = db.get(AIJob, created.json()["id"])
+        job.status = "failed"
+        db.commit()
+
+        with patch("app.api.routers.ai.SessionLocal", return_value=nullcontext(db)):
+            _run_job(job.id)
+
+        db.refresh(job)
+        assert (job.status, job.started_at) == ("failed", None)
+        mock_summarizer.assert_not_called()
+
+    def test_job_failed_while_running_stays_failed(
+        self, mock_summarizer, job_executor, client, db: Session, create_simulations
+    ):
+        def fail_job(*args, **kwargs):
+            db.execute(update(AIJob).values(status="failed", error="Abandoned."))
+
+            return [{"summary_text": "Late summary"}]
+
+        mock_summarizer.side_effect = fail_job
+        sims = create_simulations(1, **_VARYING)
+
+        response = client.post("/ai/jobs", json={"simulationIds": [str(sims[0].id)]})
+        job = client.get(f"/ai/jobs/{response.json()['id']}").json()
+
+        assert (job["status"], job["error"], job["summary"]) == (
+            "failed",
+            "Abandoned.",
+            None,
+        )
+
+    def test_heartbeat_keeps_owned_inflight_jobs_fresh(
+        self, idle_job_executor, client, db: Session, create_simulations
+    ):
+        sims = create_simulations(1, **_VARYING)
+        created = client.post("/ai/jobs", json={"simulationIds": [str(sims[0].id)]})
+        job = db.get(AIJob, created.json()["id"])
+        stale = job.updated_at - timedelta(days=1)
+        job.updated_at = stale
+        db.commit()
+
+        with patch("app.api.routers.ai.SessionLocal", return_value=nullcontext(db)):
+            _job_heartbeat.beat()
+        _job_heartbeat.discard(job.id)
+
+        db.refresh(job)
+        assert job.updated_at > stale
+
+    def test_create_job_unknown_id(self, idle_job_executor, client, db: Session):
+        response = client.post("/ai/jobs", json={"simulationIds": [str(uuid4())]})
+
+        assert response.status_code == 404
+        assert idle_job_executor.submitted == []
+
+    def test_get_unknown_job(self, client, db: Session):
+        response = client.get(f"/ai/jobs/{uuid4()}")
+
+        assert response.status_code == 404
+        assert response.json() == {"detail": "AI job not found"}
+
+
+class TestCancelCriteria:
+    def test_stops_generation_once_cancelled(self):
+        cancel = threading.Event()
+        criteria = _CancelCriteria(cancel)
+        input_ids = torch.zeros((2, 3), dtype=torch.long)
+
+        assert not criteria(input_ids, None).any()
+
+        cancel.set()
+        assert criteria(input_ids, None).all()
@@ -0,0 +1,236 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.api.rollups import refresh_rollups
+from app.api.routers.analytics import _throughput_cache
+from app.db.artifact import Artifact
+from app.db.simulation import Simulation
+from app.db.timing import TimingComponent, TimingRun
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    _throughput_cache.clear()
+    yield
+    _throughput_cache.clear()
+
+
+@pytest.fixture
+def runs(create_simulations) -> list[Simulation]:
+    """Runs of 10 simulated years taking 1, 2, 4 or 5 days, plus one without dates."""
+    sims = []
+    for i, (days, version) in enumerate(
+        [(1, "v3.0"), (2, "v3.0"), (4, "v3.1"), (5, "v3.1"), (None, "v3.1")]
+    ):
+        sims += create_simulations(
+            1,
+            name=f"Run {i}",
+            case_name=f"throughput_{i}",
+            status="completed",
+            model_start_date=START,
+            version_tag=version,
+            total_years=10.0,
+            run_start_date=START if days else None,
+            run_end_date=START + timedelta(days=days) if days else None,
+        )
+
+    return sims
+
+
+class TestThroughput:
+    def test_groups_distribution_by_version(self, client, runs):
+        r = client.get(
+            "/analytics/throughput",
+            params={"groupBy": "versionTag", "bins": 4, "compset": "WCYCL1850"},
+        )
+
+        assert r.status_code == 200
+        body = r.json()
+        assert body["groupBy"] == ["versionTag"]
+        assert body["binEdges"] == pytest.approx([2.0, 4.0, 6.0, 8.0, 10.0])
+        groups = {group["group"]["versionTag"]: group for group in body["groups"]}
+        assert groups["v3.0"]["runs"] == 2
+        assert groups["v3.0"]["mean"] == pytest.approx(7.5)
+        assert groups["v3.0"]["percentiles"]["p50"] == pytest.approx(7.5)
+        assert groups["v3.0"]["histogram"] == [0, 1, 0, 1]
+        assert groups["v3.1"]["runs"] == 2
+        assert (groups["v3.1"]["min"], groups["v3.1"]["max"]) == pytest.approx(
+            (2.0, 2.5)
+        )
+        assert groups["v3.1"]["histogram"] == [2, 0, 0, 0]
+
+    def test_caches_per_query_string(self, client, db: Session, runs):
+        params = {"groupBy": "machine"}
+        first = client.get("/analytics/throughput", params=params).json()
+
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = db.get_bind()
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            second = client.get("/analytics/throughput", params=params).json()
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+
+        assert second == first
+        assert not any("sypd" in statement for statement in statements)
+
+    def test_cache_keeps_group_order(self, client, runs):
+        for group_by in (["versionTag", "machine"], ["machine", "versionTag"]):
+            r = client.get("/analytics/throughput", params={"groupBy": group_by})
+
+            assert r.json()["groupBy"] == group_by
+
+    def test_empty_selection(self, client, runs):
+        r = client.get("/analytics/throughput", params={"compset": "F2010"})
+
+        assert r.json() == {"groupBy": ["machine"], "binEdges": [], "groups": []}
+
+    def test_rejects_unknown_group(self, client):
+        r = client.get("/analytics/throughput", params={"groupBy": "status"})
+
+        assert r.status_code == 422
+
+
+class TestThroughputRuns:
+    def test_ranks_runs_within_group(self, client, runs):
+        r = client.get("/analytics/throughput/runs", params={"groupBy": "versionTag"})
+
+        assert r.status_code == 200
+        body = r.json()
+        assert [run["name"] for run in body] == ["Run 0", "Run 1", "Run 2", "Run 3"]
+        assert [run["sypd"] for run in body] == pytest.approx([10.0, 5.0, 2.5, 2.0])
+        assert [run["percentile"] for run in body] == [1.0, 0.0, 1.0, 0.0]
+        assert body[1]["relativeToMean"] == pytest.approx(5.0 / 7.5)
+        assert body[3]["group"] == {"versionTag": "v3.1"}
+
+    def test_paginates(self, client, runs):
+        r = client.get("/analytics/throughput/runs", params={"limit": 1, "offset": 2})
+
+        assert [run["name"] for run in r.json()] == ["Run 2"]
+
+
+class TestComponentCosts:
+    @pytest.fixture
+    def timed(self, db: Session, runs) -> list[Simulation]:
+        """Timing files for runs 0 and 1, with the ocean slower in run 1."""
+        for sim, ocn_seconds in [(runs[0], 0.5), (runs[0], 1.5), (runs[1], 3.0)]:
+            db.add(
+                TimingRun(
+                    simulation_id=sim.id,
+                    lid=f"{ocn_seconds}",
+                    model_cost=100.0 * ocn_seconds,
+                    model_throughput=200.0 / ocn_seconds,
+                    seconds_per_mday=2 * ocn_seconds,
+                    components=[
+                        TimingComponent(
+                            component="atm", comp_pes=100, seconds_per_mday=0.1
+                        ),
+                        TimingComponent(
+                            component="ocn",
+                            comp_pes=36,
+                            seconds_per_mday=ocn_seconds,
+                        ),
+                    ],
+                )
+            )
+        db.commit()
+
+        return runs[:2]
+
+    def test_compares_simulations(self, client, timed):
+        r = client.get(
+            "/analytics/component-costs",
+            params={"simulationIds": [str(sim.id) for sim in timed]},
+        )
+
+        assert r.status_code == 200
+        body = r.json()
+        assert [group["name"] for group in body] == ["Run 0", "Run 1"]
+        assert body[0]["runs"] == 2
+        assert body[0]["modelCost"] == pytest.approx(100.0)
+        ocn, atm = body[0]["components"]
+        assert (ocn["component"], atm["component"]) == ("ocn", "atm")
+        assert ocn["secondsPerMday"] == pytest.approx(1.0)
+        # 36 PEs x 1 s/model day x 365 days / 3600 s/h.
+        assert ocn["cost"] == pytest.approx(3.65)
+        assert ocn["share"] == pytest.approx(0.5)
+        assert body[1]["components"][0]["secondsPerMday"] == pytest.approx(3.0)
+
+    def test_groups_by_machine(self, client, timed):
+        r = client.get("/analytics/component-costs", params={"groupBy": "machine"})
+
+        (machine,) = r.json()
+        assert machine["runs"] == 3
+        assert machine["components"][0]["secondsPerMday"] == pytest.approx(5 / 3)
+
+    def test_leaves_out_simulations_without_timings(self, client, timed, runs):
+        r = client.get(
+            "/analytics/component-costs", params={"simulationIds": [str(runs[2].id)]}
+        )
+
+        assert r.json() == []
+
+
+class TestRollups:
+    @pytest.fixture
+    def campaign(self, db: Session, runs) -> list[Simulation]:
+        """Runs 0-2 in campaign "v3.LR", runs 1-2 also in group "ensemble"."""
+        for i, sim in enumerate(runs[:3]):
+            sim.campaign_id = "v3.LR"
+            sim.group_name = "ensemble" if i else None
+            sim.artifacts = [
+                Artifact(kind="outputPath", uri=f"/out/{i}", size_bytes=10)
+            ]
+        runs[0].status = "running"
+        db.commit()
+        refresh_rollups(db.connection())
+
+        return runs[:3]
+
+    def test_lists_campaigns_from_the_view(self, client, campaign):
+        r = client.get("/analytics/campaigns")
+
+        assert r.status_code == 200
+        (rollup,) = r.json()
+        assert rollup["key"] == "v3.LR"
+        assert rollup["simulations"] == 3
+        assert rollup["statusCounts"] == {"running": 1, "completed": 2}
+        assert rollup["totalYears"] == 30.0
+        assert rollup["firstRunStartDate"].startswith("2024-01-01")
+        assert rollup["lastRunEndDate"].startswith("2024-01-05")
+        assert sum(rollup["machineCounts"].values()) == 3
+        assert (rollup["artifacts"], rollup["artifactBytes"]) == (3, 30)
+
+    def test_gets_one_group(self, client, campaign):
+        r = client.get("/analytics/groups/ensemble")
+
+        assert r.status_code == 200
+        assert r.json()["simulations"] == 2
+        assert r.json()["statusCounts"] == {"completed": 2}
+
+    def test_reads_stale_view_until_refreshed(self, client, db: Session, campaign):
+        campaign[0].campaign_id = "v3.HR"
+        db.commit()
+
+        assert [r["key"] for r in client.get("/analytics/campaigns").json()] == [
+            "v3.LR"
+        ]
+
+        refresh_rollups(db.connection())
+
+        assert [r["key"] for r in client.get("/analytics/campaigns").json()] == [
+            "v3.HR",
+            "v3.LR",
+        ]
+
+    def test_returns_404_for_unknown_campaign(self, client, campaign):
+        assert client.get("/analytics/campaigns/missing").status_code == 404
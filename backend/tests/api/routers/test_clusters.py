@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from sqlalchemy import select
+
+from app.ai.clustering import build_clusters
+from app.ai.embedding_store import EmbeddingIndex
+from app.db.simulation import Simulation
+
+
+@pytest.fixture
+def clusters(db, create_simulations) -> None:
+    for compset, count in [("WCYCL1850", 3), ("F2010", 2)]:
+        create_simulations(
+            count,
+            name=lambda i, compset=compset: f"{compset} {i}",
+            compset=compset,
+            grid_name="ne30pg2_r05_IcoswISC30E3r5",
+        )
+    build_clusters(db, _compset_index(db), k=2)
+
+
+def _compset_index(db) -> EmbeddingIndex:
+    """Embed every simulation as the one-hot vector of its compset."""
+    sims = db.scalars(select(Simulation)).all()
+    compsets = sorted({sim.compset for sim in sims})
+    vectors = np.eye(len(compsets), dtype=np.float32)[
+        [compsets.index(sim.compset) for sim in sims]
+    ]
+
+    return EmbeddingIndex(
+        ids=np.asarray([str(sim.id) for sim in sims]), vectors=vectors
+    )
+
+
+class TestListClusters:
+    def test_lists_clusters_largest_first_with_members(self, client, clusters):
+        r = client.get("/clusters", params={"members": 2})
+
+        assert r.status_code == 200
+        clusters = r.json()
+        assert [(c["label"], c["size"]) for c in clusters] == [
+            ("WCYCL1850 · ne30pg2_r05_IcoswISC30E3r5", 3),
+            ("F2010 · ne30pg2_r05_IcoswISC30E3r5", 2),
+        ]
+        assert len(clusters[0]["members"]) == 2
+        assert all(m["name"].startswith("WCYCL1850") for m in clusters[0]["members"])
+
+    def test_empty_without_clusters(self, client):
+        assert client.get("/clusters").json() == []
+
+
+class TestListClusterSimulations:
+    def test_pages_cluster_members(self, client, clusters):
+        cluster_id = client.get("/clusters").json()[0]["id"]
+
+        r = client.get(
+            f"/clusters/{cluster_id}/simulations", params={"limit": 2, "offset": 1}
+        )
+
+        assert r.status_code == 200
+        assert len(r.json()) == 2
+        assert all(sim["compset"] == "WCYCL1850" for sim in r.json())
+
+    def test_unknown_cluster_returns_404(self, client):
+        assert client.get("/clusters/0/simulations").status_code == 404
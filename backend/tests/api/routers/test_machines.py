@@ -1,10 +1,15 @@
+from datetime import datetime, timezone
 from uuid import uuid4
 
+import pytest
 from fastapi import HTTPException
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
+from app.api.machine_stats import machine_stats_cache
 from app.api.routers.machine import create_machine, get_machine, list_machines
 from app.db.machine import Machine
+from app.db.simulation import Simulation
 from app.schemas.machine import MachineCreate
 
 
@@ -149,3 +154,113 @@ class TestGetMachine:
         res = client.get(f"/machines/{random_id}")
         assert res.status_code == 404
         assert res.json()["detail"] == "Machine not found"
+
+
+class TestMachineStats:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        machine_stats_cache.clear()
+        yield
+        machine_stats_cache.clear()
+
+    @pytest.fixture
+    def machines(self, db: Session, create_simulations) -> tuple[Machine, Machine]:
+        busy, idle = (
+            Machine(name=name, site="Site", architecture="x86_64", scheduler="SLURM")
+            for name in ("Stats busy", "Stats idle")
+        )
+        db.add_all([busy, idle])
+        db.flush()
+        for i, (status, compiler, started) in enumerate(
+            [
+                ("completed", "intel", datetime(2024, 1, 1, tzinfo=timezone.utc)),
+                ("completed", "gnu", datetime(2024, 3, 1, tzinfo=timezone.utc)),
+                ("failed", None, None),
+            ]
+        ):
+            create_simulations(
+                1,
+                name=f"Stats {i}",
+                case_name=f"stats_{i}",
+                status=status,
+                machine_id=busy.id,
+                compiler=compiler,
+                total_years=5.0 if compiler else None,
+                run_start_date=started,
+            )
+
+        return busy, idle
+
+    def test_aggregates_every_machine(self, client, machines):
+        busy, idle = machines
+
+        r = client.get("/machines/stats")
+
+        assert r.status_code == 200
+        stats = {entry["name"]: entry for entry in r.json()}
+        assert stats["Stats busy"]["simulations"] == 3
+        assert stats["Stats busy"]["statusCounts"] == {"completed": 2, "failed": 1}
+        assert stats["Stats busy"]["totalYears"] == 10.0
+        assert stats["Stats busy"]["compilers"] == ["gnu", "intel"]
+        assert stats["Stats idle"] == {
+            "machineId": str(idle.id),
+            "name": "Stats idle",
+            "simulations": 0,
+            "statusCounts": {},
+            "totalYears": 0.0,
+            "latestSimulationId": None,
+            "latestSimulationName": None,
+            "latestRunDate": None,
+            "compilers": [],
+        }
+
+    def test_latest_run_falls_back_to_catalog_date(self, client, machines):
+        busy, _ = machines
+
+        stats = client.get(f"/machines/{busy.id}/stats").json()
+
+        # The failed run has no start date, so its (later) creation counts.
+        assert stats["latestSimulationName"] == "Stats 2"
+
+    def test_serves_cache_until_a_write(self, client, db: Session, machines):
+        busy, _ = machines
+        url = f"/machines/{busy.id}/stats"
+        client.get(url)
+
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = db.get_bind()
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            assert client.get(url).json()["simulations"] == 3
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        assert statements == []
+
+        db.query(Simulation).filter(
+            Simulation.name == "Stats 2"
+        ).one().status = "completed"
+        db.commit()
+
+        assert client.get(url).json()["statusCounts"] == {"completed": 3}
+
+    def test_moving_a_simulation_evicts_both_machines(
+        self, client, db: Session, machines
+    ):
+        busy, idle = machines
+        client.get(f"/machines/{busy.id}/stats")
+        client.get(f"/machines/{idle.id}/stats")
+
+        db.query(Simulation).filter(
+            Simulation.name == "Stats 0"
+        ).one().machine_id = idle.id
+        db.commit()
+
+        assert client.get(f"/machines/{busy.id}/stats").json()["simulations"] == 2
+        assert client.get(f"/machines/{idle.id}/stats").json()["simulations"] == 1
+
+    def test_returns_404_for_unknown_machine(self, client):
+        assert client.get(f"/machines/{uuid4()}/stats").status_code == 404
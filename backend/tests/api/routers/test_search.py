@@ -0,0 +1,182 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from sqlalchemy.orm import Session
+
+from app.ai.embedding_store import EmbeddingStore
+from app.ai.similarity import CATEGORICAL_WEIGHTS
+from app.api.routers.search import _features_cache
+from app.db.simulation import Simulation
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = EmbeddingStore(tmp_path)
+
+    with patch("app.api.routers.search._store", store):
+        yield store
+
+    _features_cache.clear()
+
+
+_VARYING = {
+    "compset": lambda i: f"compset{i}",
+    "compset_alias": lambda i: f"alias{i}",
+    "grid_name": lambda i: f"grid{i}",
+    "grid_resolution": lambda i: f"{i}x{i}",
+}
+
+
+class TestSemanticSearch:
+    def test_returns_most_similar_simulations(
+        self, store, client, db: Session, create_simulations
+    ):
+        sims = create_simulations(3, **_VARYING)
+        vectors = np.eye(3, dtype=np.float32)
+        store.save([str(sim.id) for sim in sims], vectors)
+
+        with patch("app.api.routers.search.encode") as mock_encode:
+            mock_encode.return_value = np.array([[0.1, 0.0, 0.9]], dtype=np.float32)
+            response = client.get("/search/semantic", params={"q": "ocean", "limit": 2})
+
+        assert response.status_code == 200
+        hits = response.json()
+        assert [hit["name"] for hit in hits] == ["Simulation 3", "Simulation 1"]
+        assert hits[0]["score"] == pytest.approx(0.9)
+        assert hits[0]["caseName"] == "case_3"
+        mock_encode.assert_called_once_with(["ocean"])
+
+    def test_skips_deleted_simulations(
+        self, store, client, db: Session, create_simulations
+    ):
+        sims = create_simulations(2, **_VARYING)
+        store.save([str(sim.id) for sim in sims], np.eye(2, dtype=np.float32))
+        db.delete(sims[0])
+        db.commit()
+
+        with patch("app.api.routers.search.encode") as mock_encode:
+            mock_encode.return_value = np.array([[1.0, 0.0]], dtype=np.float32)
+            response = client.get("/search/semantic", params={"q": "x"})
+
+        assert [hit["name"] for hit in response.json()] == ["Simulation 2"]
+
+    def test_index_not_built(self, store, client):
+        response = client.get("/search/semantic", params={"q": "ocean"})
+
+        assert response.status_code == 503
+
+    def test_requires_query(self, store, client):
+        response = client.get("/search/semantic")
+
+        assert response.status_code == 422
+
+
+class TestSimilarSimulations:
+    def test_ranks_structural_matches_and_explains_scores(
+        self, store, client, db: Session, create_simulations
+    ):
+        sims = create_simulations(3, **_VARYING)
+        sims[1].compset = sims[0].compset
+        sims[0].notes_markdown = "Ocean spin-up"
+        sims[2].notes_markdown = "ocean"
+        db.commit()
+
+        response = client.get(f"/search/similar/{sims[0].id}", params={"limit": 5})
+
+        assert response.status_code == 200
+        hits = response.json()
+        assert [hit["name"] for hit in hits] == ["Simulation 2", "Simulation 3"]
+        explanation = {item["field"]: item for item in hits[0]["explanation"]}
+        assert explanation["compset"]["match"] is True
+        assert explanation["grid_name"]["match"] is False
+        assert explanation["notes"]["similarity"] == 0
+        assert 0 < hits[1]["explanation"][-1]["similarity"] < 1
+        assert hits[0]["score"] == pytest.approx(
+            sum(item["contribution"] for item in hits[0]["explanation"])
+        )
+
+    def test_ignores_description_embeddings(
+        self, store, client, db: Session, create_simulations
+    ):
+        sims = create_simulations(2, **_VARYING)
+        store.save([str(sim.id) for sim in sims], np.ones((2, 2), dtype=np.float32))
+
+        response = client.get(f"/search/similar/{sims[0].id}")
+
+        assert response.status_code == 200
+        assert response.json()[0]["score"] == pytest.approx(
+            CATEGORICAL_WEIGHTS["machine_id"]
+        )
+
+    def test_features_follow_catalog_changes(
+        self, store, client, db: Session, create_simulations
+    ):
+        sims = create_simulations(2, **_VARYING)
+        assert len(client.get(f"/search/similar/{sims[0].id}").json()) == 1
+
+        db.delete(sims[1])
+        db.commit()
+        response = client.get(f"/search/similar/{sims[0].id}")
+
+        assert response.json() == []
+
+    def test_unknown_simulation(self, store, client):
+        response = client.get("/search/similar/00000000-0000-0000-0000-000000000000")
+
+        assert response.status_code == 404
+
+
+class TestTextSearch:
+    @pytest.fixture
+    def sims(self, db: Session, create_simulations) -> list[Simulation]:
+        sims = create_simulations(4, **_VARYING)
+        sims[0].notes_markdown = "Strong cold bias over the Southern Ocean."
+        sims[1].known_issues = "Restart failed after year 50."
+        sims[2].notes_markdown = "Slight cold bias."
+        sims[2].compset = sims[0].compset
+        sims[3].name = "v3.LR.historical_0101"
+        db.commit()
+
+        return sims
+
+    def test_ranks_phrase_matches_with_snippets(self, client, sims):
+        response = client.get("/search/text", params={"q": '"cold bias" ocean'})
+
+        assert response.status_code == 200
+        page = response.json()
+        assert [hit["name"] for hit in page["items"]] == ["Simulation 1"]
+        assert "<mark>cold</mark> <mark>bias</mark>" in page["items"][0]["snippet"]
+        assert page["nextCursor"] is None
+
+    def test_searches_known_issues_and_names(self, client, sims):
+        issues = client.get("/search/text", params={"q": "restart failed"}).json()
+        names = client.get("/search/text", params={"q": "historical"}).json()
+
+        assert [hit["name"] for hit in issues["items"]] == ["Simulation 2"]
+        assert [hit["caseName"] for hit in names["items"]] == ["case_4"]
+        assert names["items"][0]["snippet"] is None
+
+    def test_combines_structural_filters(self, client, sims):
+        response = client.get(
+            "/search/text", params={"q": "bias", "compset": sims[1].compset}
+        )
+
+        assert response.json()["items"] == []
+
+    def test_paginates_with_keyset_cursor(self, client, sims):
+        first = client.get("/search/text", params={"q": "bias", "limit": 1}).json()
+        second = client.get(
+            "/search/text",
+            params={"q": "bias", "limit": 1, "cursor": first["nextCursor"]},
+        ).json()
+
+        names = [hit["name"] for hit in first["items"] + second["items"]]
+        assert sorted(names) == ["Simulation 1", "Simulation 3"]
+        assert first["items"][0]["rank"] >= second["items"][0]["rank"]
+        assert second["nextCursor"] is None
+
+    def test_rejects_malformed_cursor(self, client):
+        response = client.get("/search/text", params={"q": "x", "cursor": "nope"})
+
+        assert response.status_code == 400
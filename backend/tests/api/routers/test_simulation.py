@@ -1,16 +1,25 @@
+from unittest.mock import patch
 from uuid import uuid4
 
 import pytest
 from fastapi import HTTPException
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
+from app.api.facets import catalog_facets
 from app.api.routers.simulation import (
+    _has_trigram,
+    _suggest_cache,
     create_simulation,
     get_simulation,
     list_simulations,
 )
+from app.core.config import settings
+from app.db.artifact import Artifact
+from app.db.link import ExternalLink
 from app.db.machine import Machine
 from app.db.simulation import Simulation
+from app.db.timing import TimingComponent, TimingRun
 from app.schemas.simulation import SimulationCreate
 
 
@@ -116,6 +125,35 @@ class TestListSimulations:
         assert len(simulations) == 1
         assert simulations[0].name == sim.name
 
+    def test_filters_on_parsed_components(
+        self, db: Session, client, create_simulations
+    ):
+        sims = create_simulations(
+            1,
+            compset="1850_EAM%CMIP6_ELM%SPBC_MPASSI_MPASO_MOSART_SGLC_SWAV",
+            grid_name="ne30pg2_r05_IcoswISC30E3r5",
+        ) + create_simulations(
+            1,
+            compset="2010_EAM%CMIP6_ELM%SPBC_MPASSI%PRES_DOCN%DOM_MOSART_SGLC_SWAV",
+            grid_name="ne120pg2_r0125_oRRS18to6v3",
+        )
+
+        r = client.get("/simulations", params={"ocnComponent": "MPASO"})
+        assert [sim["name"] for sim in r.json()] == ["Simulation 1"]
+        assert r.json()[0]["atmGrid"] == "ne30pg2"
+
+        # Components follow later edits of the compset and grid.
+        sims[0].compset = "WCYCL1850"
+        sims[1].grid_name = "ne30pg2_r05_IcoswISC30E3r5"
+        db.commit()
+
+        assert client.get("/simulations", params={"ocnComponent": "MPASO"}).json() == []
+        r = client.get("/simulations", params={"atmGrid": "ne30pg2"})
+        assert sorted(sim["name"] for sim in r.json()) == [
+            "Simulation 1",
+            "Simulation 2",
+        ]
+
 
 class TestGetSimulation:
     def test_get_simulation_success(self, db: Session, client):
@@ -159,3 +197,426 @@ class TestGetSimulation:
         r = client.get(f"/simulations/{uuid4()}")
         assert r.status_code == 404
         assert r.json() == {"detail": "Simulation not found"}
+
+
+class TestSuggest:
+    @pytest.fixture(params=[False, True], ids=["ilike", "trigram"])
+    def trigram(self, request, db: Session):
+        if request.param and not _has_trigram(db):
+            pytest.skip("pg_trgm is not installed")
+
+        with patch("app.api.routers.simulation._trigram_available", request.param):
+            yield request.param
+
+        _suggest_cache.clear()
+
+    @pytest.fixture
+    def sims(self, create_simulations) -> list[Simulation]:
+        runs = [
+            ("v3.LR.historical_0101", "20240101.v3.LR.historical_0101.chrysalis"),
+            ("v3.LR.historical_0201", "20240101.v3.LR.historical_0201.chrysalis"),
+            ("v3.LR.piControl", "20240101.v3.LR.piControl.chrysalis"),
+        ]
+
+        return [
+            sim
+            for name, case_name in runs
+            for sim in create_simulations(1, name=name, case_name=case_name)
+        ]
+
+    def test_prefix_matches_rank_first(self, client, trigram, sims):
+        r = client.get("/simulations/suggest", params={"q": "v3.LR.hist"})
+
+        assert r.status_code == 200
+        data = r.json()
+        assert [(s["kind"], s["value"]) for s in data[:2]] == [
+            ("simulation", "v3.LR.historical_0101"),
+            ("simulation", "v3.LR.historical_0201"),
+        ]
+        assert {s["kind"] for s in data[2:]} == {"case"}
+        assert data[0]["id"] == str(sims[0].id)
+
+    def test_underscore_is_matched_literally(self, client, trigram, sims):
+        r = client.get("/simulations/suggest", params={"q": "l_02", "limit": 1})
+
+        assert r.status_code == 200
+        assert [s["value"] for s in r.json()] == ["v3.LR.historical_0201"]
+
+    def test_suggests_machines(self, client, trigram, db: Session):
+        machine = db.query(Machine).first()
+
+        r = client.get("/simulations/suggest", params={"q": machine.name[:3]})
+
+        assert {"kind": "machine", "id": str(machine.id)}.items() <= r.json()[0].items()
+
+    def test_short_query_returns_nothing(self, client, trigram, sims):
+        r = client.get("/simulations/suggest", params={"q": "v"})
+
+        assert r.status_code == 200
+        assert r.json() == []
+
+    def test_caches_hot_prefixes(self, client, trigram, sims, db: Session):
+        first = client.get("/simulations/suggest", params={"q": "piCon"}).json()
+        sims[2].name = "renamed"
+        db.commit()
+
+        second = client.get("/simulations/suggest", params={"q": "PICON"}).json()
+
+        assert second == first
+
+
+class TestExtraFilters:
+    @pytest.fixture
+    def sims(self, create_simulations) -> list[Simulation]:
+        extras = [
+            {"ensemble_member": 3, "tuning": {"clubb_c1": 1.5}},
+            {"ensemble_member": "3", "tuning": {"clubb_c1": 2.0}},
+            {"ensemble_member": 4},
+        ]
+
+        return create_simulations(3, extra=lambda i: extras[i - 1])
+
+    def _names(self, client, params) -> list[str]:
+        r = client.get("/simulations", params=params)
+        assert r.status_code == 200
+
+        return sorted(sim["name"] for sim in r.json())
+
+    def test_equality_matches_numbers_and_strings(self, client, sims):
+        assert self._names(client, {"extra.ensemble_member": "3"}) == [
+            "Simulation 1",
+            "Simulation 2",
+        ]
+        assert self._names(client, {"extra.ensemble_member": '"3"'}) == ["Simulation 2"]
+
+    def test_nested_keys_and_presence(self, client, sims):
+        assert self._names(client, {"extra.tuning.clubb_c1": "1.5"}) == ["Simulation 1"]
+        assert self._names(client, {"extra.tuning.exists": ""}) == [
+            "Simulation 1",
+            "Simulation 2",
+        ]
+        assert self._names(client, {"extra.tuning.exists": "false"}) == ["Simulation 3"]
+
+    def test_combines_with_column_filters(self, client, sims):
+        params = {"extra.ensemble_member": "4", "compset": "F2010"}
+
+        assert self._names(client, params) == []
+
+    def test_rejects_malformed_filter(self, client):
+        r = client.get("/simulations", params={"extra.a.exists": "maybe"})
+
+        assert r.status_code == 400
+
+    def test_lists_extra_keys_with_cardinality(self, client, sims):
+        r = client.get("/simulations/extra-keys")
+
+        assert r.status_code == 200
+        assert r.json() == [
+            {
+                "key": "ensemble_member",
+                "simulations": 3,
+                "distinctValues": 3,
+                "types": ["number", "string"],
+            },
+            {
+                "key": "tuning",
+                "simulations": 2,
+                "distinctValues": 2,
+                "types": ["object"],
+            },
+            {
+                "key": "tuning.clubb_c1",
+                "simulations": 2,
+                "distinctValues": 2,
+                "types": ["number"],
+            },
+        ]
+
+
+class TestFacets:
+    @pytest.fixture(params=[True, False], ids=["index", "sql"])
+    def facets(self, request, client, db: Session, monkeypatch):
+        monkeypatch.setattr(settings, "facet_index", request.param)
+        catalog_facets.reset()
+        if request.param:
+            catalog_facets.get(db)
+
+        yield client
+
+        catalog_facets.reset()
+
+    @pytest.fixture
+    def sims(self, create_simulations) -> list[Simulation]:
+        runs = [
+            ("WCYCL1850", "running"),
+            ("WCYCL1850", "completed"),
+            ("F2010", "completed"),
+        ]
+
+        return [
+            sim
+            for compset, status in runs
+            for sim in create_simulations(1, compset=compset, status=status)
+        ]
+
+    def test_filters_and_counts_facets(self, facets, sims):
+        r = facets.get(
+            "/simulations/facets",
+            params={"compset": ["WCYCL1850", "F2010"], "status": "completed"},
+        )
+
+        assert r.status_code == 200
+        body = r.json()
+        assert body["total"] == 2
+        assert sorted(body["ids"]) == sorted(str(sim.id) for sim in sims[1:])
+        assert body["facets"]["compset"] == {"WCYCL1850": 1, "F2010": 1}
+        assert body["facets"]["status"] == {"running": 1, "completed": 2}
+        assert body["facets"]["machineId"] == {str(sims[0].machine_id): 2}
+
+    def test_index_follows_committed_changes(self, facets, db: Session, sims):
+        params = {"status": "completed"}
+        assert facets.get("/simulations/facets", params=params).json()["total"] == 2
+
+        sims[0].status = "completed"
+        db.delete(sims[2])
+        db.commit()
+
+        r = facets.get("/simulations/facets", params=params)
+        assert sorted(r.json()["ids"]) == sorted(str(sim.id) for sim in sims[:2])
+
+    def test_falls_back_to_sql_without_startup_build(self, client, sims, monkeypatch):
+        monkeypatch.setattr(settings, "facet_index", True)
+        catalog_facets.reset()
+
+        r = client.get("/simulations/facets", params={"status": "running"})
+
+        assert r.json()["ids"] == [str(sims[0].id)]
+        assert not catalog_facets.ready
+
+
+class TestCompareSimulations:
+    @pytest.fixture
+    def sims(self, create_simulations) -> list[Simulation]:
+        extras = [{"tuning": {"c1": 1.5}, "member": 1}, {"tuning": {"c1": 1.5}}, {}]
+
+        return create_simulations(
+            3,
+            status=lambda i: "completed" if i > 1 else "running",
+            extra=lambda i: extras[i - 1],
+            artifacts=lambda i: [
+                Artifact(kind="outputPath", uri="/shared/out"),
+                Artifact(kind="archivePath", uri=f"/archive/{i}"),
+            ],
+            links=lambda i: [ExternalLink(link_type="docs", url="http://docs")],
+        )
+
+    def test_returns_field_level_diff(self, client, sims):
+        ids = [str(sim.id) for sim in sims]
+
+        r = client.post("/simulations:compare", json={"simulationIds": ids})
+
+        assert r.status_code == 200
+        body = r.json()
+        assert body["simulationIds"] == ids
+        assert body["identical"]["compset"] == "WCYCL1850"
+        assert body["differing"]["status"] == ["running", "completed", "completed"]
+        assert body["differing"]["name"] == [sim.name for sim in sims]
+        assert body["differing"]["extra.tuning.c1"] == [1.5, 1.5, None]
+        assert body["differing"]["extra.member"] == [1, None, None]
+        assert "id" not in body["identical"] and "id" not in body["differing"]
+        assert body["artifacts"] == [
+            {
+                "kind": "archivePath",
+                "common": 0,
+                "only": {i: [f"/archive/{n}"] for n, i in enumerate(ids, 1)},
+            }
+        ]
+        assert body["links"] == []
+
+    def test_loads_in_fixed_number_of_queries(self, client, db: Session, sims):
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.get_bind(), "before_cursor_execute", count)
+        try:
+            r = client.post(
+                "/simulations:compare",
+                json={"simulationIds": [str(sim.id) for sim in sims]},
+            )
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", count)
+
+        assert r.status_code == 200
+        assert len([s for s in statements if s.lstrip().startswith("SELECT")]) == 3
+
+    def test_rejects_too_few_and_unknown_ids(self, client, sims):
+        sim_id = str(sims[0].id)
+
+        r = client.post(
+            "/simulations:compare", json={"simulationIds": [sim_id, sim_id]}
+        )
+        assert r.status_code == 400
+
+        r = client.post(
+            "/simulations:compare", json={"simulationIds": [sim_id, str(uuid4())]}
+        )
+        assert r.status_code == 404
+
+
+class TestSimulationVariance:
+    @pytest.fixture
+    def sims(self, create_simulations) -> list[Simulation]:
+        return create_simulations(
+            20,
+            grid_name=lambda i: "grid" if i < 20 else "other-grid",
+            campaign_id=lambda i: "ensemble" if i > 1 else None,
+            extra=lambda i: {"member": i % 2, "tuning": 0.5 + 0.01 * (i % 4)}
+            if i > 1
+            else {"member": "x", "tuning": 25},
+        )
+
+    def _fields(self, client, **params) -> dict:
+        r = client.get("/simulations/variance", params=params)
+        assert r.status_code == 200
+
+        return {field["field"]: field for field in r.json()["fields"]}
+
+    def test_summarizes_columns_and_extra_keys(self, client, sims):
+        fields = self._fields(client)
+
+        assert fields["compset"]["distinct"] == 1
+        assert fields["gridName"]["histogram"] == [
+            {"value": "grid", "count": 19},
+            {"value": "other-grid", "count": 1},
+        ]
+        assert fields["gridName"]["outliers"] == [str(sims[19].id)]
+        assert fields["name"]["distinct"] == 20
+        assert fields["extra.member"]["histogram"] == [
+            {"value": "0", "count": 10},
+            {"value": "1", "count": 9},
+            {"value": '"x"', "count": 1},
+        ]
+
+    def test_flags_outliers_of_numeric_extra_keys(self, client, sims):
+        fields = self._fields(client)
+
+        assert fields["extra.tuning"]["outliers"] == [str(sims[0].id)]
+        assert fields["extra.tuning"]["distinct"] == 5
+
+    def test_applies_selection_filters(self, client, sims):
+        r = client.get(
+            "/simulations/variance",
+            params={"campaignId": "ensemble", "varyingOnly": "true"},
+        )
+
+        body = r.json()
+        assert body["total"] == 19
+        fields = {field["field"] for field in body["fields"]}
+        assert "compset" not in fields
+        assert {"name", "gridName", "extra.member"} <= fields
+
+    def test_rejects_selection_over_limit(self, client, sims, monkeypatch):
+        monkeypatch.setattr(settings, "variance_max_simulations", 10)
+
+        assert client.get("/simulations/variance").status_code == 400
+
+
+class TestLineage:
+    @pytest.fixture(params=[True, False], ids=["closure", "recursive"])
+    def closure(self, request, monkeypatch) -> bool:
+        monkeypatch.setattr(settings, "lineage_closure", request.param)
+
+        return request.param
+
+    @pytest.fixture
+    def sims(self, create_simulations) -> dict[str, Simulation]:
+        """root -> a -> b -> c, and root -> d."""
+        parents = {"root": None, "a": "root", "b": "a", "c": "b", "d": "root"}
+        sims: dict[str, Simulation] = {}
+        for name, parent in parents.items():
+            (sims[name],) = create_simulations(
+                1,
+                name=name,
+                case_name=f"lineage_{name}",
+                initialization_type="branch" if parent else "startup",
+                status="failed" if name == "b" else "completed",
+                parent=sims.get(parent),
+            )
+
+        return sims
+
+    def _lineage(self, client, sim: Simulation, direction: str, **params) -> list:
+        r = client.get(f"/simulations/{sim.id}/{direction}", params=params)
+        assert r.status_code == 200
+
+        return [(node["name"], node["depth"]) for node in r.json()]
+
+    def test_lists_ancestors_nearest_first(self, client, sims, closure):
+        assert self._lineage(client, sims["c"], "ancestors") == [
+            ("b", 1),
+            ("a", 2),
+            ("root", 3),
+        ]
+        assert self._lineage(client, sims["root"], "ancestors") == []
+
+    def test_lists_descendants_by_depth(self, client, sims, closure):
+        nodes = self._lineage(client, sims["root"], "descendants")
+
+        assert sorted(nodes, key=lambda node: (node[1], node[0])) == [
+            ("a", 1),
+            ("d", 1),
+            ("b", 2),
+            ("c", 3),
+        ]
+        assert [depth for _, depth in nodes] == [1, 1, 2, 3]
+
+    def test_limits_depth(self, client, sims, closure):
+        assert self._lineage(client, sims["c"], "ancestors", maxDepth=1) == [("b", 1)]
+        assert {
+            name
+            for name, _ in self._lineage(
+                client, sims["root"], "descendants", maxDepth=2
+            )
+        } == {"a", "b", "d"}
+
+    def test_filters_subtree_without_pruning_it(self, client, sims, closure):
+        nodes = self._lineage(client, sims["a"], "descendants", status="completed")
+
+        assert nodes == [("c", 2)]
+
+    def test_returns_404_for_unknown_simulation(self, client, closure):
+        r = client.get(f"/simulations/{uuid4()}/descendants")
+
+        assert r.status_code == 404
+
+
+class TestListTimings:
+    def test_lists_ingested_timing_files(self, client, db: Session, create_simulations):
+        (sim,) = create_simulations(
+            1, name="Timed", case_name="timed_case", status="completed"
+        )
+        db.add(
+            TimingRun(
+                simulation_id=sim.id,
+                lid="123.456",
+                model_throughput=12.5,
+                components=[
+                    TimingComponent(component="ocn", model="mpaso", comp_pes=128),
+                    TimingComponent(component="atm", model="eam", comp_pes=256),
+                ],
+            )
+        )
+        db.commit()
+
+        r = client.get(f"/simulations/{sim.id}/timings")
+
+        assert r.status_code == 200
+        (run,) = r.json()
+        assert (run["lid"], run["modelThroughput"]) == ("123.456", 12.5)
+        assert [c["component"] for c in run["components"]] == ["atm", "ocn"]
+        assert run["components"][0]["compPes"] == 256
+
+    def test_returns_404_for_unknown_simulation(self, client):
+        assert client.get(f"/simulations/{uuid4()}/timings").status_code == 404
@@ -0,0 +1,140 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.db.simulation import Simulation
+from app.db.variable import SimulationVariable, Variable
+
+
+@pytest.fixture
+def sims(create_simulations) -> list[Simulation]:
+    return create_simulations(3)
+
+
+def _attach(client, items: dict[Simulation, list[str]]):
+    return client.post(
+        "/variables/attach",
+        json={
+            "items": [
+                {"simulationId": str(sim.id), "variables": variables}
+                for sim, variables in items.items()
+            ]
+        },
+    )
+
+
+class TestAttachVariables:
+    def test_attaches_and_creates_variables(self, client, db: Session, sims):
+        r = _attach(client, {sims[0]: ["TS", "PRECT"], sims[1]: ["TS"]})
+
+        assert r.status_code == 200
+        assert r.json() == {"changed": 3}
+        assert db.query(SimulationVariable).count() == 3
+        assert {v.name for v in db.query(Variable)} >= {"TS", "PRECT"}
+
+    def test_is_idempotent(self, client, sims):
+        _attach(client, {sims[0]: ["TS"]})
+
+        r = _attach(client, {sims[0]: ["TS", "TS", "FSNT"]})
+
+        assert r.json() == {"changed": 1}
+
+    def test_unknown_simulation(self, client, db: Session, sims):
+        r = client.post(
+            "/variables/attach",
+            json={"items": [{"simulationId": str(uuid4()), "variables": ["TS"]}]},
+        )
+
+        assert r.status_code == 404
+        assert db.query(SimulationVariable).count() == 0
+
+    def test_detaches_pairs(self, client, db: Session, sims):
+        _attach(client, {sims[0]: ["TS", "PRECT"]})
+
+        r = client.post(
+            "/variables/detach",
+            json={
+                "items": [{"simulationId": str(sims[0].id), "variables": ["TS", "U"]}]
+            },
+        )
+
+        assert r.json() == {"changed": 1}
+        assert [sv.variable_name for sv in db.query(SimulationVariable)] == ["PRECT"]
+
+
+class TestListVariables:
+    def test_upserts_and_counts(self, client, sims):
+        _attach(client, {sims[0]: ["TS"], sims[1]: ["TS"]})
+
+        r = client.put(
+            "/variables",
+            json=[
+                {"name": "TS", "description": "Surface temperature"},
+                {"name": "ZZ_NEW"},
+            ],
+        )
+
+        assert r.status_code == 200
+        assert r.json() == [
+            {"name": "TS", "description": "Surface temperature", "simulationCount": 2},
+            {"name": "ZZ_NEW", "description": None, "simulationCount": 0},
+        ]
+        listed = {v["name"]: v for v in client.get("/variables").json()}
+        assert listed["TS"]["simulationCount"] == 2
+
+
+class TestAllOfQuery:
+    def test_returns_simulations_providing_every_variable(self, client, sims):
+        _attach(
+            client,
+            {
+                sims[0]: ["TS", "PRECT", "FSNT"],
+                sims[1]: ["TS", "PRECT"],
+                sims[2]: ["TS", "PRECT", "FSNT", "U"],
+            },
+        )
+
+        r = client.get(
+            "/simulations", params={"variables": ["TS", "PRECT", "FSNT", "TS"]}
+        )
+
+        assert r.status_code == 200
+        assert sorted(sim["name"] for sim in r.json()) == [
+            sims[0].name,
+            sims[2].name,
+        ]
+
+
+class TestVariableMatrix:
+    def test_builds_matrix_in_request_order(self, client, sims):
+        _attach(client, {sims[0]: ["TS", "PRECT"], sims[2]: ["TS", "U"]})
+        ids = [str(sims[2].id), str(sims[0].id), str(sims[1].id)]
+
+        r = client.post("/variables/matrix", json={"simulationIds": ids})
+
+        assert r.status_code == 200
+        assert r.json() == {
+            "simulationIds": ids,
+            "variables": ["PRECT", "TS", "U"],
+            "matrix": ["011", "110", "000"],
+            "common": [],
+        }
+
+    def test_restricts_columns_and_reports_common(self, client, sims):
+        _attach(client, {sims[0]: ["TS", "PRECT"], sims[1]: ["TS"]})
+        ids = [str(sims[0].id), str(sims[1].id)]
+
+        r = client.post(
+            "/variables/matrix",
+            json={"simulationIds": ids, "variables": ["TS", "PRECT", "FSNT"]},
+        )
+
+        data = r.json()
+        assert data["matrix"] == ["110", "100"]
+        assert data["common"] == ["TS"]
+
+    def test_unknown_simulation(self, client, sims):
+        r = client.post("/variables/matrix", json={"simulationIds": [str(uuid4())]})
+
+        assert r.status_code == 404
@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.api.facets import FacetIndex
+
+FIELDS = ("compset", "status")
+
+
+def _row(sim_id: str, compset: str | None, status: str) -> SimpleNamespace:
+    return SimpleNamespace(id=sim_id, compset=compset, status=status)
+
+
+@pytest.fixture
+def index() -> FacetIndex:
+    return FacetIndex.from_rows(
+        [
+            _row("a", "WCYCL1850", "running"),
+            _row("b", "WCYCL1850", "completed"),
+            _row("c", "F2010", "completed"),
+            _row("d", None, "failed"),
+        ],
+        fields=FIELDS,
+    )
+
+
+class TestFacetIndex:
+    def test_empty_filters_match_everything(self, index):
+        result = index.query({})
+
+        assert result.ids == ["a", "b", "c", "d"]
+        assert result.counts == {
+            "compset": {"WCYCL1850": 2, "F2010": 1},
+            "status": {"running": 1, "completed": 2, "failed": 1},
+        }
+
+    def test_ors_within_and_ands_across_columns(self, index):
+        result = index.query(
+            {"compset": ["WCYCL1850", "F2010"], "status": ["completed"]}
+        )
+
+        assert (result.ids, result.total) == (["b", "c"], 2)
+
+    def test_counts_ignore_their_own_selection(self, index):
+        result = index.query({"compset": ["F2010"]})
+
+        assert result.ids == ["c"]
+        assert result.counts["compset"] == {"WCYCL1850": 2, "F2010": 1}
+        assert result.counts["status"] == {"completed": 1}
+
+    def test_unknown_value_matches_nothing(self, index):
+        assert index.query({"compset": ["B1850"]}).ids == []
+
+    def test_unknown_field_raises(self, index):
+        with pytest.raises(KeyError):
+            index.query({"grid_name": ["ne30"]})
+
+    def test_upsert_moves_and_adds_rows(self, index):
+        index.upsert("a", {"compset": "F2010", "status": "completed"})
+        index.upsert("e", {"compset": "B1850", "status": "running"})
+
+        result = index.query({})
+        assert len(index) == 5
+        assert result.counts["compset"] == {"WCYCL1850": 1, "F2010": 2, "B1850": 1}
+        assert result.counts["status"] == {"running": 1, "completed": 3, "failed": 1}
+
+    def test_remove_frees_row_for_reuse(self, index):
+        index.remove("b")
+        index.remove("missing")
+        assert index.query({"status": ["completed"]}).ids == ["c"]
+
+        index.upsert("e", {"compset": "F2010", "status": "completed"})
+
+        assert index.query({"compset": ["F2010"]}).ids == ["e", "c"]
+
+    def test_grows_past_initial_capacity(self):
+        index = FacetIndex(fields=FIELDS)
+        for i in range(3000):
+            index.upsert(str(i), {"compset": f"C{i % 20}", "status": "running"})
+
+        result = index.query({"compset": ["C0", "C1"]})
+
+        assert result.total == 300
+        assert result.ids[-1] == "2981"
+        assert len(result.counts["compset"]) == 20
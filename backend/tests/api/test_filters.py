@@ -0,0 +1,48 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.api.filters import ExtraFilter, apply_extra_filters, parse_extra_filter
+from app.db.simulation import Simulation
+
+
+class TestParseExtraFilter:
+    @pytest.mark.parametrize(
+        ("param", "value", "expected"),
+        [
+            ("extra.ensemble_member", "3", ExtraFilter(("ensemble_member",), (3, "3"))),
+            (
+                "extra.tuning.clubb",
+                "true",
+                ExtraFilter(("tuning", "clubb"), (True, "true")),
+            ),
+            ("extra.label", '"3"', ExtraFilter(("label",), ("3",))),
+            ("extra.label", "spinup", ExtraFilter(("label",), ("spinup",))),
+            ("extra.tags", '["a"]', ExtraFilter(("tags",), (["a"],))),
+            ("extra.tuning.exists", "", ExtraFilter(("tuning",))),
+            ("extra.tuning.exists", "false", ExtraFilter(("tuning",), exists=False)),
+        ],
+    )
+    def test_parses_equality_and_presence(self, param, value, expected):
+        assert parse_extra_filter(param, value) == expected
+
+    @pytest.mark.parametrize(
+        ("param", "value"),
+        [("extra.", "1"), ("extra.a..b", "1"), ("extra.a.exists", "maybe")],
+    )
+    def test_rejects_malformed_parameters(self, param, value):
+        with pytest.raises(ValueError):
+            parse_extra_filter(param, value)
+
+
+class TestApplyExtraFilters:
+    def test_compiles_to_index_operators(self):
+        stmt = apply_extra_filters(
+            select(Simulation.id),
+            [ExtraFilter(("a", "b"), (1, "1")), ExtraFilter(("c",), exists=False)],
+        )
+
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert sql.count("simulations.extra @>") == 2
+        assert "NOT (simulations.extra @? CAST(" in sql
@@ -0,0 +1,67 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.api.lineage import lineage_query
+from app.db.lineage import SimulationLineage
+from app.db.simulation import Simulation
+
+
+@pytest.fixture
+def chain(create_simulations) -> list[Simulation]:
+    """Four runs, each branched from the previous one."""
+    sims: list[Simulation] = []
+    for i in range(4):
+        sims += create_simulations(
+            1,
+            name=f"run {i}",
+            case_name=f"chain_{i}",
+            initialization_type="branch",
+            status="completed",
+            parent=sims[-1] if sims else None,
+        )
+
+    return sims
+
+
+def _names(db: Session, sim: Simulation, direction: str, closure: bool) -> set:
+    rows = db.execute(lineage_query(sim.id, direction, None, closure)).all()
+
+    return {(row.Simulation.name, row.depth) for row in rows}
+
+
+class TestClosureTrigger:
+    def test_insert_adds_every_ancestor_path(self, db: Session, chain):
+        rows = db.execute(
+            select(SimulationLineage.ancestor_id, SimulationLineage.depth).where(
+                SimulationLineage.descendant_id == chain[3].id
+            )
+        ).all()
+
+        assert set(rows) == {(chain[2].id, 1), (chain[1].id, 2), (chain[0].id, 3)}
+
+    def test_reparenting_moves_the_subtree(self, db: Session, chain):
+        # Detach run 2 (with run 3 below it) from run 1 and hang it off run 0.
+        chain[2].parent = chain[0]
+        db.flush()
+
+        for closure in (True, False):
+            assert _names(db, chain[3], "ancestors", closure) == {
+                ("run 2", 1),
+                ("run 0", 2),
+            }
+            assert _names(db, chain[1], "descendants", closure) == set()
+
+    def test_detaching_clears_ancestors(self, db: Session, chain):
+        chain[1].parent = None
+        db.flush()
+
+        assert _names(db, chain[3], "ancestors", True) == {("run 2", 1), ("run 1", 2)}
+        assert _names(db, chain[0], "descendants", True) == set()
+
+    def test_rejects_cycles(self, db: Session, chain):
+        chain[0].parent = chain[3]
+
+        with pytest.raises(IntegrityError):
+            db.flush()
@@ -0,0 +1,108 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.api import rollups
+from app.api.rollups import RollupRefresher
+from app.db.machine import Machine
+
+
+class _Refresh:
+    """Counts calls, optionally blocking each until released."""
+
+    def __init__(self, block: bool = False):
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def __call__(self) -> None:
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+
+
+def _wait_for(condition, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+class TestRollupRefresher:
+    def test_coalesces_requests_into_one_refresh(self):
+        refresh = _Refresh()
+        refresher = RollupRefresher(refresh, delay=0.05)
+        refresher.start()
+
+        for _ in range(10):
+            refresher.request()
+        _wait_for(lambda: refresh.calls == 1)
+        time.sleep(0.1)
+
+        assert refresh.calls == 1
+
+    def test_ignores_requests_until_started_and_after_stopped(self):
+        refresh = _Refresh()
+        refresher = RollupRefresher(refresh, delay=0.01)
+
+        refresher.request()
+        refresher.start()
+        refresher.stop()
+        refresher.request()
+        time.sleep(0.05)
+
+        assert refresh.calls == 0
+
+    def test_stop_cancels_scheduled_refresh(self):
+        refresh = _Refresh()
+        refresher = RollupRefresher(refresh, delay=0.05)
+        refresher.start()
+
+        refresher.request()
+        refresher.stop()
+        time.sleep(0.1)
+
+        assert refresh.calls == 0
+
+    def test_request_during_refresh_schedules_another(self):
+        refresh = _Refresh(block=True)
+        refresher = RollupRefresher(refresh, delay=0.01)
+        refresher.start()
+
+        refresher.request()
+        assert refresh.started.wait(2)
+        refresher.request()
+        refresh.release.set()
+
+        _wait_for(lambda: refresh.calls == 2)
+        refresher.stop()
+
+
+class TestRefreshRequests:
+    @pytest.fixture
+    def requests(self, monkeypatch) -> list[None]:
+        requests: list[None] = []
+        monkeypatch.setattr(
+            rollups.rollup_refresher, "request", lambda: requests.append(None)
+        )
+
+        return requests
+
+    def test_commit_of_rolled_up_rows_requests_refresh(self, db: Session, requests):
+        db.query(Machine).first().notes = "updated"
+        db.commit()
+        db.commit()
+
+        assert len(requests) == 1
+
+    def test_rollback_discards_pending_request(self, db: Session, requests):
+        db.query(Machine).first().notes = "updated"
+        db.flush()
+        db.rollback()
+        db.commit()
+
+        assert requests == []
@@ -0,0 +1,67 @@
+import numpy as np
+
+from app.api.variance import variance_matrix
+
+
+def _column(values) -> np.ndarray:
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+
+    return column
+
+
+IDS = np.asarray([f"run{i}" for i in range(20)])
+
+
+class TestVarianceMatrix:
+    def test_counts_distinct_values_and_histogram(self):
+        compsets = ["WCYCL1850"] * 12 + ["F2010"] * 6 + ["B1850", None]
+
+        (summary,) = variance_matrix(IDS, {"compset": _column(compsets)}, bins=2)
+
+        assert (summary.field, summary.distinct, summary.nulls) == ("compset", 4, 1)
+        assert summary.histogram == [("WCYCL1850", 12), ("F2010", 6)]
+        assert summary.other == 2
+
+    def test_flags_rare_values_only_under_a_majority(self):
+        columns = {
+            "machine": _column(["chrysalis"] * 19 + ["pm-cpu"]),
+            "name": _column([f"name{i}" for i in range(20)]),
+            "tag": _column(["v3"] * 19 + [None]),
+        }
+
+        machine, name, tag = variance_matrix(IDS, columns)
+
+        assert (machine.outliers, machine.outlier_count) == (["run19"], 1)
+        assert name.outlier_count == 0
+        assert tag.outliers == ["run19"]
+
+    def test_flags_numeric_outliers_by_median_absolute_deviation(self):
+        years = [10.0 + 0.1 * (i % 5) for i in range(19)] + [500.0]
+
+        (summary,) = variance_matrix(IDS, {"totalYears": _column(years)})
+
+        assert summary.outliers == ["run19"]
+        assert summary.distinct == 6
+
+    def test_mixed_columns_are_not_numeric(self):
+        values = [1.0] * 19 + ["500"]
+
+        (summary,) = variance_matrix(IDS, {"f": _column(values)})
+
+        assert summary.histogram == [("1.0", 19), ("500", 1)]
+
+    def test_caps_listed_outliers(self):
+        values = ["a"] * 11 + [f"rare{i}" for i in range(9)]
+
+        (summary,) = variance_matrix(
+            IDS, {"f": _column(values)}, outlier_fraction=0.1, max_outliers=2
+        )
+
+        assert summary.outliers == ["run11", "run12"]
+        assert summary.outlier_count == 9
+
+    def test_empty_selection(self):
+        (summary,) = variance_matrix(np.asarray([]), {"f": _column([])})
+
+        assert (summary.distinct, summary.histogram) == (0, [])
@@ -1,4 +1,7 @@
+import itertools
 import os
+from collections.abc import Callable
+from typing import Any
 from urllib.parse import urlparse
 
 import psycopg
@@ -7,12 +10,14 @@ from alembic import command
 from alembic.config import Config
 from fastapi.testclient import TestClient
 from psycopg.rows import tuple_row
-from sqlalchemy import create_engine, event
+from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from app._logger import _setup_custom_logger
 from app.api.deps import get_db
 from app.core.config import settings
+from app.db.machine import Machine
+from app.db.simulation import Simulation
 from app.main import app
 
 logger = _setup_custom_logger(__name__)
@@ -55,32 +60,82 @@ def db(_connection) -> Session:
     -----
     The session is automatically closed after the test completes.
     """
-    # Begin an outer transaction for this test, and start a SAVEPOINT (nested).
-    # This ensures that any commits inside the test are contained and rolled back.
+    # Begin an outer transaction for this test. The Session runs inside it and
+    # turns its own transactions, including commits and begin_nested(), into
+    # SAVEPOINTs, so everything the test writes is rolled back at the end.
     outer_tx = _connection.begin()
-    nested_tx = _connection.begin_nested()
 
-    # Bind the Session to the shared connection (inside the transaction).
-    session: Session = TestingSessionLocal(bind=_connection)
-
-    # After each nested transaction ends (e.g., after a commit),
-    # automatically start a new SAVEPOINT so the Session remains usable.
-    @event.listens_for(session, "after_transaction_end")
-    def _restart_savepoint(sess, txn):
-        if txn.nested and not txn._parent.nested:
-            _connection.begin_nested()
+    session: Session = TestingSessionLocal(
+        bind=_connection, join_transaction_mode="create_savepoint"
+    )
 
     try:
         yield session
     finally:
         # Roll back everything done in the test and close the session.
         session.close()
-
-        # Safe to call rollback even if already ended.
-        nested_tx.rollback()
         outer_tx.rollback()
 
 
+@pytest.fixture(scope="function")
+def create_simulations(db: Session) -> Callable[..., list[Simulation]]:
+    """Provides a factory that adds valid simulations and commits them.
+
+    Every required column gets a default, and the simulations are numbered
+    from 1 across all calls in a test: the n-th one is named
+    ``"Simulation n"`` with case name ``"case_n"``, and runs on the first
+    seeded machine.
+
+    Parameters
+    ----------
+    db : Session
+        A SQLAlchemy session object connected to the test database.
+
+    Returns
+    -------
+    Callable[..., list[Simulation]]
+        ``create(count=1, **overrides)``, which creates ``count`` simulations
+        with the given column values. A callable value is called with each
+        simulation's number, e.g. ``compset=lambda i: f"compset{i}"``.
+
+    Examples
+    --------
+    >>> sims = create_simulations(3, status="running")
+    >>> sim, = create_simulations(extra={"member": 1})
+    """
+    numbers = itertools.count(1)
+
+    def create(count: int = 1, **overrides: Any) -> list[Simulation]:
+        machine = db.query(Machine).first()
+        assert machine is not None, "No machine found in the database"
+
+        sims = []
+        for i in itertools.islice(numbers, count):
+            fields = {
+                "name": f"Simulation {i}",
+                "case_name": f"case_{i}",
+                "compset": "WCYCL1850",
+                "compset_alias": "alias",
+                "grid_name": "grid",
+                "grid_resolution": "ne30",
+                "initialization_type": "startup",
+                "simulation_type": "control",
+                "status": "created",
+                "machine_id": machine.id,
+                "model_start_date": "2023-01-01T00:00:00Z",
+            }
+            for field, value in overrides.items():
+                fields[field] = value(i) if callable(value) else value
+            sims.append(Simulation(**fields))
+
+        db.add_all(sims)
+        db.commit()
+
+        return sims
+
+    return create
+
+
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_db():
     """Sets up a test database for the application.
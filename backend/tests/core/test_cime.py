@@ -0,0 +1,69 @@
+import pytest
+
+from app.core.cime import (
+    CompsetComponents,
+    GridComponents,
+    component_columns,
+    parse_compset,
+    parse_grid,
+)
+
+
+class TestParseCompset:
+    def test_splits_long_name_and_drops_options(self):
+        assert parse_compset(
+            "2000_EAM%CMIP6_ELM%SPBC_MPASSI_MPASO_MOSART_SGLC_SWAV_BGC%BDRD"
+        ) == CompsetComponents(
+            compset_time="2000",
+            atm_component="EAM",
+            lnd_component="ELM",
+            ice_component="MPASSI",
+            ocn_component="MPASO",
+            rof_component="MOSART",
+            glc_component="SGLC",
+            wav_component="SWAV",
+        )
+
+    @pytest.mark.parametrize(
+        "name", [None, "", "WCYCL1850", "AQUAPLANET", "2000_EAM_ELM", "a_b_c_d_e_f_g_h"]
+    )
+    def test_rejects_aliases_and_malformed_names(self, name):
+        assert parse_compset(name) is None
+
+
+class TestParseGrid:
+    @pytest.mark.parametrize(
+        ("name", "expected"),
+        [
+            (
+                "ne30pg2_r05_IcoswISC30E3r5",
+                GridComponents("ne30pg2", "r05", "IcoswISC30E3r5"),
+            ),
+            ("ne30_oECv3", GridComponents("ne30", "ne30", "oECv3")),
+            ("ne120pg2", GridComponents(atm_grid="ne120pg2")),
+            (
+                "a%ne30np4.pg2_l%r05_oi%IcoswISC30E3r5_r%r05_g%null_w%null_m%IcoswISC30E3r5",
+                GridComponents("ne30np4.pg2", "r05", "IcoswISC30E3r5"),
+            ),
+            ("a%T62_l%null_o%gx1v7", GridComponents("T62", None, "gx1v7")),
+        ],
+    )
+    def test_parses_aliases_and_long_names(self, name, expected):
+        assert parse_grid(name) == expected
+
+    @pytest.mark.parametrize("name", [None, "1°", "a_b_c_d_e"])
+    def test_rejects_unparseable_names(self, name):
+        assert parse_grid(name) is None
+
+
+class TestComponentColumns:
+    def test_falls_back_to_alias_for_long_name(self):
+        columns = component_columns(
+            "WCYCL1850",
+            "1850_EAM%CMIP6_ELM%SPBC_MPASSI_MPASO_MOSART_SGLC_SWAV",
+            "unknown grid",
+        )
+
+        assert columns["compset_time"] == "1850"
+        assert columns["ocn_component"] == "MPASO"
+        assert columns["atm_grid"] is None
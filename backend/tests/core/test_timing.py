@@ -0,0 +1,70 @@
+import gzip
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from app.core.timing import parse_timing, read_lines
+
+SAMPLE = (
+    Path(__file__).parents[1] / "data" / "e3sm_timing.timing_case.123456.210101-120000"
+)
+
+
+class TestParseTiming:
+    def test_parses_header_and_overall_metrics(self):
+        summary = parse_timing(read_lines(SAMPLE))
+
+        assert summary.case == "timing_case"
+        assert summary.lid == "123456.210101-120000"
+        assert summary.machine == "chrysalis"
+        assert summary.run_date == datetime(2021, 1, 1, 12, tzinfo=timezone.utc)
+        assert summary.run_date.tzinfo is timezone.utc
+        assert summary.run_length_days == 365
+        assert (summary.total_pes, summary.pes_per_node) == (6680, 64)
+        assert summary.model_cost == 766.32
+        assert summary.model_throughput == 209.19
+        assert summary.init_seconds == 97.155
+        assert summary.run_seconds == 413.025
+        assert summary.seconds_per_mday == 1.132
+        assert summary.final_seconds == 0.018
+
+    def test_parses_component_layout_and_run_time(self):
+        components = parse_timing(read_lines(SAMPLE)).components
+
+        assert list(components) == [
+            "cpl", "atm", "lnd", "ice", "ocn", "rof", "glc", "wav"
+        ]  # fmt: skip
+        ice = components["ice"]
+        assert ice.model == "mpassi"
+        assert (ice.comp_pes, ice.root_pe, ice.tasks, ice.threads) == (
+            3968,
+            1408,
+            3968,
+            1,
+        )
+        assert (ice.run_seconds, ice.seconds_per_mday, ice.myears_per_wday) == (
+            60.221,
+            0.165,
+            1434.75,
+        )
+
+    def test_stops_before_the_timer_breakdown(self):
+        lines = iter(read_lines(SAMPLE))
+
+        summary = parse_timing(lines)
+
+        assert summary.components["atm"].seconds_per_mday == 0.767
+        # The rest of the file is left unread.
+        assert "NOTE" in "".join(lines)
+
+    def test_reads_gzipped_files(self, tmp_path):
+        path = tmp_path / f"{SAMPLE.name}.gz"
+        with gzip.open(path, "wb") as f:
+            f.write(SAMPLE.read_bytes())
+
+        assert parse_timing(read_lines(path)).model_cost == 766.32
+
+    def test_rejects_other_files(self):
+        with pytest.raises(ValueError):
+            parse_timing(["Case : x\n", "nothing else\n"])
@@ -0,0 +1,74 @@
+import gzip
+import shutil
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.db.simulation import Simulation
+from app.db.timing import TimingComponent, TimingRun
+from app.ingest.timing import ingest_timing_file, ingest_timing_files
+
+SAMPLE = (
+    Path(__file__).parents[1] / "data" / "e3sm_timing.timing_case.123456.210101-120000"
+)
+
+
+@pytest.fixture
+def sim(create_simulations) -> Simulation:
+    (sim,) = create_simulations(
+        1, name="Timing run", case_name="timing_case", status="completed"
+    )
+
+    return sim
+
+
+class TestIngestTiming:
+    def test_stores_run_and_components_by_case_name(self, db: Session, sim):
+        run = ingest_timing_file(db, SAMPLE)
+
+        assert run is not None
+        assert run.simulation_id == sim.id
+        assert run.lid == "123456.210101-120000"
+        assert run.model_throughput == 209.19
+        assert len(run.components) == 8
+        ocn = next(c for c in run.components if c.component == "ocn")
+        assert (ocn.model, ocn.comp_pes) == ("mpaso", 1280)
+
+    def test_reingesting_replaces_the_run(self, db: Session, sim):
+        ingest_timing_file(db, SAMPLE)
+        ingest_timing_file(db, SAMPLE)
+
+        assert db.scalar(select(func.count()).select_from(TimingRun)) == 1
+        assert db.scalar(select(func.count()).select_from(TimingComponent)) == 8
+
+    def test_skips_unknown_cases(self, db: Session):
+        assert ingest_timing_file(db, SAMPLE) is None
+
+    def test_walks_directories_and_skips_bad_files(self, db: Session, sim, tmp_path):
+        timing = tmp_path / "case" / "timing"
+        timing.mkdir(parents=True)
+        shutil.copy(SAMPLE, timing)
+        (timing / "e3sm_timing.timing_case.broken").write_text("not a timing file\n")
+        (timing / "other.txt").write_text("ignored\n")
+
+        assert ingest_timing_files(db, [tmp_path]) == 1
+        assert db.scalar(select(func.count()).select_from(TimingRun)) == 1
+
+    def test_skips_files_that_fail_to_store_or_decompress(
+        self, db: Session, sim, tmp_path
+    ):
+        text = SAMPLE.read_text()
+        (tmp_path / "e3sm_timing.timing_case.long").write_text(
+            text.replace("LID", "LID_").replace(" mpaso ", f" {'x' * 40} ")
+        )
+        data = gzip.compress(text.encode())
+        (tmp_path / "e3sm_timing.timing_case.cut.gz").write_bytes(
+            data[: len(data) // 2]
+        )
+        shutil.copy(SAMPLE, tmp_path)
+
+        assert ingest_timing_files(db, [tmp_path]) == 1
+        lids = db.scalars(select(TimingRun.lid)).all()
+        assert lids == ["123456.210101-120000"]
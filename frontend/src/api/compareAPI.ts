@@ -6,7 +6,7 @@ const BASE_URL = 'http://localhost:8000/api';
 
 export const fetchAISimAnalysis = async (simulations: Simulation[]): Promise<string> => {
   const response = await axios.post(`${BASE_URL}/analyze-simulations`, {
-    simulations,
+    simulationIds: simulations.map((sim) => sim.id),
   });
   return response.data.summary;
 };